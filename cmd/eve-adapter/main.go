@@ -22,6 +22,7 @@ import (
 	"os/exec"
 	"path/filepath"
 	"strings"
+	"sync/atomic"
 	"time"
 
 	nexadapter "github.com/nexus-project/adapter-sdk-go"
@@ -148,6 +149,12 @@ func eveMonitor(ctx context.Context, account string, emit nexadapter.EmitFunc) e
 		return fmt.Errorf("failed to get initial membership cursor: %w", err)
 	}
 
+	stmts, err := prepareMonitorStmts(warehouseDB)
+	if err != nil {
+		return err
+	}
+	defer stmts.Close()
+
 	nexadapter.LogInfo(
 		"monitor starting from message=%d reaction=%d membership=%d",
 		lastSeenID,
@@ -192,7 +199,7 @@ func eveMonitor(ctx context.Context, account string, emit nexadapter.EmitFunc) e
 		}
 
 		// Step 2: Query warehouse for messages newer than our cursor.
-		events, newLastID, err := queryNewMessages(warehouseDB, lastSeenID, meIdentifier)
+		events, newLastID, err := queryNewMessages(warehouseDB, stmts.messages, lastSeenID, meIdentifier)
 		if err != nil {
 			nexadapter.LogError("failed to query new messages: %v", err)
 		} else {
@@ -210,7 +217,7 @@ func eveMonitor(ctx context.Context, account string, emit nexadapter.EmitFunc) e
 			}
 		}
 
-		reactions, newLastReactionID, err := queryNewReactions(warehouseDB, lastSeenReactionID, meIdentifier)
+		reactions, newLastReactionID, err := queryNewReactions(stmts.reactions, lastSeenReactionID, meIdentifier)
 		if err != nil {
 			nexadapter.LogError("failed to query new reactions: %v", err)
 		} else {
@@ -229,7 +236,7 @@ func eveMonitor(ctx context.Context, account string, emit nexadapter.EmitFunc) e
 		}
 
 		membership, newLastMembershipID, err := queryNewMembershipEvents(
-			warehouseDB,
+			stmts.membership,
 			lastSeenMembershipID,
 			meIdentifier,
 		)
@@ -252,6 +259,66 @@ func eveMonitor(ctx context.Context, account string, emit nexadapter.EmitFunc) e
 	}
 }
 
+// eventStmts are the warehouse event queries a monitor or backfill runs over
+// and over: the monitor's per-tick polls, or the backfill's per-page reads.
+// They are prepared once for the life of the run instead of being compiled
+// again on every tick or page.
+type eventStmts struct {
+	messages   *sql.Stmt
+	reactions  *sql.Stmt
+	membership *sql.Stmt
+}
+
+const (
+	newMessagesSQL         = warehouseMessageQuery + "WHERE m.id > ? ORDER BY m.id"
+	newReactionsSQL        = warehouseReactionQuery + "WHERE r.id > ? ORDER BY r.id"
+	newMembershipEventsSQL = warehouseMembershipQuery + "WHERE me.id > ? ORDER BY me.id"
+)
+
+// The backfill's paged reads: timestamp >= since, id > cursor, one page.
+const (
+	messagesSinceSQL         = warehouseMessageQuery + "WHERE m.timestamp >= ? AND m.id > ? ORDER BY m.id LIMIT ?"
+	reactionsSinceSQL        = warehouseReactionQuery + "WHERE r.timestamp >= ? AND r.id > ? ORDER BY r.id LIMIT ?"
+	membershipEventsSinceSQL = warehouseMembershipQuery + "WHERE me.timestamp >= ? AND me.id > ? ORDER BY me.id LIMIT ?"
+)
+
+func prepareMonitorStmts(db *sql.DB) (*eventStmts, error) {
+	return prepareEventStmts(db, newMessagesSQL, newReactionsSQL, newMembershipEventsSQL)
+}
+
+func prepareBackfillStmts(db *sql.DB) (*eventStmts, error) {
+	return prepareEventStmts(db, messagesSinceSQL, reactionsSinceSQL, membershipEventsSinceSQL)
+}
+
+func prepareEventStmts(db *sql.DB, messagesSQL, reactionsSQL, membershipSQL string) (*eventStmts, error) {
+	s := &eventStmts{}
+	for _, p := range []struct {
+		dst   **sql.Stmt
+		query string
+	}{
+		{&s.messages, messagesSQL},
+		{&s.reactions, reactionsSQL},
+		{&s.membership, membershipSQL},
+	} {
+		stmt, err := db.Prepare(p.query)
+		if err != nil {
+			s.Close()
+			return nil, fmt.Errorf("failed to prepare event query: %w", err)
+		}
+		*p.dst = stmt
+	}
+	return s, nil
+}
+
+// Close closes every statement that was prepared.
+func (s *eventStmts) Close() {
+	for _, stmt := range []*sql.Stmt{s.messages, s.reactions, s.membership} {
+		if stmt != nil {
+			stmt.Close()
+		}
+	}
+}
+
 // ---------- Send ----------
 
 func eveSend(ctx context.Context, req nexadapter.SendRequest) (*nexadapter.DeliveryResult, error) {
@@ -364,6 +431,12 @@ func eveBackfill(ctx context.Context, account string, since time.Time, emit nexa
 
 	nexadapter.LogInfo("sync complete, starting backfill from %s", since.Format(time.RFC3339))
 
+	stmts, err := prepareBackfillStmts(warehouseDB)
+	if err != nil {
+		return err
+	}
+	defer stmts.Close()
+
 	// Paginated query — process in batches of 5000 to keep memory bounded.
 	const batchSize = 5000
 	totalEmitted := 0
@@ -379,7 +452,7 @@ func eveBackfill(ctx context.Context, account string, since time.Time, emit nexa
 			default:
 			}
 
-			events, newLastID, err := queryMessagesSince(warehouseDB, since, lastID, batchSize, meIdentifier)
+			events, newLastID, err := queryMessagesSince(warehouseDB, stmts.messages, since, lastID, batchSize, meIdentifier)
 			if err != nil {
 				return fmt.Errorf("backfill message query failed: %w", err)
 			}
@@ -406,7 +479,7 @@ func eveBackfill(ctx context.Context, account string, since time.Time, emit nexa
 			default:
 			}
 
-			events, newLastID, err := queryReactionsSince(warehouseDB, since, lastID, batchSize, meIdentifier)
+			events, newLastID, err := queryReactionsSince(stmts.reactions, since, lastID, batchSize, meIdentifier)
 			if err != nil {
 				return fmt.Errorf("backfill reaction query failed: %w", err)
 			}
@@ -434,7 +507,7 @@ func eveBackfill(ctx context.Context, account string, since time.Time, emit nexa
 			}
 
 			events, newLastID, err := queryMembershipEventsSince(
-				warehouseDB,
+				stmts.membership,
 				since,
 				lastID,
 				batchSize,
@@ -496,17 +569,18 @@ func eveHealth(_ context.Context, _ string) (*nexadapter.AdapterHealth, error) {
 	}
 	defer warehouseDB.Close()
 
-	// Get latest message timestamp and count.
+	// Get latest message timestamp and count from the per-chat roll-ups that
+	// message sync maintains, rather than counting the messages table.
 	var lastEventAt int64
 	var lastTS sql.NullString
-	_ = warehouseDB.QueryRow("SELECT MAX(timestamp) FROM messages").Scan(&lastTS)
+	var msgCount int64
+	_ = warehouseDB.QueryRow(
+		"SELECT COALESCE(SUM(total_messages), 0), MAX(last_message_date) FROM chats",
+	).Scan(&msgCount, &lastTS)
 	if lastTS.Valid {
 		lastEventAt = parseTimestampMs(lastTS.String)
 	}
 
-	var msgCount int64
-	_ = warehouseDB.QueryRow("SELECT COUNT(*) FROM messages").Scan(&msgCount)
-
 	return &nexadapter.AdapterHealth{
 		Connected:   true,
 		Account:     "default",
@@ -703,13 +777,15 @@ LEFT JOIN contacts c ON m.sender_id = c.id
 LEFT JOIN chats ch ON m.chat_id = ch.id
 `
 
-// queryNewMessages returns events for messages with id > sinceID.
+// queryNewMessages returns events for messages with id > sinceID, using stmt
+// prepared from newMessagesSQL.
 func queryNewMessages(
 	db *sql.DB,
+	stmt *sql.Stmt,
 	sinceID int64,
 	meIdentifier string,
 ) ([]nexadapter.NexusEvent, int64, error) {
-	rows, err := db.Query(warehouseMessageQuery+"WHERE m.id > ? ORDER BY m.id", sinceID)
+	rows, err := stmt.Query(sinceID)
 	if err != nil {
 		return nil, sinceID, fmt.Errorf("query failed: %w", err)
 	}
@@ -754,9 +830,11 @@ func queryNewMessages(
 	return events, lastID, nil
 }
 
-// queryMessagesSince returns events for messages with timestamp >= since AND id > afterID, paginated.
+// queryMessagesSince returns events for messages with timestamp >= since AND id > afterID, paginated,
+// using stmt prepared from messagesSinceSQL.
 func queryMessagesSince(
 	db *sql.DB,
+	stmt *sql.Stmt,
 	since time.Time,
 	afterID int64,
 	limit int,
@@ -765,8 +843,7 @@ func queryMessagesSince(
 	// Format since in the same style go-sqlite3 uses for storage ("2006-01-02 15:04:05+00:00").
 	sinceStr := since.UTC().Format("2006-01-02 15:04:05+00:00")
 
-	q := warehouseMessageQuery + "WHERE m.timestamp >= ? AND m.id > ? ORDER BY m.id LIMIT ?"
-	rows, err := db.Query(q, sinceStr, afterID, limit)
+	rows, err := stmt.Query(sinceStr, afterID, limit)
 	if err != nil {
 		return nil, afterID, fmt.Errorf("query failed: %w", err)
 	}
@@ -1035,8 +1112,10 @@ func scanWarehouseReactionRow(rows *sql.Rows, row *warehouseReactionRow) error {
 	)
 }
 
-func queryNewReactions(db *sql.DB, sinceID int64, meIdentifier string) ([]nexadapter.NexusEvent, int64, error) {
-	rows, err := db.Query(warehouseReactionQuery+"WHERE r.id > ? ORDER BY r.id", sinceID)
+// queryNewReactions returns events for reactions with id > sinceID, using stmt
+// prepared from newReactionsSQL.
+func queryNewReactions(stmt *sql.Stmt, sinceID int64, meIdentifier string) ([]nexadapter.NexusEvent, int64, error) {
+	rows, err := stmt.Query(sinceID)
 	if err != nil {
 		return nil, sinceID, fmt.Errorf("reaction query failed: %w", err)
 	}
@@ -1058,19 +1137,14 @@ func queryNewReactions(db *sql.DB, sinceID int64, meIdentifier string) ([]nexada
 }
 
 func queryReactionsSince(
-	db *sql.DB,
+	stmt *sql.Stmt,
 	since time.Time,
 	afterID int64,
 	limit int,
 	meIdentifier string,
 ) ([]nexadapter.NexusEvent, int64, error) {
 	sinceStr := since.UTC().Format("2006-01-02 15:04:05+00:00")
-	rows, err := db.Query(
-		warehouseReactionQuery+"WHERE r.timestamp >= ? AND r.id > ? ORDER BY r.id LIMIT ?",
-		sinceStr,
-		afterID,
-		limit,
-	)
+	rows, err := stmt.Query(sinceStr, afterID, limit)
 	if err != nil {
 		return nil, afterID, fmt.Errorf("reaction query failed: %w", err)
 	}
@@ -1209,12 +1283,14 @@ func scanWarehouseMembershipRow(rows *sql.Rows, row *warehouseMembershipRow) err
 	)
 }
 
+// queryNewMembershipEvents returns events for membership changes with id >
+// sinceID, using stmt prepared from newMembershipEventsSQL.
 func queryNewMembershipEvents(
-	db *sql.DB,
+	stmt *sql.Stmt,
 	sinceID int64,
 	meIdentifier string,
 ) ([]nexadapter.NexusEvent, int64, error) {
-	rows, err := db.Query(warehouseMembershipQuery+"WHERE me.id > ? ORDER BY me.id", sinceID)
+	rows, err := stmt.Query(sinceID)
 	if err != nil {
 		return nil, sinceID, fmt.Errorf("membership query failed: %w", err)
 	}
@@ -1236,19 +1312,14 @@ func queryNewMembershipEvents(
 }
 
 func queryMembershipEventsSince(
-	db *sql.DB,
+	stmt *sql.Stmt,
 	since time.Time,
 	afterID int64,
 	limit int,
 	meIdentifier string,
 ) ([]nexadapter.NexusEvent, int64, error) {
 	sinceStr := since.UTC().Format("2006-01-02 15:04:05+00:00")
-	rows, err := db.Query(
-		warehouseMembershipQuery+"WHERE me.timestamp >= ? AND me.id > ? ORDER BY me.id LIMIT ?",
-		sinceStr,
-		afterID,
-		limit,
-	)
+	rows, err := stmt.Query(sinceStr, afterID, limit)
 	if err != nil {
 		return nil, afterID, fmt.Errorf("membership query failed: %w", err)
 	}
@@ -1375,6 +1446,10 @@ func mapGroupActionType(actionType int64) string {
 // Database helpers
 // =====================================================================
 
+// warehouseDSNParams configures each warehouse connection as the monitor
+// needs it: foreign keys on, a 10s busy timeout, WAL and synchronous=NORMAL.
+const warehouseDSNParams = "?_foreign_keys=on&_busy_timeout=10000&_journal_mode=WAL&_synchronous=NORMAL"
+
 // openWarehouse opens Eve's warehouse database (eve.db, read-write),
 // running migrations if needed.
 func openWarehouse() (*sql.DB, error) {
@@ -1388,8 +1463,10 @@ func openWarehouse() (*sql.DB, error) {
 		return nil, fmt.Errorf("warehouse migration failed: %w", err)
 	}
 
-	// Open warehouse.
-	warehouseDB, err := sql.Open("sqlite3", cfg.EveDBPath)
+	// Open warehouse. The PRAGMAs are DSN parameters so the driver applies
+	// them to every connection it opens, including one that replaces a
+	// connection the pool discarded, not just the first.
+	warehouseDB, err := sql.Open("sqlite3", cfg.EveDBPath+warehouseDSNParams)
 	if err != nil {
 		return nil, fmt.Errorf("failed to open warehouse: %w", err)
 	}
@@ -1399,18 +1476,9 @@ func openWarehouse() (*sql.DB, error) {
 	warehouseDB.SetMaxOpenConns(1)
 	warehouseDB.SetMaxIdleConns(1)
 
-	// PRAGMAs apply per-connection; with MaxOpenConns(1) this is sufficient.
-	pragmas := []string{
-		"PRAGMA foreign_keys=ON;",
-		"PRAGMA busy_timeout=10000;",
-		"PRAGMA journal_mode=WAL;",
-		"PRAGMA synchronous=NORMAL;",
-	}
-	for _, pragma := range pragmas {
-		if _, err := warehouseDB.Exec(pragma); err != nil {
-			_ = warehouseDB.Close()
-			return nil, fmt.Errorf("failed to set %s: %w", pragma, err)
-		}
+	if err := warehouseDB.Ping(); err != nil {
+		_ = warehouseDB.Close()
+		return nil, fmt.Errorf("failed to open warehouse: %w", err)
 	}
 
 	return warehouseDB, nil
@@ -1497,21 +1565,39 @@ func getMeIdentifier(db *sql.DB) string {
 	return cachedMeIdentifier
 }
 
+// warehouseTimestampLayouts are the timestamp layouts seen in warehouse rows.
+// go-sqlite3 stores time.Time as "2006-01-02 15:04:05.999999999+00:00", but
+// TIMESTAMP columns scanned into strings come back as RFC3339.
+var warehouseTimestampLayouts = []string{
+	"2006-01-02 15:04:05.999999999+00:00",
+	"2006-01-02 15:04:05.999999999-07:00",
+	"2006-01-02T15:04:05.999999999Z07:00",
+	"2006-01-02 15:04:05+00:00",
+	"2006-01-02T15:04:05Z",
+	"2006-01-02 15:04:05",
+	"2006-01-02",
+}
+
+// lastTimestampLayout is the index of the layout that parsed the previous
+// timestamp. A warehouse uses one layout throughout, so trying it first turns
+// the per-row format search into a single parse.
+var lastTimestampLayout atomic.Int32
+
 // parseTimestampMs parses a warehouse timestamp string into Unix milliseconds.
-// Handles the go-sqlite3 storage format: "2006-01-02 15:04:05.999999999+00:00".
 func parseTimestampMs(s string) int64 {
-	// go-sqlite3 stores time.Time as "2006-01-02 15:04:05.999999999+00:00"
-	formats := []string{
-		"2006-01-02 15:04:05.999999999+00:00",
-		"2006-01-02 15:04:05.999999999-07:00",
-		"2006-01-02T15:04:05.999999999Z07:00",
-		"2006-01-02 15:04:05+00:00",
-		"2006-01-02T15:04:05Z",
-		"2006-01-02 15:04:05",
-		"2006-01-02",
-	}
-	for _, f := range formats {
+	if s == "" {
+		return 0
+	}
+	last := int(lastTimestampLayout.Load())
+	if t, err := time.Parse(warehouseTimestampLayouts[last], s); err == nil {
+		return t.UnixMilli()
+	}
+	for i, f := range warehouseTimestampLayouts {
+		if i == last {
+			continue
+		}
 		if t, err := time.Parse(f, s); err == nil {
+			lastTimestampLayout.Store(int32(i))
 			return t.UnixMilli()
 		}
 	}
@@ -1,6 +1,7 @@
 package main
 
 import (
+	"bufio"
 	"context"
 	"database/sql"
 	"encoding/json"
@@ -10,10 +11,10 @@ import (
 	"os/signal"
 	"path/filepath"
 	"runtime"
+	"sort"
 	"strings"
 	"syscall"
 	"time"
-	"unsafe"
 
 	"github.com/Napageneral/eve/internal/config"
 	"github.com/Napageneral/eve/internal/db"
@@ -30,6 +31,202 @@ import (
 
 var version = "0.1.0-dev"
 
+// writeDSNParams configures every connection that writes to the warehouse or
+// queue. WAL lets readers proceed during writes, and synchronous=NORMAL (safe
+// under WAL) syncs the WAL only at checkpoints instead of on every commit, so
+// the many small transactions of sync and job processing don't each pay an
+// fsync.
+const writeDSNParams = "?_journal_mode=WAL&_busy_timeout=5000&_synchronous=NORMAL"
+
+// listChatsSQL lists chats by recent activity. Optional filters are bound as
+// parameters rather than spliced into the text, so every call runs the same
+// statement: args are (search, pattern, pattern, limit) with search == ""
+// disabling the name filter and limit -1 meaning no limit.
+const listChatsSQL = `
+	SELECT
+		c.id,
+		COALESCE(c.chat_name, '') as chat_name,
+		c.chat_identifier,
+		c.is_group,
+		c.service_name,
+		COALESCE(c.total_messages, 0) as total_messages,
+		c.last_message_date,
+		c.created_date
+	FROM chats c
+	WHERE (? = '' OR c.chat_name LIKE ? OR c.chat_identifier LIKE ?)
+	ORDER BY c.last_message_date DESC NULLS LAST, c.id DESC
+	LIMIT ?
+`
+
+// listContactsSQL is the shared body of the contacts listings; args are
+// (search, pattern, limit) as for listChatsSQL. Message counts are aggregated
+// once per sender (a single pass over idx_messages_sender_id) and joined in,
+// instead of a correlated COUNT(*) subquery per contact row.
+const listContactsSQL = `
+	WITH sender_counts AS (
+		SELECT sender_id, COUNT(*) AS message_count
+		FROM messages
+		WHERE sender_id IS NOT NULL
+		GROUP BY sender_id
+	)
+	SELECT
+		c.id,
+		COALESCE(c.name, '') as name,
+		c.is_me,
+		c.data_source,
+		COALESCE(sc.message_count, 0) as message_count
+	FROM contacts c
+	LEFT JOIN sender_counts sc ON sc.sender_id = c.id
+	WHERE c.name IS NOT NULL AND c.name != ''
+	  AND (? = '' OR c.name LIKE ?)
+`
+
+const (
+	listContactsByNameSQL         = listContactsSQL + ` ORDER BY c.name ASC LIMIT ?`
+	listContactsByMessageCountSQL = listContactsSQL + ` ORDER BY message_count DESC LIMIT ?`
+)
+
+// messagesBeforeCursorSQL restricts a newest-first message listing to rows
+// strictly older than the cursor message, ordering by (timestamp, id) so
+// messages sharing a timestamp are neither skipped nor repeated. Each page is a
+// range seek on the timestamp indexes, however deep the cursor is.
+const messagesBeforeCursorSQL = ` AND (m.timestamp, m.id) < (SELECT timestamp, id FROM messages WHERE id = ?)`
+
+// attachmentsBeforeCursorSQL restricts a newest-first (a.id DESC) attachment
+// listing to rows older than the cursor attachment: a rowid range seek, so a
+// page costs the same however deep it is.
+const attachmentsBeforeCursorSQL = ` AND a.id < ?`
+
+// idSetSQL expands one bound JSON array parameter (see jsonIDs) into a row
+// set for IN, so an ID list of any length is a single bound parameter and the
+// statement text doesn't vary with its length.
+const idSetSQL = `SELECT value FROM json_each(?)`
+
+// jsonIDs encodes ids as the JSON array idSetSQL expects.
+func jsonIDs[T int | int64](ids []T) string {
+	if len(ids) == 0 {
+		return "[]"
+	}
+	b, _ := json.Marshal(ids)
+	return string(b)
+}
+
+// searchEmbeddingsSQL reads every conversation embedding with its chat for
+// search scoring. searchChatEmbeddingsSQL does the same for one chat, driving
+// from that chat's conversations (CROSS JOIN fixes the join order) and
+// seeking each one's embedding by (entity_type, entity_id), rather than
+// scanning every conversation embedding and discarding other chats.
+const (
+	searchEmbeddingsSQL = `
+		SELECT e.entity_id, e.embedding_blob, e.dimension, c.chat_id
+		FROM embeddings e
+		JOIN conversations c ON e.entity_id = c.id
+		WHERE e.entity_type = 'conversation'
+	`
+	searchChatEmbeddingsSQL = `
+		SELECT e.entity_id, e.embedding_blob, e.dimension, c.chat_id
+		FROM conversations c
+		CROSS JOIN embeddings e ON e.entity_type = 'conversation' AND e.entity_id = c.id
+		WHERE c.chat_id = ?
+	`
+)
+
+// searchChatNamesSQL and searchSnippetsSQL resolve the chat names and the
+// three-latest-messages snippets of all top search results in one statement
+// each, for the chat and conversation IDs bound as a jsonIDs array. The
+// window numbers each conversation's messages newest first, and the outer
+// ORDER BY feeds GROUP_CONCAT in that order.
+const (
+	searchChatNamesSQL = `SELECT id, COALESCE(chat_name, '') FROM chats WHERE id IN (` + idSetSQL + `)`
+	searchSnippetsSQL  = `
+		SELECT conversation_id, GROUP_CONCAT(content, ' | ')
+		FROM (
+			SELECT conversation_id, content
+			FROM (
+				SELECT conversation_id, content,
+					ROW_NUMBER() OVER (PARTITION BY conversation_id ORDER BY timestamp DESC) AS rn
+				FROM messages
+				WHERE conversation_id IN (` + idSetSQL + `)
+				  AND content IS NOT NULL AND content != ''
+			)
+			WHERE rn <= 3
+			ORDER BY conversation_id, rn
+		)
+		GROUP BY conversation_id
+	`
+)
+
+// deadAnalysisJobsSQL lists dead analysis jobs with only the fields the
+// test-analysis report needs. The conversation ID is extracted in SQL, so the
+// payload JSON isn't shipped to and decoded in Go for every row; the raw
+// payload is returned only when it isn't a valid JSON object, to report why.
+const deadAnalysisJobsSQL = `
+	SELECT
+		CASE WHEN json_valid(payload_json) AND json_type(payload_json) = 'object'
+			THEN COALESCE(json_extract(payload_json, '$.conversation_id'), 0) ELSE 0 END,
+		CASE WHEN json_valid(payload_json) AND json_type(payload_json) = 'object'
+			THEN NULL ELSE payload_json END,
+		attempts,
+		COALESCE(last_error, '')
+	FROM jobs
+	WHERE type = 'analysis' AND state = 'dead'
+`
+
+// facetCountsSQL, facetCountsByChatSQL and facetCountsByConversationsSQL count
+// the topics, entities, emotions and humor_items rows overall, for one chat,
+// or for a JSON array of conversation IDs, in a single statement instead of
+// one round-trip per table.
+const (
+	facetCountsSQL = `
+		SELECT
+			(SELECT COUNT(*) FROM topics),
+			(SELECT COUNT(*) FROM entities),
+			(SELECT COUNT(*) FROM emotions),
+			(SELECT COUNT(*) FROM humor_items)
+	`
+	facetCountsByChatSQL = `
+		SELECT
+			(SELECT COUNT(*) FROM topics WHERE chat_id = ?1),
+			(SELECT COUNT(*) FROM entities WHERE chat_id = ?1),
+			(SELECT COUNT(*) FROM emotions WHERE chat_id = ?1),
+			(SELECT COUNT(*) FROM humor_items WHERE chat_id = ?1)
+	`
+	facetCountsByConversationsSQL = `
+		WITH conv_ids AS (` + idSetSQL + `)
+		SELECT
+			(SELECT COUNT(*) FROM topics WHERE conversation_id IN conv_ids),
+			(SELECT COUNT(*) FROM entities WHERE conversation_id IN conv_ids),
+			(SELECT COUNT(*) FROM emotions WHERE conversation_id IN conv_ids),
+			(SELECT COUNT(*) FROM humor_items WHERE conversation_id IN conv_ids)
+	`
+)
+
+// queryFacetCounts runs one of the facetCounts queries and returns the topics,
+// entities, emotions and humor_items counts in that order.
+func queryFacetCounts(db *sql.DB, query string, args ...interface{}) (topics, entities, emotions, humor int, err error) {
+	err = db.QueryRow(query, args...).Scan(&topics, &entities, &emotions, &humor)
+	return topics, entities, emotions, humor, err
+}
+
+// contactIDByNameSQL and contactIDLikeNameSQL resolve a --contact argument.
+// An exact name is a seek on idx_contacts_name; only when none matches does
+// the lookup fall back to a substring scan, preferring the shortest name.
+const (
+	contactIDByNameSQL   = `SELECT id FROM contacts WHERE name = ? LIMIT 1`
+	contactIDLikeNameSQL = `SELECT id FROM contacts WHERE name LIKE ? ORDER BY LENGTH(name) LIMIT 1`
+)
+
+// findContactID returns the contact named name, or else the closest contact
+// whose name contains it. It returns sql.ErrNoRows when nothing matches.
+func findContactID(db *sql.DB, name string) (int64, error) {
+	var id int64
+	err := db.QueryRow(contactIDByNameSQL, name).Scan(&id)
+	if err == sql.ErrNoRows {
+		err = db.QueryRow(contactIDLikeNameSQL, "%"+name+"%").Scan(&id)
+	}
+	return id, err
+}
+
 func recommendedSQLitePool(workerCount int) (maxOpen int, maxIdle int) {
 	// SQLite performs poorly with extremely high connection counts (each conn has its own page cache).
 	// We want enough parallelism for reads, but cap to avoid cache thrash and lock contention.
@@ -329,7 +526,7 @@ For more: https://github.com/Napageneral/eve
 			defer chatDB.Close()
 
 			// Open warehouse database
-			warehouseDB, err := sql.Open("sqlite3", cfg.EveDBPath)
+			warehouseDB, err := sql.Open("sqlite3", cfg.EveDBPath+writeDSNParams)
 			if err != nil {
 				return printErrorJSON(fmt.Errorf("failed to open warehouse database: %w", err))
 			}
@@ -349,31 +546,20 @@ For more: https://github.com/Napageneral/eve
 
 			// If dry-run, only count messages
 			if syncDryRun {
-				// Count messages
+				// Count messages, chats and handles
 				messageCount, err := chatDB.CountMessages(sinceRowID)
 				if err != nil {
 					return printErrorJSON(fmt.Errorf("failed to count messages: %w", err))
 				}
 
-				// Get chat and handle counts
-				chatCount, err := chatDB.GetChatCount()
-				if err != nil {
-					return printErrorJSON(fmt.Errorf("failed to count chats: %w", err))
-				}
-
-				handleCount, err := chatDB.GetHandleCount()
-				if err != nil {
-					return printErrorJSON(fmt.Errorf("failed to count handles: %w", err))
-				}
-
 				// Output JSON (no message text, only counts)
 				output := map[string]interface{}{
 					"ok":             true,
 					"dry_run":        true,
 					"chat_db_path":   chatDBPath,
 					"messages_found": messageCount.TotalMessages,
-					"chats_found":    chatCount,
-					"handles_found":  handleCount,
+					"chats_found":    messageCount.TotalChats,
+					"handles_found":  messageCount.TotalHandles,
 					"since_rowid":    sinceRowID,
 					"max_rowid":      messageCount.MaxRowID,
 				}
@@ -466,7 +652,7 @@ For more: https://github.com/Napageneral/eve
 			cfg := config.Load()
 
 			// Open queue database with WAL mode and busy timeout
-			queueDB, err := sql.Open("sqlite3", cfg.QueueDBPath+"?_journal_mode=WAL&_busy_timeout=5000")
+			queueDB, err := sql.Open("sqlite3", cfg.QueueDBPath+writeDSNParams)
 			if err != nil {
 				return printErrorJSON(fmt.Errorf("failed to open queue database: %w", err))
 			}
@@ -480,7 +666,7 @@ For more: https://github.com/Napageneral/eve
 			q := queue.New(queueDB)
 
 			// Open warehouse database for handlers
-			warehouseDB, err := sql.Open("sqlite3", cfg.EveDBPath+"?_journal_mode=WAL&_busy_timeout=5000")
+			warehouseDB, err := sql.Open("sqlite3", cfg.EveDBPath+writeDSNParams)
 			if err != nil {
 				return printErrorJSON(fmt.Errorf("failed to open warehouse database: %w", err))
 			}
@@ -665,7 +851,7 @@ For more: https://github.com/Napageneral/eve
 			}
 
 			// Open warehouse DB (read conversation IDs + write facets)
-			warehouseDB, err := sql.Open("sqlite3", cfg.EveDBPath+"?_journal_mode=WAL&_busy_timeout=5000")
+			warehouseDB, err := sql.Open("sqlite3", cfg.EveDBPath+writeDSNParams)
 			if err != nil {
 				return printErrorJSON(fmt.Errorf("failed to open warehouse database: %w", err))
 			}
@@ -723,14 +909,9 @@ For more: https://github.com/Napageneral/eve
 				return printErrorJSON(fmt.Errorf("failed to begin reset transaction: %w", err))
 			}
 			if testAnalysisLimit > 0 {
-				// Build (?,?,...) IN clause for selected conversation IDs (<= 999).
-				placeholders := make([]string, 0, len(conversationIDs))
-				args := make([]interface{}, 0, len(conversationIDs))
-				for _, id := range conversationIDs {
-					placeholders = append(placeholders, "?")
-					args = append(args, id)
-				}
-				inClause := strings.Join(placeholders, ",")
+				// Bind the selected conversation IDs as one JSON array.
+				inClause := idSetSQL
+				args := []interface{}{jsonIDs(conversationIDs)}
 
 				// Clear prior convo-all analysis rows for selected conversations.
 				clearAnalysesSQL := fmt.Sprintf(
@@ -794,7 +975,7 @@ For more: https://github.com/Napageneral/eve
 				return printErrorJSON(fmt.Errorf("failed to migrate temp queue db: %w", err))
 			}
 
-			queueDB, err := sql.Open("sqlite3", tmpPath+"?_journal_mode=WAL&_busy_timeout=5000")
+			queueDB, err := sql.Open("sqlite3", tmpPath+writeDSNParams)
 			if err != nil {
 				return printErrorJSON(fmt.Errorf("failed to open temp queue db: %w", err))
 			}
@@ -883,30 +1064,34 @@ For more: https://github.com/Napageneral/eve
 				LastError      string `json:"last_error"`
 			}
 			var deadJobs []deadJob
-			deadRows, err := queueDB.Query(`SELECT payload_json, attempts, COALESCE(last_error, '') FROM jobs WHERE type='analysis' AND state='dead'`)
+			deadRows, err := queueDB.Query(deadAnalysisJobsSQL)
 			if err != nil {
 				return printErrorJSON(fmt.Errorf("failed to query dead jobs: %w", err))
 			}
 			for deadRows.Next() {
-				var payloadJSON string
+				var convID int
+				var invalidPayload sql.NullString
 				var attempts int
 				var lastErr string
-				if err := deadRows.Scan(&payloadJSON, &attempts, &lastErr); err != nil {
+				if err := deadRows.Scan(&convID, &invalidPayload, &attempts, &lastErr); err != nil {
 					deadRows.Close()
 					return printErrorJSON(fmt.Errorf("failed to scan dead job: %w", err))
 				}
-				var p engine.AnalysisJobPayload
-				if err := json.Unmarshal([]byte(payloadJSON), &p); err != nil {
-					// If the payload is malformed, still surface the error.
-					deadJobs = append(deadJobs, deadJob{
-						ConversationID: 0,
-						Attempts:       attempts,
-						LastError:      "invalid payload_json: " + err.Error(),
-					})
-					continue
+				if invalidPayload.Valid {
+					var p engine.AnalysisJobPayload
+					if err := json.Unmarshal([]byte(invalidPayload.String), &p); err != nil {
+						// If the payload is malformed, still surface the error.
+						deadJobs = append(deadJobs, deadJob{
+							ConversationID: 0,
+							Attempts:       attempts,
+							LastError:      "invalid payload_json: " + err.Error(),
+						})
+						continue
+					}
+					convID = p.ConversationID
 				}
 				deadJobs = append(deadJobs, deadJob{
-					ConversationID: p.ConversationID,
+					ConversationID: convID,
 					Attempts:       attempts,
 					LastError:      lastErr,
 				})
@@ -924,69 +1109,21 @@ For more: https://github.com/Napageneral/eve
 			}
 
 			// Aggregate facet counts (no message text).
-			var topicsTotal, entitiesTotal, emotionsTotal, humorTotal int
+			facetQuery, facetArgs := facetCountsByChatSQL, []interface{}{targetChatID}
 			if testAnalysisLimit > 0 {
-				placeholders := make([]string, 0, len(conversationIDs))
-				args := make([]interface{}, 0, len(conversationIDs))
-				for _, id := range conversationIDs {
-					placeholders = append(placeholders, "?")
-					args = append(args, id)
-				}
-				inClause := strings.Join(placeholders, ",")
-				qCount := func(table string) (int, error) {
-					var c int
-					sql := fmt.Sprintf(`SELECT COUNT(*) FROM %s WHERE conversation_id IN (%s)`, table, inClause)
-					if err := warehouseDB.QueryRow(sql, args...).Scan(&c); err != nil {
-						return 0, err
-					}
-					return c, nil
-				}
-				if v, err := qCount("topics"); err != nil {
-					return printErrorJSON(fmt.Errorf("failed to count topics: %w", err))
-				} else {
-					topicsTotal = v
-				}
-				if v, err := qCount("entities"); err != nil {
-					return printErrorJSON(fmt.Errorf("failed to count entities: %w", err))
-				} else {
-					entitiesTotal = v
-				}
-				if v, err := qCount("emotions"); err != nil {
-					return printErrorJSON(fmt.Errorf("failed to count emotions: %w", err))
-				} else {
-					emotionsTotal = v
-				}
-				if v, err := qCount("humor_items"); err != nil {
-					return printErrorJSON(fmt.Errorf("failed to count humor_items: %w", err))
-				} else {
-					humorTotal = v
-				}
-			} else {
-				if err := warehouseDB.QueryRow(`SELECT COUNT(*) FROM topics WHERE chat_id = ?`, targetChatID).Scan(&topicsTotal); err != nil {
-					return printErrorJSON(fmt.Errorf("failed to count topics: %w", err))
-				}
-				if err := warehouseDB.QueryRow(`SELECT COUNT(*) FROM entities WHERE chat_id = ?`, targetChatID).Scan(&entitiesTotal); err != nil {
-					return printErrorJSON(fmt.Errorf("failed to count entities: %w", err))
-				}
-				if err := warehouseDB.QueryRow(`SELECT COUNT(*) FROM emotions WHERE chat_id = ?`, targetChatID).Scan(&emotionsTotal); err != nil {
-					return printErrorJSON(fmt.Errorf("failed to count emotions: %w", err))
-				}
-				if err := warehouseDB.QueryRow(`SELECT COUNT(*) FROM humor_items WHERE chat_id = ?`, targetChatID).Scan(&humorTotal); err != nil {
-					return printErrorJSON(fmt.Errorf("failed to count humor_items: %w", err))
-				}
+				facetQuery, facetArgs = facetCountsByConversationsSQL, []interface{}{jsonIDs(conversationIDs)}
+			}
+			topicsTotal, entitiesTotal, emotionsTotal, humorTotal, err := queryFacetCounts(warehouseDB, facetQuery, facetArgs...)
+			if err != nil {
+				return printErrorJSON(fmt.Errorf("failed to count facets: %w", err))
 			}
 
 			// Count statuses from the warehouse.
 			statusCounts := map[string]int{}
 			var srows *sql.Rows
 			if testAnalysisLimit > 0 {
-				placeholders := make([]string, 0, len(conversationIDs))
-				args := make([]interface{}, 0, len(conversationIDs))
-				for _, id := range conversationIDs {
-					placeholders = append(placeholders, "?")
-					args = append(args, id)
-				}
-				inClause := strings.Join(placeholders, ",")
+				inClause := idSetSQL
+				args := []interface{}{jsonIDs(conversationIDs)}
 				sql := fmt.Sprintf(`
 					SELECT status, COUNT(*) AS c
 					FROM conversation_analyses
@@ -1026,13 +1163,8 @@ For more: https://github.com/Napageneral/eve
 			var blocked []blockedConvo
 			var brows *sql.Rows
 			if testAnalysisLimit > 0 {
-				placeholders := make([]string, 0, len(conversationIDs))
-				args := make([]interface{}, 0, len(conversationIDs))
-				for _, id := range conversationIDs {
-					placeholders = append(placeholders, "?")
-					args = append(args, id)
-				}
-				inClause := strings.Join(placeholders, ",")
+				inClause := idSetSQL
+				args := []interface{}{jsonIDs(conversationIDs)}
 				sql := fmt.Sprintf(`
 					SELECT conversation_id, COALESCE(blocked_reason, '')
 					FROM conversation_analyses
@@ -1139,7 +1271,7 @@ For more: https://github.com/Napageneral/eve
 				return printErrorJSON(fmt.Errorf("GEMINI_API_KEY is required"))
 			}
 
-			warehouseDB, err := sql.Open("sqlite3", cfg.EveDBPath+"?_journal_mode=WAL&_busy_timeout=5000")
+			warehouseDB, err := sql.Open("sqlite3", cfg.EveDBPath+writeDSNParams)
 			if err != nil {
 				return printErrorJSON(fmt.Errorf("failed to open warehouse database: %w", err))
 			}
@@ -1261,7 +1393,7 @@ For more: https://github.com/Napageneral/eve
 				return printErrorJSON(fmt.Errorf("failed to migrate temp queue db: %w", err))
 			}
 
-			queueDB, err := sql.Open("sqlite3", tmpPath+"?_journal_mode=WAL&_busy_timeout=5000")
+			queueDB, err := sql.Open("sqlite3", tmpPath+writeDSNParams)
 			if err != nil {
 				return printErrorJSON(fmt.Errorf("failed to open temp queue db: %w", err))
 			}
@@ -1424,29 +1556,21 @@ For more: https://github.com/Napageneral/eve
 				return printErrorJSON(fmt.Errorf("facet embeddings phase failed: %w", err))
 			}
 
-			// Counts of embeddings present after run (no vectors printed).
-			var convEmbCount int
+			// Counts of embeddings present after run (no vectors printed), in one
+			// pass over this model's embeddings.
+			var convEmbCount, entityEmb, topicEmb, emotionEmb, humorEmb int
 			if err := warehouseDB.QueryRow(`
-				SELECT COUNT(*) FROM embeddings
-				WHERE entity_type = 'conversation'
-				  AND entity_id IN (SELECT id FROM conversations WHERE chat_id = ?)
-				  AND model = ?
-			`, targetChatID, cfg.EmbedModel).Scan(&convEmbCount); err != nil {
-				return printErrorJSON(fmt.Errorf("failed to count conversation embeddings: %w", err))
-			}
-
-			var entityEmb, topicEmb, emotionEmb, humorEmb int
-			if err := warehouseDB.QueryRow(`SELECT COUNT(*) FROM embeddings WHERE entity_type='entity' AND model=?`, cfg.EmbedModel).Scan(&entityEmb); err != nil {
-				return printErrorJSON(fmt.Errorf("failed to count entity embeddings: %w", err))
-			}
-			if err := warehouseDB.QueryRow(`SELECT COUNT(*) FROM embeddings WHERE entity_type='topic' AND model=?`, cfg.EmbedModel).Scan(&topicEmb); err != nil {
-				return printErrorJSON(fmt.Errorf("failed to count topic embeddings: %w", err))
-			}
-			if err := warehouseDB.QueryRow(`SELECT COUNT(*) FROM embeddings WHERE entity_type='emotion' AND model=?`, cfg.EmbedModel).Scan(&emotionEmb); err != nil {
-				return printErrorJSON(fmt.Errorf("failed to count emotion embeddings: %w", err))
-			}
-			if err := warehouseDB.QueryRow(`SELECT COUNT(*) FROM embeddings WHERE entity_type='humor_item' AND model=?`, cfg.EmbedModel).Scan(&humorEmb); err != nil {
-				return printErrorJSON(fmt.Errorf("failed to count humor_item embeddings: %w", err))
+				SELECT
+					COUNT(*) FILTER (WHERE entity_type = 'conversation'
+						AND entity_id IN (SELECT id FROM conversations WHERE chat_id = ?)),
+					COUNT(*) FILTER (WHERE entity_type = 'entity'),
+					COUNT(*) FILTER (WHERE entity_type = 'topic'),
+					COUNT(*) FILTER (WHERE entity_type = 'emotion'),
+					COUNT(*) FILTER (WHERE entity_type = 'humor_item')
+				FROM embeddings
+				WHERE model = ?
+			`, targetChatID, cfg.EmbedModel).Scan(&convEmbCount, &entityEmb, &topicEmb, &emotionEmb, &humorEmb); err != nil {
+				return printErrorJSON(fmt.Errorf("failed to count embeddings: %w", err))
 			}
 
 			output := map[string]interface{}{
@@ -1795,7 +1919,9 @@ For more: https://github.com/Napageneral/eve
 				if err == nil {
 					defer chatDB.Close()
 
-					// Query distinct accounts from outgoing messages
+					// Query distinct accounts from outgoing messages. DISTINCT
+					// already makes each prefixed account unique, so the parsed
+					// phones/emails need no further de-duplication.
 					rows, err := chatDB.Query(`
 						SELECT DISTINCT account 
 						FROM message 
@@ -1810,12 +1936,12 @@ For more: https://github.com/Napageneral/eve
 								// Parse account format: P:+1xxx or E:email@example.com
 								if strings.HasPrefix(account, "P:") {
 									phone := strings.TrimPrefix(account, "P:")
-									if phone != "" && !contains(phones, phone) {
+									if phone != "" {
 										phones = append(phones, phone)
 									}
 								} else if strings.HasPrefix(account, "E:") {
 									email := strings.TrimPrefix(account, "E:")
-									if email != "" && !contains(emails, email) {
+									if email != "" {
 										emails = append(emails, email)
 									}
 								}
@@ -1854,34 +1980,14 @@ For more: https://github.com/Napageneral/eve
 			}
 			defer db.Close()
 
-			// Build query with optional search filter
-			query := `
-				SELECT 
-					c.id,
-					COALESCE(c.chat_name, '') as chat_name,
-					c.chat_identifier,
-					c.is_group,
-					c.service_name,
-					COALESCE(c.total_messages, 0) as total_messages,
-					c.last_message_date,
-					c.created_date
-				FROM chats c
-			`
-			queryArgs := []interface{}{}
-
-			if chatsSearch != "" {
-				query += ` WHERE c.chat_name LIKE ? OR c.chat_identifier LIKE ?`
-				searchPattern := "%" + chatsSearch + "%"
-				queryArgs = append(queryArgs, searchPattern, searchPattern)
-			}
-
-			query += ` ORDER BY c.last_message_date DESC NULLS LAST, c.id DESC`
-
-			if chatsLimit > 0 {
-				query += fmt.Sprintf(" LIMIT %d", chatsLimit)
+			// Fixed query text; an empty search and limit -1 disable those filters.
+			limit := chatsLimit
+			if limit <= 0 {
+				limit = -1
 			}
+			searchPattern := "%" + chatsSearch + "%"
 
-			rows, err := db.Query(query, queryArgs...)
+			rows, err := db.Query(listChatsSQL, chatsSearch, searchPattern, searchPattern, limit)
 			if err != nil {
 				return printErrorJSON(fmt.Errorf("query failed: %w", err))
 			}
@@ -1962,35 +2068,18 @@ For more: https://github.com/Napageneral/eve
 			}
 			defer db.Close()
 
-			// Build query
-			query := `
-				SELECT 
-					c.id,
-					COALESCE(c.name, '') as name,
-					c.is_me,
-					c.data_source,
-					(SELECT COUNT(*) FROM messages m WHERE m.sender_id = c.id) as message_count
-				FROM contacts c
-				WHERE c.name IS NOT NULL AND c.name != ''
-			`
-			queryArgs := []interface{}{}
-
-			if contactsSearch != "" {
-				query += ` AND c.name LIKE ?`
-				queryArgs = append(queryArgs, "%"+contactsSearch+"%")
-			}
-
+			// Fixed query texts; an empty search and limit -1 disable those filters.
+			query := listContactsByNameSQL
+			limit := contactsLimit
 			if contactsTop > 0 {
-				query += ` ORDER BY message_count DESC LIMIT ?`
-				queryArgs = append(queryArgs, contactsTop)
-			} else {
-				query += ` ORDER BY c.name ASC`
-				if contactsLimit > 0 {
-					query += fmt.Sprintf(" LIMIT %d", contactsLimit)
-				}
+				query = listContactsByMessageCountSQL
+				limit = contactsTop
+			}
+			if limit <= 0 {
+				limit = -1
 			}
 
-			rows, err := db.Query(query, queryArgs...)
+			rows, err := db.Query(query, contactsSearch, "%"+contactsSearch+"%", limit)
 			if err != nil {
 				return printErrorJSON(fmt.Errorf("query failed: %w", err))
 			}
@@ -2039,6 +2128,7 @@ For more: https://github.com/Napageneral/eve
 	var msgsUntil string
 	var msgsSearch string
 	var msgsLimit int
+	var msgsBeforeID int64
 	var msgsFormat string
 	var msgsAttachments bool
 
@@ -2058,15 +2148,7 @@ For more: https://github.com/Napageneral/eve
 			targetChatID := msgsChatID
 			if msgsContact != "" && targetChatID == 0 {
 				// Find contact by name (fuzzy match)
-				var contactID int64
-				err := db.QueryRow(`
-					SELECT id FROM contacts 
-					WHERE name LIKE ? 
-					ORDER BY 
-						CASE WHEN name = ? THEN 0 ELSE 1 END,
-						LENGTH(name)
-					LIMIT 1
-				`, "%"+msgsContact+"%", msgsContact).Scan(&contactID)
+				contactID, err := findContactID(db, msgsContact)
 				if err != nil {
 					return printErrorJSON(fmt.Errorf("contact '%s' not found", msgsContact))
 				}
@@ -2110,7 +2192,7 @@ For more: https://github.com/Napageneral/eve
 					return printErrorJSON(fmt.Errorf("invalid --since date: %w", err))
 				}
 				query += ` AND m.timestamp >= ?`
-				queryArgs = append(queryArgs, sinceTime.Format(time.RFC3339))
+				queryArgs = append(queryArgs, formatWarehouseTimestamp(sinceTime))
 			}
 
 			if msgsUntil != "" {
@@ -2119,7 +2201,7 @@ For more: https://github.com/Napageneral/eve
 					return printErrorJSON(fmt.Errorf("invalid --until date: %w", err))
 				}
 				query += ` AND m.timestamp < ?`
-				queryArgs = append(queryArgs, untilTime.Format(time.RFC3339))
+				queryArgs = append(queryArgs, formatWarehouseTimestamp(untilTime))
 			}
 
 			if msgsSearch != "" {
@@ -2127,13 +2209,19 @@ For more: https://github.com/Napageneral/eve
 				queryArgs = append(queryArgs, "%"+msgsSearch+"%")
 			}
 
-			query += ` ORDER BY m.timestamp DESC`
+			if msgsBeforeID > 0 {
+				query += messagesBeforeCursorSQL
+				queryArgs = append(queryArgs, msgsBeforeID)
+			}
+
+			query += ` ORDER BY m.timestamp DESC, m.id DESC`
 
+			limit := 100 // Default limit
 			if msgsLimit > 0 {
-				query += fmt.Sprintf(" LIMIT %d", msgsLimit)
-			} else {
-				query += " LIMIT 100" // Default limit
+				limit = msgsLimit
 			}
+			query += " LIMIT ?"
+			queryArgs = append(queryArgs, limit)
 
 			rows, err := db.Query(query, queryArgs...)
 			if err != nil {
@@ -2141,12 +2229,6 @@ For more: https://github.com/Napageneral/eve
 			}
 			defer rows.Close()
 
-			type attachmentInfo struct {
-				ID       int64  `json:"id"`
-				FileName string `json:"file_name"`
-				MimeType string `json:"mime_type"`
-			}
-
 			type messageRow struct {
 				ID          int64            `json:"id"`
 				Timestamp   string           `json:"timestamp"`
@@ -2183,20 +2265,13 @@ For more: https://github.com/Napageneral/eve
 
 			// Load attachments if requested
 			if msgsAttachments {
+				messageIDs := make([]int64, len(messages))
 				for i := range messages {
-					attRows, err := db.Query(`
-						SELECT id, COALESCE(file_name, ''), COALESCE(mime_type, '')
-						FROM attachments WHERE message_id = ?
-					`, messages[i].ID)
-					if err != nil {
-						continue
-					}
-					for attRows.Next() {
-						var att attachmentInfo
-						attRows.Scan(&att.ID, &att.FileName, &att.MimeType)
-						messages[i].Attachments = append(messages[i].Attachments, att)
-					}
-					attRows.Close()
+					messageIDs[i] = messages[i].ID
+				}
+				byMessage := loadAttachmentsByMessageID(db, messageIDs)
+				for i := range messages {
+					messages[i].Attachments = byMessage[messages[i].ID]
 				}
 			}
 
@@ -2213,8 +2288,9 @@ For more: https://github.com/Napageneral/eve
 					Sender      string           `json:"sender"`
 					Attachments []attachmentInfo `json:"attachments,omitempty"`
 				}
-				for _, msg := range messages {
-					row := jsonlRow{
+				out := make([]jsonlRow, len(messages))
+				for i, msg := range messages {
+					out[i] = jsonlRow{
 						ID:          msg.ID,
 						Timestamp:   msg.Timestamp,
 						Content:     msg.Content,
@@ -2223,18 +2299,21 @@ For more: https://github.com/Napageneral/eve
 						Sender:      msg.SenderName,
 						Attachments: msg.Attachments,
 					}
-					data, _ := json.Marshal(row)
-					fmt.Println(string(data))
 				}
-				return nil
+				return printJSONL(out)
 			}
 
 			// Default: wrapped JSON
-			return printJSON(map[string]interface{}{
+			output := map[string]interface{}{
 				"ok":       true,
 				"count":    len(messages),
 				"messages": messages,
-			})
+			}
+			if len(messages) == limit {
+				// Cursor for the next (older) page
+				output["next_before_id"] = messages[len(messages)-1].ID
+			}
+			return printJSON(output)
 		},
 	}
 
@@ -2244,6 +2323,7 @@ For more: https://github.com/Napageneral/eve
 	messagesCmd.Flags().StringVar(&msgsUntil, "until", "", "End date (YYYY-MM-DD or ISO8601)")
 	messagesCmd.Flags().StringVar(&msgsSearch, "search", "", "Search message content")
 	messagesCmd.Flags().IntVar(&msgsLimit, "limit", 100, "Limit number of results")
+	messagesCmd.Flags().Int64Var(&msgsBeforeID, "before-id", 0, "Only messages older than this message ID (page cursor)")
 	messagesCmd.Flags().StringVar(&msgsFormat, "format", "json", "Output format: json (default) or jsonl (streaming)")
 	messagesCmd.Flags().BoolVar(&msgsAttachments, "attachments", false, "Include attachment metadata")
 
@@ -2252,6 +2332,7 @@ For more: https://github.com/Napageneral/eve
 	var msgsAttMessageID int64
 	var msgsAttType string
 	var msgsAttLimit int
+	var msgsAttBeforeID int64
 
 	messagesAttachmentsCmd := &cobra.Command{
 		Use:   "attachments",
@@ -2295,13 +2376,19 @@ For more: https://github.com/Napageneral/eve
 				queryArgs = append(queryArgs, msgsAttType+"%")
 			}
 
+			if msgsAttBeforeID > 0 {
+				query += attachmentsBeforeCursorSQL
+				queryArgs = append(queryArgs, msgsAttBeforeID)
+			}
+
 			query += ` ORDER BY a.id DESC`
 
+			limit := 100
 			if msgsAttLimit > 0 {
-				query += fmt.Sprintf(" LIMIT %d", msgsAttLimit)
-			} else {
-				query += " LIMIT 100"
+				limit = msgsAttLimit
 			}
+			query += " LIMIT ?"
+			queryArgs = append(queryArgs, limit)
 
 			rows, err := db.Query(query, queryArgs...)
 			if err != nil {
@@ -2351,11 +2438,16 @@ For more: https://github.com/Napageneral/eve
 				attachments = append(attachments, att)
 			}
 
-			return printJSON(map[string]interface{}{
+			output := map[string]interface{}{
 				"ok":          true,
 				"count":       len(attachments),
 				"attachments": attachments,
-			})
+			}
+			if len(attachments) == limit {
+				// Cursor for the next (older) page
+				output["next_before_id"] = attachments[len(attachments)-1].ID
+			}
+			return printJSON(output)
 		},
 	}
 
@@ -2363,6 +2455,7 @@ For more: https://github.com/Napageneral/eve
 	messagesAttachmentsCmd.Flags().Int64Var(&msgsAttMessageID, "message-id", 0, "Filter by message ID")
 	messagesAttachmentsCmd.Flags().StringVar(&msgsAttType, "type", "", "Filter by MIME type prefix (e.g., 'image', 'video')")
 	messagesAttachmentsCmd.Flags().IntVar(&msgsAttLimit, "limit", 100, "Limit number of results")
+	messagesAttachmentsCmd.Flags().Int64Var(&msgsAttBeforeID, "before-id", 0, "Only attachments older than this attachment ID (page cursor)")
 
 	messagesCmd.AddCommand(messagesAttachmentsCmd)
 
@@ -2412,7 +2505,7 @@ For more: https://github.com/Napageneral/eve
 					return printErrorJSON(fmt.Errorf("invalid --start date: %w", err))
 				}
 				query += ` AND m.timestamp >= ?`
-				queryArgs = append(queryArgs, startTime.Format(time.RFC3339))
+				queryArgs = append(queryArgs, formatWarehouseTimestamp(startTime))
 			}
 
 			if historyEnd != "" {
@@ -2421,16 +2514,17 @@ For more: https://github.com/Napageneral/eve
 					return printErrorJSON(fmt.Errorf("invalid --end date: %w", err))
 				}
 				query += ` AND m.timestamp < ?`
-				queryArgs = append(queryArgs, endTime.Format(time.RFC3339))
+				queryArgs = append(queryArgs, formatWarehouseTimestamp(endTime))
 			}
 
 			query += ` ORDER BY m.timestamp DESC`
 
+			limit := 50
 			if historyLimit > 0 {
-				query += fmt.Sprintf(" LIMIT %d", historyLimit)
-			} else {
-				query += " LIMIT 50"
+				limit = historyLimit
 			}
+			query += " LIMIT ?"
+			queryArgs = append(queryArgs, limit)
 
 			rows, err := db.Query(query, queryArgs...)
 			if err != nil {
@@ -2438,12 +2532,6 @@ For more: https://github.com/Napageneral/eve
 			}
 			defer rows.Close()
 
-			type attachmentInfo struct {
-				ID       int64  `json:"id"`
-				FileName string `json:"file_name"`
-				MimeType string `json:"mime_type"`
-			}
-
 			type historyRow struct {
 				ID          int64            `json:"id"`
 				GUID        string           `json:"guid"`
@@ -2482,29 +2570,18 @@ For more: https://github.com/Napageneral/eve
 
 			// Load attachments if requested
 			if historyAttachments {
+				messageIDs := make([]int64, len(messages))
 				for i := range messages {
-					attRows, err := db.Query(`
-						SELECT id, COALESCE(file_name, ''), COALESCE(mime_type, '')
-						FROM attachments WHERE message_id = ?
-					`, messages[i].ID)
-					if err != nil {
-						continue
-					}
-					for attRows.Next() {
-						var att attachmentInfo
-						attRows.Scan(&att.ID, &att.FileName, &att.MimeType)
-						messages[i].Attachments = append(messages[i].Attachments, att)
-					}
-					attRows.Close()
+					messageIDs[i] = messages[i].ID
+				}
+				byMessage := loadAttachmentsByMessageID(db, messageIDs)
+				for i := range messages {
+					messages[i].Attachments = byMessage[messages[i].ID]
 				}
 			}
 
 			// Output in imsg-compatible format (one JSON per line for streaming)
-			for _, msg := range messages {
-				data, _ := json.Marshal(msg)
-				fmt.Println(string(data))
-			}
-			return nil
+			return printJSONL(messages)
 		},
 	}
 
@@ -2679,6 +2756,9 @@ For more: https://github.com/Napageneral/eve
 			ticker := time.NewTicker(pollDuration)
 			defer ticker.Stop()
 
+			// Apple timestamps are nanoseconds since 2001-01-01 UTC
+			appleEpoch := time.Date(2001, 1, 1, 0, 0, 0, 0, time.UTC)
+
 			for {
 				select {
 				case <-ctx.Done():
@@ -2730,7 +2810,6 @@ For more: https://github.com/Napageneral/eve
 						}
 
 						// Convert Apple timestamp to ISO8601
-						appleEpoch := time.Date(2001, 1, 1, 0, 0, 0, 0, time.UTC)
 						timestamp := appleEpoch.Add(time.Duration(dateNano) * time.Nanosecond)
 
 						// Output JSON event
@@ -2809,19 +2888,12 @@ For more: https://github.com/Napageneral/eve
 
 			queryEmbedding := resp.Embedding.Values
 
-			// Load conversation embeddings from database
-			embQuery := `
-				SELECT e.entity_id, e.embedding_blob, c.chat_id, ch.chat_name
-				FROM embeddings e
-				JOIN conversations c ON e.entity_id = c.id
-				JOIN chats ch ON c.chat_id = ch.id
-				WHERE e.entity_type = 'conversation'
-			`
-			embArgs := []interface{}{}
-
+			// Load conversation embeddings from database. Only the columns needed
+			// for scoring are read here; chat names are looked up for the top
+			// results after ranking.
+			embQuery, embArgs := searchEmbeddingsSQL, []interface{}(nil)
 			if searchChatID > 0 {
-				embQuery += ` AND c.chat_id = ?`
-				embArgs = append(embArgs, searchChatID)
+				embQuery, embArgs = searchChatEmbeddingsSQL, []interface{}{searchChatID}
 			}
 
 			rows, err := warehouseDB.Query(embQuery, embArgs...)
@@ -2838,20 +2910,28 @@ For more: https://github.com/Napageneral/eve
 				Snippet        string  `json:"snippet,omitempty"`
 			}
 
-			var results []searchResult
+			limit := searchLimit
+			if limit <= 0 {
+				limit = 10
+			}
+
+			// Keep only the running top-limit results, ordered by score
+			// descending, so memory stays O(limit) however many embeddings
+			// are scanned.
+			results := make([]searchResult, 0, limit)
 
 			for rows.Next() {
 				var convID, chatID int64
 				var embeddingBlob []byte
-				var chatName sql.NullString
+				var dimension int
 
-				err := rows.Scan(&convID, &embeddingBlob, &chatID, &chatName)
+				err := rows.Scan(&convID, &embeddingBlob, &dimension, &chatID)
 				if err != nil {
 					continue
 				}
 
-				// Convert blob to float64 slice
-				convEmbedding, err := blobToFloat64Slice(embeddingBlob)
+				// Decode the stored float32 (or legacy float64) vector
+				convEmbedding, err := engine.DecodeEmbedding(embeddingBlob, dimension)
 				if err != nil {
 					continue
 				}
@@ -2859,53 +2939,71 @@ For more: https://github.com/Napageneral/eve
 				// Compute cosine similarity
 				score := cosineSimilarity(queryEmbedding, convEmbedding)
 
-				name := ""
-				if chatName.Valid {
-					name = chatName.String
+				pos := sort.Search(len(results), func(i int) bool { return results[i].Score < score })
+				if pos >= limit {
+					continue
 				}
-
-				results = append(results, searchResult{
+				if len(results) < limit {
+					results = append(results, searchResult{})
+				}
+				copy(results[pos+1:], results[pos:len(results)-1])
+				results[pos] = searchResult{
 					ConversationID: convID,
 					ChatID:         chatID,
-					ChatName:       name,
 					Score:          score,
-				})
+				}
 			}
 
-			// Sort by score descending
-			for i := 0; i < len(results)-1; i++ {
-				for j := i + 1; j < len(results); j++ {
-					if results[j].Score > results[i].Score {
-						results[i], results[j] = results[j], results[i]
+			// Resolve chat names for the top results only
+			if len(results) > 0 {
+				chatIDs := make([]int64, len(results))
+				for i, r := range results {
+					chatIDs[i] = r.ChatID
+				}
+				nameRows, err := warehouseDB.Query(searchChatNamesSQL, jsonIDs(chatIDs))
+				if err != nil {
+					return printErrorJSON(fmt.Errorf("failed to query chat names: %w", err))
+				}
+				chatNames := make(map[int64]string)
+				for nameRows.Next() {
+					var id int64
+					var name string
+					if err := nameRows.Scan(&id, &name); err != nil {
+						nameRows.Close()
+						return printErrorJSON(fmt.Errorf("failed to scan chat name: %w", err))
 					}
+					chatNames[id] = name
+				}
+				nameRows.Close()
+				for i := range results {
+					results[i].ChatName = chatNames[results[i].ChatID]
 				}
-			}
-
-			// Limit results
-			limit := searchLimit
-			if limit <= 0 {
-				limit = 10
-			}
-			if len(results) > limit {
-				results = results[:limit]
 			}
 
 			// Load snippets for top results
-			for i := range results {
-				var snippet string
-				err := warehouseDB.QueryRow(`
-					SELECT GROUP_CONCAT(content, ' | ')
-					FROM (
-						SELECT content FROM messages 
-						WHERE conversation_id = ? AND content IS NOT NULL AND content != ''
-						ORDER BY timestamp DESC LIMIT 3
-					)
-				`, results[i].ConversationID).Scan(&snippet)
-				if err == nil && snippet != "" {
-					if len(snippet) > 200 {
-						snippet = snippet[:200] + "..."
+			if len(results) > 0 {
+				convIDs := make([]int64, len(results))
+				for i, r := range results {
+					convIDs[i] = r.ConversationID
+				}
+				snippets := make(map[int64]string, len(results))
+				if snippetRows, err := warehouseDB.Query(searchSnippetsSQL, jsonIDs(convIDs)); err == nil {
+					for snippetRows.Next() {
+						var convID int64
+						var snippet string
+						if err := snippetRows.Scan(&convID, &snippet); err == nil {
+							snippets[convID] = snippet
+						}
+					}
+					snippetRows.Close()
+				}
+				for i := range results {
+					if snippet := snippets[results[i].ConversationID]; snippet != "" {
+						if len(snippet) > 200 {
+							snippet = snippet[:200] + "..."
+						}
+						results[i].Snippet = snippet
 					}
-					results[i].Snippet = snippet
 				}
 			}
 
@@ -2926,6 +3024,7 @@ For more: https://github.com/Napageneral/eve
 	var attMessageID int64
 	var attType string
 	var attLimit int
+	var attBeforeID int64
 
 	attachmentsCmd := &cobra.Command{
 		Use:   "attachments",
@@ -2969,13 +3068,19 @@ For more: https://github.com/Napageneral/eve
 				queryArgs = append(queryArgs, attType+"%")
 			}
 
+			if attBeforeID > 0 {
+				query += attachmentsBeforeCursorSQL
+				queryArgs = append(queryArgs, attBeforeID)
+			}
+
 			query += ` ORDER BY a.id DESC`
 
+			limit := 100
 			if attLimit > 0 {
-				query += fmt.Sprintf(" LIMIT %d", attLimit)
-			} else {
-				query += " LIMIT 100"
+				limit = attLimit
 			}
+			query += " LIMIT ?"
+			queryArgs = append(queryArgs, limit)
 
 			rows, err := db.Query(query, queryArgs...)
 			if err != nil {
@@ -3025,11 +3130,16 @@ For more: https://github.com/Napageneral/eve
 				attachments = append(attachments, att)
 			}
 
-			return printJSON(map[string]interface{}{
+			output := map[string]interface{}{
 				"ok":          true,
 				"count":       len(attachments),
 				"attachments": attachments,
-			})
+			}
+			if len(attachments) == limit {
+				// Cursor for the next (older) page
+				output["next_before_id"] = attachments[len(attachments)-1].ID
+			}
+			return printJSON(output)
 		},
 	}
 
@@ -3037,6 +3147,7 @@ For more: https://github.com/Napageneral/eve
 	attachmentsCmd.Flags().Int64Var(&attMessageID, "message-id", 0, "Filter by message ID")
 	attachmentsCmd.Flags().StringVar(&attType, "type", "", "Filter by MIME type prefix (e.g., 'image', 'video')")
 	attachmentsCmd.Flags().IntVar(&attLimit, "limit", 100, "Limit number of results")
+	attachmentsCmd.Flags().Int64Var(&attBeforeID, "before-id", 0, "Only attachments older than this attachment ID (page cursor)")
 
 	// Analyze command - queue analysis jobs
 	var analyzeChatID int
@@ -3051,13 +3162,13 @@ For more: https://github.com/Napageneral/eve
 			cfg := config.Load()
 
 			// Open warehouse and queue databases
-			warehouseDB, err := sql.Open("sqlite3", cfg.EveDBPath)
+			warehouseDB, err := sql.Open("sqlite3", cfg.EveDBPath+writeDSNParams)
 			if err != nil {
 				return printErrorJSON(fmt.Errorf("failed to open warehouse database: %w", err))
 			}
 			defer warehouseDB.Close()
 
-			queueDB, err := sql.Open("sqlite3", cfg.QueueDBPath)
+			queueDB, err := sql.Open("sqlite3", cfg.QueueDBPath+writeDSNParams)
 			if err != nil {
 				return printErrorJSON(fmt.Errorf("failed to open queue database: %w", err))
 			}
@@ -3084,10 +3195,7 @@ For more: https://github.com/Napageneral/eve
 				rows.Close()
 			} else if analyzeContact != "" {
 				// Find contact and their chats
-				var contactID int64
-				err := warehouseDB.QueryRow(`
-					SELECT id FROM contacts WHERE name LIKE ? LIMIT 1
-				`, "%"+analyzeContact+"%").Scan(&contactID)
+				contactID, err := findContactID(warehouseDB, analyzeContact)
 				if err != nil {
 					return printErrorJSON(fmt.Errorf("contact '%s' not found", analyzeContact))
 				}
@@ -3118,9 +3226,9 @@ For more: https://github.com/Napageneral/eve
 					Type:     "analysis",
 					Key:      fmt.Sprintf("analysis:conversation:%d:convo-all-v1", convID),
 					Priority: 20,
-					Payload: map[string]interface{}{
-						"conversation_id": convID,
-						"eve_prompt_id":   "convo-all-v1",
+					Payload: engine.AnalysisJobPayload{
+						ConversationID: convID,
+						EvePromptID:    "convo-all-v1",
 					},
 					MaxAttempts: 3,
 				})
@@ -3186,8 +3294,7 @@ For more: https://github.com/Napageneral/eve
 			// Resolve contact to chat_id if needed
 			targetChatID := insightsChatID
 			if insightsContact != "" && targetChatID == 0 {
-				var contactID int64
-				err := db.QueryRow(`SELECT id FROM contacts WHERE name LIKE ? LIMIT 1`, "%"+insightsContact+"%").Scan(&contactID)
+				contactID, err := findContactID(db, insightsContact)
 				if err != nil {
 					return printErrorJSON(fmt.Errorf("contact '%s' not found", insightsContact))
 				}
@@ -3208,19 +3315,11 @@ For more: https://github.com/Napageneral/eve
 				return queryInsights(db, "humor_items", "snippet", targetChatID)
 			default:
 				// Summary view
-				var topicsCount, entitiesCount, emotionsCount, humorCount int
-
+				facetQuery, facetArgs := facetCountsSQL, []interface{}(nil)
 				if targetChatID > 0 {
-					db.QueryRow(`SELECT COUNT(*) FROM topics WHERE chat_id = ?`, targetChatID).Scan(&topicsCount)
-					db.QueryRow(`SELECT COUNT(*) FROM entities WHERE chat_id = ?`, targetChatID).Scan(&entitiesCount)
-					db.QueryRow(`SELECT COUNT(*) FROM emotions WHERE chat_id = ?`, targetChatID).Scan(&emotionsCount)
-					db.QueryRow(`SELECT COUNT(*) FROM humor_items WHERE chat_id = ?`, targetChatID).Scan(&humorCount)
-				} else {
-					db.QueryRow(`SELECT COUNT(*) FROM topics`).Scan(&topicsCount)
-					db.QueryRow(`SELECT COUNT(*) FROM entities`).Scan(&entitiesCount)
-					db.QueryRow(`SELECT COUNT(*) FROM emotions`).Scan(&emotionsCount)
-					db.QueryRow(`SELECT COUNT(*) FROM humor_items`).Scan(&humorCount)
+					facetQuery, facetArgs = facetCountsByChatSQL, []interface{}{targetChatID}
 				}
+				topicsCount, entitiesCount, emotionsCount, humorCount, _ := queryFacetCounts(db, facetQuery, facetArgs...)
 
 				return printJSON(map[string]interface{}{
 					"ok":      true,
@@ -3546,6 +3645,24 @@ func printJSON(data interface{}) error {
 	return nil
 }
 
+// printJSONL writes rows to stdout as compact JSON, one object per line.
+// Lines are encoded straight into one buffered writer and flushed once,
+// instead of marshaling each row to its own slice and printing it with a
+// separate write.
+func printJSONL[T any](rows []T) error {
+	w := bufio.NewWriter(os.Stdout)
+	encoder := json.NewEncoder(w)
+	for i := range rows {
+		if err := encoder.Encode(&rows[i]); err != nil {
+			return fmt.Errorf("failed to encode JSON: %w", err)
+		}
+	}
+	if err := w.Flush(); err != nil {
+		return fmt.Errorf("failed to write JSON: %w", err)
+	}
+	return nil
+}
+
 func printErrorJSON(err error) error {
 	output := map[string]interface{}{
 		"ok":    false,
@@ -3559,15 +3676,6 @@ func printErrorJSON(err error) error {
 	return err
 }
 
-func contains(slice []string, item string) bool {
-	for _, s := range slice {
-		if s == item {
-			return true
-		}
-	}
-	return false
-}
-
 // escapeAppleScript escapes a string for use in AppleScript
 func escapeAppleScript(s string) string {
 	// Escape backslashes first, then quotes
@@ -3593,24 +3701,52 @@ func parseDate(s string) (time.Time, error) {
 	return time.Time{}, fmt.Errorf("unrecognized date format: %s (use YYYY-MM-DD or ISO8601)", s)
 }
 
-// blobToFloat64Slice converts a byte slice back to float64 slice
-func blobToFloat64Slice(blob []byte) ([]float64, error) {
-	if len(blob)%8 != 0 {
-		return nil, fmt.Errorf("invalid blob length: %d (must be multiple of 8)", len(blob))
-	}
+// formatWarehouseTimestamp formats a range bound the way go-sqlite3 stores
+// time.Time values ("2006-01-02 15:04:05+00:00", UTC). Comparing the raw
+// timestamp column against a bound in the same layout keeps the predicate a
+// plain index range scan on (chat_id, timestamp); an RFC3339 bound ('T'
+// separator) sorts after every stored value on the same day and shifts the
+// range by up to a day.
+func formatWarehouseTimestamp(t time.Time) string {
+	return t.UTC().Format("2006-01-02 15:04:05+00:00")
+}
 
-	values := make([]float64, len(blob)/8)
-	for i := 0; i < len(values); i++ {
-		bits := uint64(blob[i*8]) | uint64(blob[i*8+1])<<8 | uint64(blob[i*8+2])<<16 | uint64(blob[i*8+3])<<24 |
-			uint64(blob[i*8+4])<<32 | uint64(blob[i*8+5])<<40 | uint64(blob[i*8+6])<<48 | uint64(blob[i*8+7])<<56
-		values[i] = float64frombits(bits)
-	}
-	return values, nil
+// attachmentInfo is the attachment metadata attached to messages/history output
+type attachmentInfo struct {
+	ID       int64  `json:"id"`
+	FileName string `json:"file_name"`
+	MimeType string `json:"mime_type"`
 }
 
-// float64frombits converts uint64 bits to float64
-func float64frombits(b uint64) float64 {
-	return *(*float64)(unsafe.Pointer(&b))
+// loadAttachmentsByMessageID loads attachment metadata for a page of messages
+// with one query, binding the message IDs as a single JSON array. Like the
+// per-message lookups it replaces, it is best-effort: a failed query simply
+// leaves the messages without attachments.
+func loadAttachmentsByMessageID(db *sql.DB, messageIDs []int64) map[int64][]attachmentInfo {
+	out := make(map[int64][]attachmentInfo)
+	if len(messageIDs) == 0 {
+		return out
+	}
+
+	rows, err := db.Query(`
+		SELECT message_id, id, COALESCE(file_name, ''), COALESCE(mime_type, '')
+		FROM attachments
+		WHERE message_id IN (`+idSetSQL+`)
+		ORDER BY message_id, id
+	`, jsonIDs(messageIDs))
+	if err != nil {
+		return out
+	}
+	defer rows.Close()
+	for rows.Next() {
+		var messageID int64
+		var att attachmentInfo
+		if err := rows.Scan(&messageID, &att.ID, &att.FileName, &att.MimeType); err != nil {
+			continue
+		}
+		out[messageID] = append(out[messageID], att)
+	}
+	return out
 }
 
 // cosineSimilarity computes cosine similarity between two vectors
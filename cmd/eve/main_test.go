@@ -1,7 +1,11 @@
 package main
 
 import (
+	"database/sql"
+	"path/filepath"
 	"testing"
+
+	_ "github.com/mattn/go-sqlite3"
 )
 
 func TestVersionInfo(t *testing.T) {
@@ -10,3 +14,55 @@ func TestVersionInfo(t *testing.T) {
 		t.Error("version should not be empty")
 	}
 }
+
+func TestFormatWarehouseTimestamp(t *testing.T) {
+	day, err := parseDate("2024-01-02")
+	if err != nil {
+		t.Fatalf("parseDate failed: %v", err)
+	}
+	bound := formatWarehouseTimestamp(day)
+	if bound != "2024-01-02 00:00:00+00:00" {
+		t.Fatalf("unexpected bound %q", bound)
+	}
+
+	// Stored values use go-sqlite3's layout; the bound must order correctly
+	// against them as plain strings.
+	sameDay := "2024-01-02 10:30:00+00:00"
+	prevDay := "2024-01-01 23:59:59+00:00"
+	if !(sameDay >= bound) {
+		t.Errorf("expected %q >= %q", sameDay, bound)
+	}
+	if !(prevDay < bound) {
+		t.Errorf("expected %q < %q", prevDay, bound)
+	}
+}
+
+func TestLoadAttachmentsByMessageID(t *testing.T) {
+	db, err := sql.Open("sqlite3", filepath.Join(t.TempDir(), "eve.db"))
+	if err != nil {
+		t.Fatalf("open db: %v", err)
+	}
+	defer db.Close()
+
+	if _, err := db.Exec(`
+		CREATE TABLE attachments (id INTEGER PRIMARY KEY, message_id INTEGER, file_name TEXT, mime_type TEXT);
+		INSERT INTO attachments (id, message_id, file_name, mime_type) VALUES
+			(1, 10, 'a.jpg', 'image/jpeg'),
+			(2, 10, NULL, NULL),
+			(3, 11, 'b.pdf', 'application/pdf'),
+			(4, 99, 'other.png', 'image/png');
+	`); err != nil {
+		t.Fatalf("seed: %v", err)
+	}
+
+	got := loadAttachmentsByMessageID(db, []int64{10, 11, 12})
+	if len(got[10]) != 2 || got[10][0].FileName != "a.jpg" || got[10][1].FileName != "" {
+		t.Errorf("unexpected attachments for message 10: %+v", got[10])
+	}
+	if len(got[11]) != 1 || got[11][0].MimeType != "application/pdf" {
+		t.Errorf("unexpected attachments for message 11: %+v", got[11])
+	}
+	if len(got[12]) != 0 || len(got[99]) != 0 {
+		t.Errorf("expected only requested messages with attachments, got %+v", got)
+	}
+}
@@ -2,10 +2,11 @@ package contextengine
 
 import (
 	"database/sql"
+	"encoding/json"
 	"fmt"
 	"sort"
+	"strconv"
 	"strings"
-	"time"
 
 	_ "github.com/mattn/go-sqlite3"
 )
@@ -27,14 +28,14 @@ func analysesContextDataAdapter(params map[string]interface{}, context Retrieval
 		return RetrievalResult{}, fmt.Errorf("analyses_context_data requires database path in context")
 	}
 
-	db, err := sql.Open("sqlite3", context.DBPath)
+	db, release, err := context.scope.openDB(context.DBPath)
 	if err != nil {
 		return RetrievalResult{}, fmt.Errorf("failed to open database: %w", err)
 	}
-	defer db.Close()
+	defer release()
 
 	// Collect chat IDs (expand contact_ids to chat_ids)
-	allChatIDs, err := collectChatIDsFromContacts(db, chatIDs, contactIDs)
+	allChatIDs, err := collectChatIDsFromContacts(db, context.scope, chatIDs, contactIDs)
 	if err != nil {
 		return RetrievalResult{}, fmt.Errorf("failed to collect chat IDs: %w", err)
 	}
@@ -73,16 +74,22 @@ func analysesContextDataAdapter(params map[string]interface{}, context Retrieval
 		}
 	}
 
+	// Get consolidated analysis data for every chat at once (matches TS getChatConsolidatedData)
+	chatsWithConvs := make([]int64, 0, len(byChat))
+	for chatID := range byChat {
+		chatsWithConvs = append(chatsWithConvs, chatID)
+	}
+	consolidatedByChat, err := cachedConsolidatedAnalysisData(db, context.DBPath, chatsWithConvs)
+	if err != nil {
+		return RetrievalResult{}, fmt.Errorf("failed to get consolidated data: %w", err)
+	}
+
 	// Process each chat and format analyses
 	var outLines []string
 	totalTokens := 0
 
 	for chatID, cids := range byChat {
-		// Get consolidated analysis data (matches TS getChatConsolidatedData)
-		consolidated, err := getChatConsolidatedAnalysisData(db, chatID)
-		if err != nil {
-			return RetrievalResult{}, fmt.Errorf("failed to get consolidated data: %w", err)
-		}
+		consolidated := consolidatedByChat[chatID]
 
 		// Aggregate rows by conversation_id (matches TS bucketing logic)
 		bucket := make(map[int64]*analysisRow)
@@ -311,31 +318,18 @@ func parseMatchParams(val interface{}) struct{ Entities, Topics, Emotions []stri
 }
 
 // Database helper functions (simplified versions for analyses adapter)
-func collectChatIDsFromContacts(db *sql.DB, chatIDs []int64, contactIDs []int64) ([]int64, error) {
+func collectChatIDsFromContacts(db *sql.DB, scope *requestScope, chatIDs []int64, contactIDs []int64) ([]int64, error) {
 	ids := make(map[int64]bool)
 	for _, id := range chatIDs {
 		ids[id] = true
 	}
 
 	if len(contactIDs) > 0 {
-		placeholders := make([]string, len(contactIDs))
-		args := make([]interface{}, len(contactIDs))
-		for i, id := range contactIDs {
-			placeholders[i] = "?"
-			args[i] = id
-		}
-		query := fmt.Sprintf(`SELECT DISTINCT chat_id FROM chat_participants WHERE contact_id IN (%s)`, strings.Join(placeholders, ", "))
-		rows, err := db.Query(query, args...)
+		contactChatIDs, err := scope.chatIDsForContacts(db, contactIDs)
 		if err != nil {
 			return nil, err
 		}
-		defer rows.Close()
-
-		for rows.Next() {
-			var chatID int64
-			if err := rows.Scan(&chatID); err != nil {
-				return nil, err
-			}
+		for _, chatID := range contactChatIDs {
 			ids[chatID] = true
 		}
 	}
@@ -352,16 +346,8 @@ func filterConversationsByTime(db *sql.DB, chatIDs []int64, startISO, endISO str
 		return []int64{}, nil
 	}
 
-	placeholders := make([]string, len(chatIDs))
-	args := make([]interface{}, 0, len(chatIDs)+2)
-	for i, id := range chatIDs {
-		placeholders[i] = "?"
-		args = append(args, id)
-	}
-	args = append(args, startISO, endISO)
-
-	query := fmt.Sprintf(`SELECT id FROM conversations WHERE chat_id IN (%s) AND datetime(start_time) >= datetime(?) AND datetime(start_time) < datetime(?)`, strings.Join(placeholders, ", "))
-	rows, err := db.Query(query, args...)
+	query := `SELECT id FROM conversations WHERE chat_id IN (` + idSetSQL + `) AND datetime(start_time) >= datetime(?) AND datetime(start_time) < datetime(?)`
+	rows, err := db.Query(query, jsonIDArray(chatIDs), startISO, endISO)
 	if err != nil {
 		return nil, err
 	}
@@ -388,15 +374,8 @@ func orderConversations(db *sql.DB, convIDs []int64, order string) ([]int64, err
 		sqlOrder = "DESC"
 	}
 
-	placeholders := make([]string, len(convIDs))
-	args := make([]interface{}, len(convIDs))
-	for i, id := range convIDs {
-		placeholders[i] = "?"
-		args[i] = id
-	}
-
-	query := fmt.Sprintf(`SELECT id FROM conversations WHERE id IN (%s) ORDER BY start_time %s`, strings.Join(placeholders, ", "), sqlOrder)
-	rows, err := db.Query(query, args...)
+	query := `SELECT id FROM conversations WHERE id IN (` + idSetSQL + `) ORDER BY start_time ` + sqlOrder
+	rows, err := db.Query(query, jsonIDArray(convIDs))
 	if err != nil {
 		return nil, err
 	}
@@ -425,24 +404,11 @@ func parseTimeParams(timeInterface interface{}) struct{ StartISO, EndISO string
 	}
 
 	if preset, ok := timeMap["preset"].(string); ok {
-		end := time.Now()
-		var start time.Time
-		switch strings.ToLower(preset) {
-		case "day":
-			start = end.AddDate(0, 0, -1)
-		case "week":
-			start = end.AddDate(0, 0, -7)
-		case "month":
-			start = end.AddDate(0, 0, -30)
-		case "year":
-			start = end.AddDate(0, 0, -365)
-		case "all":
-			return result
-		default:
-			return result
+		// "all" and unknown presets keep the unbounded default window.
+		if startISO, endISO, ok := presetWindow(preset); ok {
+			result.StartISO = startISO
+			result.EndISO = endISO
 		}
-		result.StartISO = start.Format(time.RFC3339)
-		result.EndISO = end.Format(time.RFC3339)
 		return result
 	}
 
@@ -464,24 +430,15 @@ func filterConvIDsByFacets(db *sql.DB, chatIDs []int64, startISO, endISO string,
 	}
 
 	// Build SQL for base conversations in time range
-	placeholders := make([]string, len(chatIDs))
-	args := make([]interface{}, len(chatIDs)+2)
-	for i, chatID := range chatIDs {
-		placeholders[i] = "?"
-		args[i] = chatID
-	}
-	args[len(chatIDs)] = startISO
-	args[len(chatIDs)+1] = endISO
-
-	query := fmt.Sprintf(`
+	query := `
 		SELECT id
 		FROM conversations
-		WHERE chat_id IN (%s)
+		WHERE chat_id IN (` + idSetSQL + `)
 			AND datetime(start_time) >= datetime(?)
 			AND datetime(start_time) < datetime(?)
-	`, strings.Join(placeholders, ", "))
+	`
 
-	rows, err := db.Query(query, args...)
+	rows, err := db.Query(query, jsonIDArray(chatIDs), startISO, endISO)
 	if err != nil {
 		return nil, fmt.Errorf("failed to query base conversations: %w", err)
 	}
@@ -501,7 +458,7 @@ func filterConvIDsByFacets(db *sql.DB, chatIDs []int64, startISO, endISO string,
 	}
 
 	// Apply facet filters sequentially (intersection logic)
-	applyFacet := func(table, column string, values []string) error {
+	applyFacet := func(query string, values []string) error {
 		if len(values) == 0 || len(idSet) == 0 {
 			return nil
 		}
@@ -518,33 +475,11 @@ func filterConvIDsByFacets(db *sql.DB, chatIDs []int64, startISO, endISO string,
 			return nil
 		}
 
-		// Build query
 		ids := make([]int64, 0, len(idSet))
 		for id := range idSet {
 			ids = append(ids, id)
 		}
-
-		idPlaceholders := make([]string, len(ids))
-		valPlaceholders := make([]string, len(vals))
-		facetArgs := make([]interface{}, 0, len(ids)+len(vals))
-
-		for i, id := range ids {
-			idPlaceholders[i] = "?"
-			facetArgs = append(facetArgs, id)
-		}
-		for i, val := range vals {
-			valPlaceholders[i] = "?"
-			facetArgs = append(facetArgs, val)
-		}
-
-		facetSQL := fmt.Sprintf(`
-			SELECT DISTINCT conversation_id
-			FROM %s
-			WHERE conversation_id IN (%s)
-				AND LOWER(%s) IN (%s)
-		`, table, strings.Join(idPlaceholders, ", "), column, strings.Join(valPlaceholders, ", "))
-
-		facetRows, err := db.Query(facetSQL, facetArgs...)
+		facetRows, err := db.Query(query, jsonIDArray(ids), jsonStringArray(vals))
 		if err != nil {
 			return nil // Table might not exist, treat as no matches
 		}
@@ -564,13 +499,13 @@ func filterConvIDsByFacets(db *sql.DB, chatIDs []int64, startISO, endISO string,
 	}
 
 	// Apply each facet filter (matches TS order)
-	if err := applyFacet("entities", "title", match.Entities); err != nil {
+	if err := applyFacet(entitiesMatchSQL, match.Entities); err != nil {
 		return nil, err
 	}
-	if err := applyFacet("topics", "title", match.Topics); err != nil {
+	if err := applyFacet(topicsMatchSQL, match.Topics); err != nil {
 		return nil, err
 	}
-	if err := applyFacet("emotions", "emotion_type", match.Emotions); err != nil {
+	if err := applyFacet(emotionsMatchSQL, match.Emotions); err != nil {
 		return nil, err
 	}
 
@@ -588,20 +523,13 @@ func getConvToChatMap(db *sql.DB, convIDs []int64) (map[int64]int64, error) {
 		return make(map[int64]int64), nil
 	}
 
-	placeholders := make([]string, len(convIDs))
-	args := make([]interface{}, len(convIDs))
-	for i, convID := range convIDs {
-		placeholders[i] = "?"
-		args[i] = convID
-	}
-
-	query := fmt.Sprintf(`
+	query := `
 		SELECT id, chat_id
 		FROM conversations
-		WHERE id IN (%s)
-	`, strings.Join(placeholders, ", "))
+		WHERE id IN (` + idSetSQL + `)
+	`
 
-	rows, err := db.Query(query, args...)
+	rows, err := db.Query(query, jsonIDArray(convIDs))
 	if err != nil {
 		return nil, fmt.Errorf("failed to query conv-to-chat mapping: %w", err)
 	}
@@ -629,36 +557,103 @@ type consolidatedRow struct {
 	Humor               []string
 }
 
-// getChatConsolidatedAnalysisData gets consolidated analysis data for a single chat
-// Matches TS getChatConsolidatedData exactly
-func getChatConsolidatedAnalysisData(db *sql.DB, chatID int64) ([]consolidatedRow, error) {
-	// Query base conversations grouped by (conversation_id, contact_id)
-	conversationsSQL := `
-		SELECT
-			c.id as conversation_id,
-			strftime('%Y-%m-%dT%H:%M:%SZ', c.start_time) as conv_start_date,
-			c.summary as conversation_summary,
-			cont.id as contact_id
+// idSetSQL expands a single JSON array parameter (see jsonIDArray) into a set
+// of IDs for use as `col IN (idSetSQL)`. Unlike a "?, ?, ..." placeholder list
+// the statement text doesn't depend on how many IDs are bound.
+const idSetSQL = `SELECT value FROM json_each(?)`
+
+// The queries below are assembled from constants once at compile time rather
+// than with fmt.Sprintf on every call; each takes its ID sets as JSON array
+// parameters, so the SQL text (and the driver's prepared statement) is the
+// same for every batch size.
+
+// entitiesMatchSQL, topicsMatchSQL and emotionsMatchSQL narrow a set of
+// conversation IDs to those with a facet value in a set of lowercased values.
+const (
+	entitiesMatchSQL = `SELECT DISTINCT conversation_id FROM entities WHERE conversation_id IN (` + idSetSQL + `) AND LOWER(title) IN (` + idSetSQL + `)`
+	topicsMatchSQL   = `SELECT DISTINCT conversation_id FROM topics WHERE conversation_id IN (` + idSetSQL + `) AND LOWER(title) IN (` + idSetSQL + `)`
+	emotionsMatchSQL = `SELECT DISTINCT conversation_id FROM emotions WHERE conversation_id IN (` + idSetSQL + `) AND LOWER(emotion_type) IN (` + idSetSQL + `)`
+)
+
+// consolidatedConversationsSQL returns one row per (conversation_id,
+// contact_id) for a set of chats. The distinct senders are pre-aggregated in
+// conv_senders straight off idx_messages_conversation_sender, so the outer
+// query joins one row per sender instead of grouping every message row.
+const consolidatedConversationsSQL = `
+	WITH chat_ids AS (` + idSetSQL + `),
+	conv_senders AS (
+		SELECT DISTINCT m.conversation_id, cont.id AS contact_id
 		FROM conversations c
-		LEFT JOIN messages m ON m.conversation_id = c.id
+		JOIN messages m ON m.conversation_id = c.id
 		LEFT JOIN contacts cont ON cont.id = m.sender_id
-		WHERE c.chat_id = ?
-		GROUP BY c.id, cont.id
-		ORDER BY c.start_time ASC
-	`
+		WHERE c.chat_id IN chat_ids
+	)
+	SELECT
+		c.chat_id,
+		c.id as conversation_id,
+		strftime('%Y-%m-%dT%H:%M:%SZ', c.start_time) as conv_start_date,
+		c.summary as conversation_summary,
+		cs.contact_id
+	FROM conversations c
+	LEFT JOIN conv_senders cs ON cs.conversation_id = c.id
+	WHERE c.chat_id IN chat_ids
+	ORDER BY c.start_time ASC
+`
+
+// The per-chat facet queries behind consolidated analysis rows, each yielding
+// (conversation_id, contact_id, value).
+const (
+	chatEmotionsSQL = `SELECT conversation_id, contact_id, emotion_type FROM emotions WHERE chat_id IN (` + idSetSQL + `)`
+	chatHumorSQL    = `SELECT conversation_id, contact_id, snippet FROM humor_items WHERE chat_id IN (` + idSetSQL + `)`
+	chatTopicsSQL   = `SELECT conversation_id, contact_id, title FROM topics WHERE chat_id IN (` + idSetSQL + `)`
+	chatEntitiesSQL = `SELECT conversation_id, contact_id, title FROM entities WHERE chat_id IN (` + idSetSQL + `)`
+)
+
+// jsonIDArray encodes ids as a JSON array for binding to idSetSQL.
+func jsonIDArray(ids []int64) string {
+	buf := make([]byte, 0, 2+len(ids)*8)
+	buf = append(buf, '[')
+	for i, id := range ids {
+		if i > 0 {
+			buf = append(buf, ',')
+		}
+		buf = strconv.AppendInt(buf, id, 10)
+	}
+	return string(append(buf, ']'))
+}
 
-	rows, err := db.Query(conversationsSQL, chatID)
+// jsonStringArray encodes values as a JSON array for binding to idSetSQL.
+func jsonStringArray(values []string) string {
+	b, _ := json.Marshal(values)
+	return string(b)
+}
+
+// getConsolidatedAnalysisData gets consolidated analysis data for a set of chats,
+// keyed by chat ID. Each chat's rows match TS getChatConsolidatedData; all chats
+// are loaded with one query per table rather than one round per chat.
+func getConsolidatedAnalysisData(db *sql.DB, chatIDs []int64) (map[int64][]consolidatedRow, error) {
+	result := make(map[int64][]consolidatedRow, len(chatIDs))
+	if len(chatIDs) == 0 {
+		return result, nil
+	}
+
+	args := []interface{}{jsonIDArray(chatIDs)}
+
+	rows, err := db.Query(consolidatedConversationsSQL, args...)
 	if err != nil {
 		return nil, fmt.Errorf("failed to query conversations: %w", err)
 	}
 	defer rows.Close()
 
+	// convKey groups facet rows with their (conversation, contact) row; it is
+	// used directly as a map key, so no per-row key string is built.
 	type convKey struct {
 		convID    int64
 		contactID sql.NullInt64
 	}
 
 	conversations := []struct {
+		chatID    int64
 		key       convKey
 		startDate string
 		summary   sql.NullString
@@ -666,72 +661,65 @@ func getChatConsolidatedAnalysisData(db *sql.DB, chatID int64) ([]consolidatedRo
 
 	for rows.Next() {
 		var entry struct {
+			chatID    int64
 			key       convKey
 			startDate string
 			summary   sql.NullString
 		}
-		if err := rows.Scan(&entry.key.convID, &entry.startDate, &entry.summary, &entry.key.contactID); err != nil {
+		if err := rows.Scan(&entry.chatID, &entry.key.convID, &entry.startDate, &entry.summary, &entry.key.contactID); err != nil {
 			return nil, fmt.Errorf("failed to scan conversation: %w", err)
 		}
 		conversations = append(conversations, entry)
 	}
 
 	// Query each facet dimension
-	queryFacet := func(facetSQL string) (map[string][]string, error) {
-		facetRows, err := db.Query(facetSQL, chatID)
+	queryFacet := func(facetSQL string) (map[convKey][]string, error) {
+		facetRows, err := db.Query(facetSQL, args...)
 		if err != nil {
 			// Table might not exist, return empty map
-			return make(map[string][]string), nil
+			return make(map[convKey][]string), nil
 		}
 		defer facetRows.Close()
 
-		grouped := make(map[string][]string)
+		grouped := make(map[convKey][]string)
 		for facetRows.Next() {
-			var convID int64
-			var contactID sql.NullInt64
+			var key convKey
 			var value string
 
-			if err := facetRows.Scan(&convID, &contactID, &value); err != nil {
+			if err := facetRows.Scan(&key.convID, &key.contactID, &value); err != nil {
 				return nil, fmt.Errorf("failed to scan facet: %w", err)
 			}
-
-			key := fmt.Sprintf("%d_%d", convID, contactID.Int64)
-			if !contactID.Valid {
-				key = fmt.Sprintf("%d_null", convID)
-			}
 			grouped[key] = append(grouped[key], value)
 		}
 		return grouped, nil
 	}
 
-	emotionsMap, err := queryFacet(`SELECT conversation_id, contact_id, emotion_type FROM emotions WHERE chat_id = ?`)
+	emotionsMap, err := queryFacet(chatEmotionsSQL)
 	if err != nil {
 		return nil, err
 	}
 
-	humorMap, err := queryFacet(`SELECT conversation_id, contact_id, snippet FROM humor_items WHERE chat_id = ?`)
+	humorMap, err := queryFacet(chatHumorSQL)
 	if err != nil {
 		return nil, err
 	}
 
-	topicsMap, err := queryFacet(`SELECT conversation_id, contact_id, title FROM topics WHERE chat_id = ?`)
+	topicsMap, err := queryFacet(chatTopicsSQL)
 	if err != nil {
 		return nil, err
 	}
 
-	entitiesMap, err := queryFacet(`SELECT conversation_id, contact_id, title FROM entities WHERE chat_id = ?`)
+	entitiesMap, err := queryFacet(chatEntitiesSQL)
 	if err != nil {
 		return nil, err
 	}
 
 	// Build final result
-	result := []consolidatedRow{}
+	for _, chatID := range chatIDs {
+		result[chatID] = []consolidatedRow{}
+	}
 	for _, conv := range conversations {
-		key := fmt.Sprintf("%d_%d", conv.key.convID, conv.key.contactID.Int64)
-		if !conv.key.contactID.Valid {
-			key = fmt.Sprintf("%d_null", conv.key.convID)
-		}
-
+		key := conv.key
 		summary := ""
 		if conv.summary.Valid {
 			summary = conv.summary.String
@@ -747,7 +735,7 @@ func getChatConsolidatedAnalysisData(db *sql.DB, chatID int64) ([]consolidatedRo
 			Humor:               humorMap[key],
 		}
 
-		result = append(result, entry)
+		result[conv.chatID] = append(result[conv.chatID], entry)
 	}
 
 	return result, nil
@@ -0,0 +1,185 @@
+package contextengine
+
+import (
+	"container/list"
+	"database/sql"
+	"sync"
+)
+
+// consolidatedCacheSize bounds how many chats' consolidated analysis rows are
+// kept across Execute calls.
+const consolidatedCacheSize = 256
+
+// analysisVersion is the invalidation token for a chat's consolidated analysis
+// data. Every analysis write records a new completion on the conversation's
+// conversation_analyses row (and bumps updated_at) in the same transaction
+// that rewrites facets and the summary, and conversation rebuilds change the
+// conversation count/ids/message totals, so any write that could alter the
+// consolidated rows changes the token.
+type analysisVersion struct {
+	convCount         int64
+	maxConvID         int64
+	messageCount      int64
+	maxAnalysisID     int64
+	maxCompletionID   int64
+	analysisUpdatedAt string
+}
+
+// analysisVersionsSQL and analysisUpdatesSQL compute analysisVersion for a set
+// of chats bound as one jsonIDArray parameter (see idSetSQL).
+const analysisVersionsSQL = `
+	SELECT c.chat_id, COUNT(*), MAX(c.id), COALESCE(SUM(c.message_count), 0)
+	FROM conversations c
+	WHERE c.chat_id IN (SELECT value FROM json_each(?))
+	GROUP BY c.chat_id
+`
+
+const analysisUpdatesSQL = `
+	SELECT c.chat_id, MAX(ca.id), COALESCE(MAX(ca.completion_id), 0), COALESCE(MAX(ca.updated_at), '')
+	FROM conversation_analyses ca
+	JOIN conversations c ON c.id = ca.conversation_id
+	WHERE c.chat_id IN (SELECT value FROM json_each(?))
+	GROUP BY c.chat_id
+`
+
+// loadAnalysisVersions reads the current analysisVersion of each chat with two
+// grouped queries. Chats without conversations get the zero version.
+func loadAnalysisVersions(db *sql.DB, chatIDs []int64) (map[int64]analysisVersion, error) {
+	ids := jsonIDArray(chatIDs)
+	versions := make(map[int64]analysisVersion, len(chatIDs))
+
+	rows, err := db.Query(analysisVersionsSQL, ids)
+	if err != nil {
+		return nil, err
+	}
+	for rows.Next() {
+		var chatID int64
+		var v analysisVersion
+		if err := rows.Scan(&chatID, &v.convCount, &v.maxConvID, &v.messageCount); err != nil {
+			rows.Close()
+			return nil, err
+		}
+		versions[chatID] = v
+	}
+	rows.Close()
+
+	rows, err = db.Query(analysisUpdatesSQL, ids)
+	if err != nil {
+		return nil, err
+	}
+	defer rows.Close()
+	for rows.Next() {
+		var chatID int64
+		var maxAnalysisID, maxCompletionID int64
+		var updatedAt string
+		if err := rows.Scan(&chatID, &maxAnalysisID, &maxCompletionID, &updatedAt); err != nil {
+			return nil, err
+		}
+		v := versions[chatID]
+		v.maxAnalysisID = maxAnalysisID
+		v.maxCompletionID = maxCompletionID
+		v.analysisUpdatedAt = updatedAt
+		versions[chatID] = v
+	}
+	return versions, rows.Err()
+}
+
+type consolidatedCacheKey struct {
+	dbPath  string
+	chatID  int64
+	version analysisVersion
+}
+
+type consolidatedCacheEntry struct {
+	key  consolidatedCacheKey
+	rows []consolidatedRow
+}
+
+// consolidatedCache is a small LRU of consolidated analysis rows keyed by
+// (database, chat, version). Stale entries are never hit because their version
+// no longer matches; they simply age out.
+type consolidatedCache struct {
+	mu      sync.Mutex
+	max     int
+	order   *list.List
+	entries map[consolidatedCacheKey]*list.Element
+}
+
+func newConsolidatedCache(max int) *consolidatedCache {
+	return &consolidatedCache{
+		max:     max,
+		order:   list.New(),
+		entries: make(map[consolidatedCacheKey]*list.Element),
+	}
+}
+
+func (c *consolidatedCache) get(key consolidatedCacheKey) ([]consolidatedRow, bool) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	el, ok := c.entries[key]
+	if !ok {
+		return nil, false
+	}
+	c.order.MoveToFront(el)
+	return el.Value.(*consolidatedCacheEntry).rows, true
+}
+
+func (c *consolidatedCache) put(key consolidatedCacheKey, rows []consolidatedRow) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	if el, ok := c.entries[key]; ok {
+		el.Value.(*consolidatedCacheEntry).rows = rows
+		c.order.MoveToFront(el)
+		return
+	}
+	c.entries[key] = c.order.PushFront(&consolidatedCacheEntry{key: key, rows: rows})
+	for c.order.Len() > c.max {
+		oldest := c.order.Back()
+		c.order.Remove(oldest)
+		delete(c.entries, oldest.Value.(*consolidatedCacheEntry).key)
+	}
+}
+
+var chatConsolidatedCache = newConsolidatedCache(consolidatedCacheSize)
+
+// cachedConsolidatedAnalysisData returns getConsolidatedAnalysisData for
+// chatIDs, reusing rows built by earlier calls for chats whose analysis version
+// is unchanged and loading the rest in one batch. The returned rows are shared
+// and must be treated as read-only. If versions cannot be read (e.g. a
+// database without conversation_analyses) the cache is bypassed.
+func cachedConsolidatedAnalysisData(db *sql.DB, dbPath string, chatIDs []int64) (map[int64][]consolidatedRow, error) {
+	if len(chatIDs) == 0 {
+		return map[int64][]consolidatedRow{}, nil
+	}
+
+	versions, err := loadAnalysisVersions(db, chatIDs)
+	if err != nil {
+		return getConsolidatedAnalysisData(db, chatIDs)
+	}
+
+	result := make(map[int64][]consolidatedRow, len(chatIDs))
+	var misses []int64
+	for _, chatID := range chatIDs {
+		key := consolidatedCacheKey{dbPath: dbPath, chatID: chatID, version: versions[chatID]}
+		if rows, ok := chatConsolidatedCache.get(key); ok {
+			result[chatID] = rows
+			continue
+		}
+		misses = append(misses, chatID)
+	}
+	if len(misses) == 0 {
+		return result, nil
+	}
+
+	loaded, err := getConsolidatedAnalysisData(db, misses)
+	if err != nil {
+		return nil, err
+	}
+	for _, chatID := range misses {
+		rows := loaded[chatID]
+		key := consolidatedCacheKey{dbPath: dbPath, chatID: chatID, version: versions[chatID]}
+		chatConsolidatedCache.put(key, rows)
+		result[chatID] = rows
+	}
+	return result, nil
+}
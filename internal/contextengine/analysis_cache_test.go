@@ -0,0 +1,61 @@
+package contextengine
+
+import "testing"
+
+func TestConsolidatedCache_EvictsLeastRecentlyUsed(t *testing.T) {
+	c := newConsolidatedCache(2)
+	k1 := consolidatedCacheKey{dbPath: "a", chatID: 1}
+	k2 := consolidatedCacheKey{dbPath: "a", chatID: 2}
+	k3 := consolidatedCacheKey{dbPath: "a", chatID: 3}
+
+	c.put(k1, []consolidatedRow{{ConversationID: 1}})
+	c.put(k2, []consolidatedRow{{ConversationID: 2}})
+	if _, ok := c.get(k1); !ok {
+		t.Fatalf("expected k1 to be cached")
+	}
+	c.put(k3, []consolidatedRow{{ConversationID: 3}})
+
+	if _, ok := c.get(k2); ok {
+		t.Fatalf("expected k2 to be evicted")
+	}
+	if _, ok := c.get(k1); !ok {
+		t.Fatalf("expected k1 to survive eviction")
+	}
+	if _, ok := c.get(k3); !ok {
+		t.Fatalf("expected k3 to be cached")
+	}
+}
+
+func TestConsolidatedCache_VersionChangeMisses(t *testing.T) {
+	c := newConsolidatedCache(4)
+	k := consolidatedCacheKey{dbPath: "a", chatID: 1, version: analysisVersion{maxAnalysisID: 1}}
+	c.put(k, []consolidatedRow{{ConversationID: 1}})
+
+	bumped := k
+	bumped.version.maxAnalysisID = 2
+	if _, ok := c.get(bumped); ok {
+		t.Fatalf("expected a miss after the analysis version changed")
+	}
+}
+
+func TestJSONIDArray(t *testing.T) {
+	tests := []struct {
+		ids  []int64
+		want string
+	}{
+		{nil, "[]"},
+		{[]int64{7}, "[7]"},
+		{[]int64{1, -2, 30000000000}, "[1,-2,30000000000]"},
+	}
+	for _, tt := range tests {
+		if got := jsonIDArray(tt.ids); got != tt.want {
+			t.Errorf("jsonIDArray(%v) = %q, want %q", tt.ids, got, tt.want)
+		}
+	}
+}
+
+func TestJSONStringArray(t *testing.T) {
+	if got, want := jsonStringArray([]string{"a", `quote"d`}), `["a","quote\"d"]`; got != want {
+		t.Errorf("jsonStringArray() = %q, want %q", got, want)
+	}
+}
@@ -4,6 +4,7 @@ import (
 	"database/sql"
 	"fmt"
 	"strings"
+	"sync"
 	"time"
 
 	_ "github.com/mattn/go-sqlite3"
@@ -17,15 +18,15 @@ func convosContextDataAdapter(params map[string]interface{}, context RetrievalCo
 	// Parse parameters
 	convosParams := parseConvosParams(params)
 
-	// Get database connection
-	db, err := sql.Open("sqlite3", context.DBPath)
+	// Get database connection (shared across slices within one Execute)
+	db, release, err := context.scope.openDB(context.DBPath)
 	if err != nil {
 		return RetrievalResult{}, fmt.Errorf("failed to open database: %w", err)
 	}
-	defer db.Close()
+	defer release()
 
 	// Retrieve conversations context
-	text, err := retrieveConvosContext(db, convosParams)
+	text, err := retrieveConvosContext(db, context.scope, convosParams)
 	if err != nil {
 		return RetrievalResult{}, err
 	}
@@ -199,23 +200,34 @@ func parseConvosParams(params map[string]interface{}) ConvosParams {
 	return result
 }
 
-// resolveTime resolves time window from params
-func resolveTime(timeParams TimeParams) (string, string) {
-	preset := strings.ToLower(timeParams.Preset)
+// presetDays is the length in days of each relative time preset. Windows are
+// resolved to concrete bounds in Go and bound as query parameters, so the SQL
+// text is the same for every preset.
+var presetDays = map[string]int{
+	"day":   1,
+	"week":  7,
+	"month": 30,
+	"year":  365,
+}
 
-	if preset == "day" || preset == "week" || preset == "month" || preset == "year" {
-		end := time.Now()
-		daysMap := map[string]int{
-			"day":   1,
-			"week":  7,
-			"month": 30,
-			"year":  365,
-		}
-		start := end.AddDate(0, 0, -daysMap[preset])
-		return start.Format(time.RFC3339), end.Format(time.RFC3339)
+// presetWindow returns the [start, end) bounds of a relative preset ending now,
+// or ok=false if preset isn't one.
+func presetWindow(preset string) (startISO, endISO string, ok bool) {
+	days, ok := presetDays[strings.ToLower(preset)]
+	if !ok {
+		return "", "", false
 	}
+	end := time.Now()
+	start := end.AddDate(0, 0, -days)
+	return start.Format(time.RFC3339), end.Format(time.RFC3339), true
+}
 
-	if preset == "all" {
+// resolveTime resolves time window from params
+func resolveTime(timeParams TimeParams) (string, string) {
+	if startISO, endISO, ok := presetWindow(timeParams.Preset); ok {
+		return startISO, endISO
+	}
+	if strings.EqualFold(timeParams.Preset, "all") {
 		return "1970-01-01T00:00:00Z", "3000-01-01T00:00:00Z"
 	}
 
@@ -231,33 +243,8 @@ func resolveTime(timeParams TimeParams) (string, string) {
 	return startDate, endDate
 }
 
-// getChatIDsForContact gets chat IDs for a specific contact
-func getChatIDsForContact(db *sql.DB, contactID int64) ([]int64, error) {
-	query := `
-		SELECT DISTINCT chat_id
-		FROM chat_participants
-		WHERE contact_id = ?
-	`
-	rows, err := db.Query(query, contactID)
-	if err != nil {
-		return nil, err
-	}
-	defer rows.Close()
-
-	var chatIDs []int64
-	for rows.Next() {
-		var chatID int64
-		if err := rows.Scan(&chatID); err != nil {
-			return nil, err
-		}
-		chatIDs = append(chatIDs, chatID)
-	}
-
-	return chatIDs, rows.Err()
-}
-
 // collectChatIDs collects chat IDs (union of chat_ids + expanded contact_ids)
-func collectChatIDs(db *sql.DB, chatIDs []int64, contactIDs []int64) []int64 {
+func collectChatIDs(db *sql.DB, scope *requestScope, chatIDs []int64, contactIDs []int64) []int64 {
 	idSet := make(map[int64]bool)
 
 	// Add direct chat IDs
@@ -265,14 +252,9 @@ func collectChatIDs(db *sql.DB, chatIDs []int64, contactIDs []int64) []int64 {
 		idSet[id] = true
 	}
 
-	// Expand contact IDs to chat IDs
-	for _, contactID := range contactIDs {
-		chatIDsForContact, err := getChatIDsForContact(db, contactID)
-		if err != nil {
-			// Best-effort: skip on failure
-			continue
-		}
-		for _, chatID := range chatIDsForContact {
+	// Expand contact IDs to chat IDs (best-effort: skip on failure)
+	if chatIDsForContacts, err := scope.chatIDsForContacts(db, contactIDs); err == nil {
+		for _, chatID := range chatIDsForContacts {
 			idSet[chatID] = true
 		}
 	}
@@ -293,23 +275,15 @@ func filterConversationIDs(db *sql.DB, chatIDs []int64, startISO, endISO string,
 	}
 
 	// Build base query with time + chat filter
-	placeholders := make([]string, len(chatIDs))
-	args := make([]interface{}, 0, len(chatIDs)+2)
-	for i, id := range chatIDs {
-		placeholders[i] = "?"
-		args = append(args, id)
-	}
-	args = append(args, startISO, endISO)
-
-	query := fmt.Sprintf(`
+	query := `
 		SELECT id, chat_id
 		FROM conversations
-		WHERE chat_id IN (%s)
+		WHERE chat_id IN (` + idSetSQL + `)
 		  AND datetime(start_time) >= datetime(?)
 		  AND datetime(start_time) < datetime(?)
-	`, strings.Join(placeholders, ", "))
+	`
 
-	rows, err := db.Query(query, args...)
+	rows, err := db.Query(query, jsonIDArray(chatIDs), startISO, endISO)
 	if err != nil {
 		return nil, err
 	}
@@ -339,7 +313,7 @@ func filterConversationIDs(db *sql.DB, chatIDs []int64, startISO, endISO string,
 	}
 
 	// Helper to apply facet filtering
-	applyFacet := func(table, col string, values []string) error {
+	applyFacet := func(query string, values []string) error {
 		if len(values) == 0 || len(idSet) == 0 {
 			return nil
 		}
@@ -361,27 +335,7 @@ func filterConversationIDs(db *sql.DB, chatIDs []int64, startISO, endISO string,
 			ids = append(ids, id)
 		}
 
-		// Build query
-		idPlaceholders := make([]string, len(ids))
-		valPlaceholders := make([]string, len(lowerValues))
-		args := make([]interface{}, 0, len(ids)+len(lowerValues))
-		for i, id := range ids {
-			idPlaceholders[i] = "?"
-			args = append(args, id)
-		}
-		for i, val := range lowerValues {
-			valPlaceholders[i] = "?"
-			args = append(args, val)
-		}
-
-		facetQuery := fmt.Sprintf(`
-			SELECT DISTINCT conversation_id
-			FROM %s
-			WHERE conversation_id IN (%s)
-			  AND LOWER(%s) IN (%s)
-		`, table, strings.Join(idPlaceholders, ", "), col, strings.Join(valPlaceholders, ", "))
-
-		rows, err := db.Query(facetQuery, args...)
+		rows, err := db.Query(query, jsonIDArray(ids), jsonStringArray(lowerValues))
 		if err != nil {
 			return err
 		}
@@ -403,13 +357,13 @@ func filterConversationIDs(db *sql.DB, chatIDs []int64, startISO, endISO string,
 	}
 
 	// Apply each facet filter
-	if err := applyFacet("entities", "title", match.Entities); err != nil {
+	if err := applyFacet(entitiesMatchSQL, match.Entities); err != nil {
 		return nil, err
 	}
-	if err := applyFacet("topics", "title", match.Topics); err != nil {
+	if err := applyFacet(topicsMatchSQL, match.Topics); err != nil {
 		return nil, err
 	}
-	if err := applyFacet("emotions", "emotion_type", match.Emotions); err != nil {
+	if err := applyFacet(emotionsMatchSQL, match.Emotions); err != nil {
 		return nil, err
 	}
 
@@ -433,21 +387,13 @@ func orderConversationsByTime(db *sql.DB, convIDs []int64, asc bool) ([]int64, e
 		order = "DESC"
 	}
 
-	placeholders := make([]string, len(convIDs))
-	args := make([]interface{}, len(convIDs))
-	for i, id := range convIDs {
-		placeholders[i] = "?"
-		args[i] = id
-	}
-
-	query := fmt.Sprintf(`
+	query := `
 		SELECT id
 		FROM conversations
-		WHERE id IN (%s)
-		ORDER BY start_time %s
-	`, strings.Join(placeholders, ", "), order)
+		WHERE id IN (` + idSetSQL + `)
+		ORDER BY start_time ` + order
 
-	rows, err := db.Query(query, args...)
+	rows, err := db.Query(query, jsonIDArray(convIDs))
 	if err != nil {
 		return nil, err
 	}
@@ -465,35 +411,76 @@ func orderConversationsByTime(db *sql.DB, convIDs []int64, asc bool) ([]int64, e
 	return orderedIDs, rows.Err()
 }
 
-// loadConversationWithMessages loads a single conversation with all messages
-func loadConversationWithMessages(db *sql.DB, convID, chatID int64) (*encoding.Conversation, error) {
-	// Get conversation metadata
+// convosLoadBatch is how many conversations retrieveConvosContext hydrates per
+// round of queries. The token budget usually stops the walk well before every
+// matching conversation is needed, so they are loaded a page at a time.
+const convosLoadBatch = 32
+
+// loadConversationsWithMessages loads conversations with all their messages,
+// keyed by conversation ID. The whole set costs one query each for
+// conversations, messages, attachments and reactions however many
+// conversations are requested; the last three only depend on the ID set and
+// run concurrently on separate connections. IDs that don't exist are absent
+// from the result.
+func loadConversationsWithMessages(db *sql.DB, convIDs []int64) (map[int64]*encoding.Conversation, error) {
+	ids := jsonIDArray(convIDs)
+	convs := make(map[int64]*encoding.Conversation, len(convIDs))
+
 	convQuery := `
 		SELECT id, chat_id, start_time, end_time
 		FROM conversations
-		WHERE id = ? AND chat_id = ?
-		LIMIT 1
+		WHERE id IN (` + idSetSQL + `)
 	`
 
-	var conv encoding.Conversation
-	var startTimeStr, endTimeStr string
-	err := db.QueryRow(convQuery, convID, chatID).Scan(
-		&conv.ID,
-		&conv.ChatID,
-		&startTimeStr,
-		&endTimeStr,
-	)
+	rows, err := db.Query(convQuery, ids)
 	if err != nil {
 		return nil, err
 	}
+	for rows.Next() {
+		var conv encoding.Conversation
+		var startTimeStr, endTimeStr string
+		if err := rows.Scan(&conv.ID, &conv.ChatID, &startTimeStr, &endTimeStr); err != nil {
+			rows.Close()
+			return nil, err
+		}
 
-	// Parse times
-	conv.StartTime, _ = time.Parse(time.RFC3339, startTimeStr)
-	conv.EndTime, _ = time.Parse(time.RFC3339, endTimeStr)
+		// Parse times
+		conv.StartTime, _ = time.Parse(time.RFC3339, startTimeStr)
+		conv.EndTime, _ = time.Parse(time.RFC3339, endTimeStr)
+		convs[int64(conv.ID)] = &conv
+	}
+	rows.Close()
+	if err := rows.Err(); err != nil {
+		return nil, err
+	}
+	if len(convs) == 0 {
+		return convs, nil
+	}
 
-	// Get messages for conversation
+	// Attachments and reactions for every message in the set, one query each,
+	// fetched while the messages are scanned (best-effort, as before: a failed
+	// lookup just leaves them empty).
+	var (
+		wg                   sync.WaitGroup
+		attachmentsByMessage map[int][]encoding.Attachment
+		reactionsByGUID      map[string][]encoding.Reaction
+	)
+	wg.Add(2)
+	go func() {
+		defer wg.Done()
+		attachmentsByMessage, _ = loadAttachmentsForConversations(db, ids)
+	}()
+	go func() {
+		defer wg.Done()
+		reactionsByGUID, _ = loadReactionsForConversations(db, ids)
+	}()
+	// Always wait, so no lookup outlives this call on an error return.
+	defer wg.Wait()
+
+	// Get messages for the conversations
 	msgQuery := `
 		SELECT
+			m.conversation_id,
 			m.id,
 			m.guid,
 			m.timestamp,
@@ -502,22 +489,24 @@ func loadConversationWithMessages(db *sql.DB, convID, chatID int64) (*encoding.C
 			COALESCE(c.is_me, 0) as is_from_me
 		FROM messages m
 		LEFT JOIN contacts c ON m.sender_id = c.id
-		WHERE m.conversation_id = ?
-		ORDER BY m.timestamp ASC
+		WHERE m.conversation_id IN (` + idSetSQL + `)
+		ORDER BY m.conversation_id, m.timestamp ASC
 	`
 
-	rows, err := db.Query(msgQuery, convID)
+	rows, err = db.Query(msgQuery, ids)
 	if err != nil {
 		return nil, err
 	}
 	defer rows.Close()
 
 	for rows.Next() {
+		var convID int64
 		var msg encoding.Message
 		var timestampStr string
 		var isFromMe int
 
 		err := rows.Scan(
+			&convID,
 			&msg.ID,
 			&msg.GUID,
 			&timestampStr,
@@ -532,87 +521,134 @@ func loadConversationWithMessages(db *sql.DB, convID, chatID int64) (*encoding.C
 		msg.Timestamp, _ = time.Parse(time.RFC3339, timestampStr)
 		msg.IsFromMe = isFromMe == 1
 
-		// Load attachments for this message
-		msg.Attachments, _ = loadAttachmentsForMessage(db, msg.ID)
-
-		// Load reactions for this message
-		msg.Reactions, _ = loadReactionsForMessage(db, msg.GUID)
-
+		conv := convs[convID]
 		conv.Messages = append(conv.Messages, msg)
 	}
+	// Release the connection before waiting, so the lookups can proceed even
+	// when the pool allows a single connection.
+	rows.Close()
+	if err := rows.Err(); err != nil {
+		return nil, err
+	}
 
-	return &conv, rows.Err()
+	wg.Wait()
+	for _, conv := range convs {
+		for i := range conv.Messages {
+			msg := &conv.Messages[i]
+			msg.Attachments = attachmentsByMessage[msg.ID]
+			msg.Reactions = reactionsByGUID[msg.GUID]
+		}
+	}
+
+	return convs, nil
 }
 
-// loadAttachmentsForMessage loads attachments for a message
-func loadAttachmentsForMessage(db *sql.DB, messageID int) ([]encoding.Attachment, error) {
+// loadAttachmentsForConversations loads the attachments of every message in
+// the conversations bound as ids (a jsonIDArray) in one query, keyed by
+// message ID.
+func loadAttachmentsForConversations(db *sql.DB, ids string) (map[int][]encoding.Attachment, error) {
 	query := `
-		SELECT id, mime_type, file_name, is_sticker
-		FROM attachments
-		WHERE message_id = ?
+		SELECT a.message_id, a.id, a.mime_type, a.file_name, a.is_sticker
+		FROM attachments a
+		JOIN messages m ON m.id = a.message_id
+		WHERE m.conversation_id IN (` + idSetSQL + `)
+		ORDER BY a.message_id, a.id
 	`
 
-	rows, err := db.Query(query, messageID)
+	rows, err := db.Query(query, ids)
 	if err != nil {
 		return nil, err
 	}
 	defer rows.Close()
 
-	var attachments []encoding.Attachment
+	attachments := make(map[int][]encoding.Attachment)
 	for rows.Next() {
+		var messageID int
 		var att encoding.Attachment
 		var isSticker int
-		err := rows.Scan(&att.ID, &att.MimeType, &att.FileName, &isSticker)
+		err := rows.Scan(&messageID, &att.ID, &att.MimeType, &att.FileName, &isSticker)
 		if err != nil {
 			return nil, err
 		}
 		att.IsSticker = isSticker == 1
-		attachments = append(attachments, att)
+		attachments[messageID] = append(attachments[messageID], att)
 	}
 
 	return attachments, rows.Err()
 }
 
-// loadReactionsForMessage loads reactions for a message
-func loadReactionsForMessage(db *sql.DB, messageGUID string) ([]encoding.Reaction, error) {
+// loadReactionsForConversations loads the reactions to every message in the
+// conversations bound as ids (a jsonIDArray) in one query, keyed by the
+// original message GUID.
+func loadReactionsForConversations(db *sql.DB, ids string) (map[string][]encoding.Reaction, error) {
 	query := `
 		SELECT
+			r.original_message_guid,
 			r.reaction_type,
 			COALESCE(c.name, 'Unknown') as sender_name,
 			COALESCE(c.is_me, 0) as is_from_me
 		FROM reactions r
+		JOIN messages m ON m.guid = r.original_message_guid
 		LEFT JOIN contacts c ON r.sender_id = c.id
-		WHERE r.original_message_guid = ?
+		WHERE m.conversation_id IN (` + idSetSQL + `)
+		ORDER BY r.id
 	`
 
-	rows, err := db.Query(query, messageGUID)
+	rows, err := db.Query(query, ids)
 	if err != nil {
 		return nil, err
 	}
 	defer rows.Close()
 
-	var reactions []encoding.Reaction
+	reactions := make(map[string][]encoding.Reaction)
 	for rows.Next() {
+		var guid string
 		var reaction encoding.Reaction
 		var isFromMe int
-		err := rows.Scan(&reaction.ReactionType, &reaction.SenderName, &isFromMe)
+		err := rows.Scan(&guid, &reaction.ReactionType, &reaction.SenderName, &isFromMe)
 		if err != nil {
 			return nil, err
 		}
 		reaction.IsFromMe = isFromMe == 1
-		reactions = append(reactions, reaction)
+		reactions[guid] = append(reactions[guid], reaction)
 	}
 
 	return reactions, rows.Err()
 }
 
+// hydratedBatch is one batch of loadConversationsWithMessages results.
+type hydratedBatch struct {
+	ids   []int64
+	convs map[int64]*encoding.Conversation
+	err   error
+}
+
+// prefetchConversations starts loading the convosLoadBatch conversations of
+// convIDs beginning at start on its own goroutine and returns a channel that
+// yields the batch once. The channel is buffered, so a batch that is never
+// received (the token budget ran out) doesn't leak the goroutine.
+func prefetchConversations(db *sql.DB, convIDs []int64, start int) <-chan hydratedBatch {
+	end := start + convosLoadBatch
+	if end > len(convIDs) {
+		end = len(convIDs)
+	}
+	batch := convIDs[start:end]
+
+	ch := make(chan hydratedBatch, 1)
+	go func() {
+		convs, err := loadConversationsWithMessages(db, batch)
+		ch <- hydratedBatch{ids: batch, convs: convs, err: err}
+	}()
+	return ch
+}
+
 // retrieveConvosContext retrieves conversations context
-func retrieveConvosContext(db *sql.DB, params ConvosParams) (string, error) {
+func retrieveConvosContext(db *sql.DB, scope *requestScope, params ConvosParams) (string, error) {
 	// Resolve time window
 	startISO, endISO := resolveTime(params.Time)
 
 	// Collect chat IDs
-	chatIDs := collectChatIDs(db, params.ChatIDs, params.ContactIDs)
+	chatIDs := collectChatIDs(db, scope, params.ChatIDs, params.ContactIDs)
 	if len(chatIDs) == 0 {
 		return "", nil // No chat IDs resolved
 	}
@@ -641,74 +677,51 @@ func retrieveConvosContext(db *sql.DB, params ConvosParams) (string, error) {
 		}
 	}
 
-	// Map conv -> chat for hydration
-	convToChat := make(map[int64]int64)
-	if len(convIDs) > 0 {
-		placeholders := make([]string, len(convIDs))
-		args := make([]interface{}, len(convIDs))
-		for i, id := range convIDs {
-			placeholders[i] = "?"
-			args[i] = id
-		}
-
-		query := fmt.Sprintf(`
-			SELECT id, chat_id
-			FROM conversations
-			WHERE id IN (%s)
-		`, strings.Join(placeholders, ", "))
-
-		rows, err := db.Query(query, args...)
-		if err != nil {
-			return "", err
-		}
-		defer rows.Close()
-
-		for rows.Next() {
-			var convID, chatID int64
-			if err := rows.Scan(&convID, &chatID); err != nil {
-				return "", err
-			}
-			convToChat[convID] = chatID
-		}
-	}
-
-	// Load and encode conversations with token budget
+	// Load and encode conversations with token budget. The next batch is
+	// hydrated in the background while the current one is encoded, so query
+	// latency overlaps encoding; at most one batch is loaded ahead.
 	var outLines []string
 	totalTokens := 0
 
-	for _, convID := range convIDs {
-		chatID, ok := convToChat[convID]
-		if !ok {
-			continue // Skip if no chat mapping
+	next := prefetchConversations(db, convIDs, 0)
+hydrate:
+	for start := 0; start < len(convIDs); start += convosLoadBatch {
+		loaded := <-next
+		if start+convosLoadBatch < len(convIDs) {
+			next = prefetchConversations(db, convIDs, start+convosLoadBatch)
 		}
-
-		// Load conversation with messages
-		conv, err := loadConversationWithMessages(db, convID, chatID)
-		if err != nil {
+		if loaded.err != nil {
 			continue // Skip on error
 		}
-		if len(conv.Messages) == 0 {
-			continue // Skip empty conversations
-		}
 
-		// Encode conversation
-		opts := encoding.EncodeOptions{
-			IncludeSender:      params.Encode.IncludeSender,
-			IncludeAttachments: params.Encode.IncludeAttachments,
-			IncludeReactions:   params.Encode.IncludeReactions,
-		}
-		encoded := encoding.EncodeConversation(conv, opts)
+		for _, convID := range loaded.ids {
+			conv, ok := loaded.convs[convID]
+			if !ok {
+				continue // Skip if the conversation no longer exists
+			}
+			if len(conv.Messages) == 0 {
+				continue // Skip empty conversations
+			}
 
-		// Count tokens
-		approxTokens := len(encoded) / 4
+			// Encode conversation
+			opts := encoding.EncodeOptions{
+				IncludeSender:      params.Encode.IncludeSender,
+				IncludeAttachments: params.Encode.IncludeAttachments,
+				IncludeReactions:   params.Encode.IncludeReactions,
+			}
+			encoded := encoding.EncodeConversation(conv, opts)
 
-		// Check budget
-		if totalTokens+approxTokens > params.TokenMax {
-			break // Stop if over budget
-		}
+			// Count tokens
+			approxTokens := len(encoded) / 4
 
-		outLines = append(outLines, encoded)
-		totalTokens += approxTokens
+			// Check budget
+			if totalTokens+approxTokens > params.TokenMax {
+				break hydrate // Stop if over budget
+			}
+
+			outLines = append(outLines, encoded)
+			totalTokens += approxTokens
+		}
 	}
 
 	return strings.Join(outLines, "\n\n"), nil
@@ -670,3 +670,59 @@ func TestResolveTime(t *testing.T) {
 		})
 	}
 }
+
+func TestLoadConversationsWithMessages_AttachmentsAndReactions(t *testing.T) {
+	dbPath, cleanup := setupTestConvosDB(t)
+	defer cleanup()
+
+	db, err := sql.Open("sqlite3", dbPath)
+	if err != nil {
+		t.Fatalf("failed to open database: %v", err)
+	}
+	defer db.Close()
+
+	_, err = db.Exec(`
+		INSERT INTO attachments (id, message_id, mime_type, file_name, is_sticker) VALUES
+		(1, 1, 'image/jpeg', 'a.jpg', 0),
+		(2, 1, 'image/png', 'b.png', 1),
+		(3, 3, 'image/gif', 'other.gif', 0);
+		INSERT INTO reactions (id, original_message_guid, reaction_type, sender_id) VALUES
+		(1, 'msg-2', 2000, 1),
+		(2, 'msg-3', 2001, 2);
+	`)
+	if err != nil {
+		t.Fatalf("failed to insert attachments/reactions: %v", err)
+	}
+
+	convs, err := loadConversationsWithMessages(db, []int64{1, 2})
+	if err != nil {
+		t.Fatalf("loadConversationsWithMessages failed: %v", err)
+	}
+	if other := convs[2]; other == nil || len(other.Messages) != 2 || len(other.Messages[0].Attachments) != 1 || len(other.Messages[0].Reactions) != 1 {
+		t.Errorf("unexpected conversation 2: %+v", other)
+	}
+	conv := convs[1]
+	if conv == nil {
+		t.Fatal("conversation 1 not loaded")
+	}
+	if conv.ChatID != 100 {
+		t.Errorf("expected chat 100, got %d", conv.ChatID)
+	}
+	if len(conv.Messages) != 2 {
+		t.Fatalf("expected 2 messages, got %d", len(conv.Messages))
+	}
+
+	first, second := conv.Messages[0], conv.Messages[1]
+	if len(first.Attachments) != 2 || first.Attachments[0].FileName != "a.jpg" || !first.Attachments[1].IsSticker {
+		t.Errorf("unexpected attachments for msg-1: %+v", first.Attachments)
+	}
+	if len(first.Reactions) != 0 {
+		t.Errorf("expected no reactions for msg-1, got %+v", first.Reactions)
+	}
+	if len(second.Attachments) != 0 {
+		t.Errorf("expected no attachments for msg-2, got %+v", second.Attachments)
+	}
+	if len(second.Reactions) != 1 || second.Reactions[0].SenderName != "Alice" || second.Reactions[0].ReactionType != 2000 {
+		t.Errorf("unexpected reactions for msg-2: %+v", second.Reactions)
+	}
+}
@@ -77,10 +77,14 @@ func (e *Engine) Execute(request ExecuteRequest) (interface{}, error) {
 	}
 
 	// Build retrieval context
+	scope := newRequestScope(e.dbPath)
+	defer scope.close()
+
 	context := RetrievalContext{
 		SourceChat: request.SourceChat,
 		Vars:       request.Vars,
 		DBPath:     e.dbPath,
+		scope:      scope,
 	}
 	if context.Vars == nil {
 		context.Vars = make(map[string]interface{})
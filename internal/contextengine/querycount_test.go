@@ -0,0 +1,106 @@
+package contextengine
+
+import (
+	"context"
+	"database/sql"
+	"database/sql/driver"
+	"fmt"
+	"sync/atomic"
+	"testing"
+
+	sqlite3 "github.com/mattn/go-sqlite3"
+)
+
+// countingConnector opens sqlite3 connections that count every statement the
+// database/sql layer runs. The wrapped conn only exposes Prepare, so every
+// Query/Exec goes through it and is counted exactly once. It does not support
+// multi-statement Exec; set up schemas with a regular handle first.
+type countingConnector struct {
+	dsn     string
+	queries atomic.Int64
+}
+
+func (c *countingConnector) Connect(context.Context) (driver.Conn, error) {
+	conn, err := c.Driver().Open(c.dsn)
+	if err != nil {
+		return nil, err
+	}
+	return &countingConn{Conn: conn, queries: &c.queries}, nil
+}
+
+func (c *countingConnector) Driver() driver.Driver { return &sqlite3.SQLiteDriver{} }
+
+type countingConn struct {
+	driver.Conn
+	queries *atomic.Int64
+}
+
+func (c *countingConn) Prepare(query string) (driver.Stmt, error) {
+	c.queries.Add(1)
+	return c.Conn.Prepare(query)
+}
+
+// openCountingDB opens dbPath through a countingConnector. Read the running
+// statement count from the returned counter.
+func openCountingDB(t *testing.T, dbPath string) (*sql.DB, *atomic.Int64) {
+	t.Helper()
+	c := &countingConnector{dsn: dbPath}
+	db := sql.OpenDB(c)
+	t.Cleanup(func() { db.Close() })
+	return db, &c.queries
+}
+
+// TestLoadConversationsWithMessages_QueryCount pins conversation hydration to
+// a fixed number of statements regardless of how many conversations and
+// messages are loaded.
+func TestLoadConversationsWithMessages_QueryCount(t *testing.T) {
+	dbPath, cleanup := setupTestConvosDB(t)
+	defer cleanup()
+
+	seed, err := sql.Open("sqlite3", dbPath)
+	if err != nil {
+		t.Fatalf("failed to open database: %v", err)
+	}
+	for i := 100; i < 150; i++ {
+		if _, err := seed.Exec(`INSERT INTO messages (id, conversation_id, guid, timestamp, sender_id, text) VALUES (?, 1, ?, '2024-01-01T00:00:00Z', 1, 'x')`, i, fmt.Sprintf("bulk-%d", i)); err != nil {
+			t.Fatalf("failed to insert message: %v", err)
+		}
+		if _, err := seed.Exec(`INSERT INTO attachments (message_id, mime_type, file_name) VALUES (?, 'image/png', 'x.png')`, i); err != nil {
+			t.Fatalf("failed to insert attachment: %v", err)
+		}
+	}
+	seed.Close()
+
+	db, queries := openCountingDB(t, dbPath)
+	convs, err := loadConversationsWithMessages(db, []int64{1, 2, 3})
+	if err != nil {
+		t.Fatalf("loadConversationsWithMessages failed: %v", err)
+	}
+	if len(convs) != 3 {
+		t.Fatalf("expected 3 conversations, got %d", len(convs))
+	}
+	if got := len(convs[1].Messages); got != 52 {
+		t.Fatalf("expected 52 messages, got %d", got)
+	}
+	// conversation, messages, attachments, reactions
+	if got := queries.Load(); got != 4 {
+		t.Errorf("expected 4 queries, got %d", got)
+	}
+}
+
+// TestGetConsolidatedAnalysisData_QueryCount pins the batch loader to one
+// statement per table however many chats are requested.
+func TestGetConsolidatedAnalysisData_QueryCount(t *testing.T) {
+	dbPath := setupTestAnalysesDB(t)
+
+	for _, chatIDs := range [][]int64{{1}, {1, 2}, {1, 2, 3, 4, 5}} {
+		db, queries := openCountingDB(t, dbPath)
+		if _, err := getConsolidatedAnalysisData(db, chatIDs); err != nil {
+			t.Fatalf("getConsolidatedAnalysisData(%v) failed: %v", chatIDs, err)
+		}
+		// conversations + emotions, humor_items, topics, entities
+		if got := queries.Load(); got != 5 {
+			t.Errorf("getConsolidatedAnalysisData(%v): expected 5 queries, got %d", chatIDs, got)
+		}
+	}
+}
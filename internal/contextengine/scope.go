@@ -0,0 +1,114 @@
+package contextengine
+
+import "database/sql"
+
+// requestScope holds lookups that cannot change while a single Execute call
+// compiles its slices, so packs with several DB-backed slices pay for them
+// once: the database handle and the contact -> chat expansion that both the
+// convos and analyses adapters perform.
+//
+// A nil *requestScope is valid and simply disables sharing; that is what
+// adapters see when they are invoked directly rather than through Execute.
+type requestScope struct {
+	dbPath       string
+	db           *sql.DB
+	contactChats map[int64][]int64
+}
+
+func newRequestScope(dbPath string) *requestScope {
+	return &requestScope{
+		dbPath:       dbPath,
+		contactChats: make(map[int64][]int64),
+	}
+}
+
+// close releases the shared database handle, if one was opened.
+func (s *requestScope) close() {
+	if s != nil && s.db != nil {
+		s.db.Close()
+		s.db = nil
+	}
+}
+
+// openDB returns a database handle for dbPath and a release func. Within a
+// request scope the handle is opened once and shared; otherwise the caller
+// gets its own handle that release closes.
+func (s *requestScope) openDB(dbPath string) (*sql.DB, func(), error) {
+	if s != nil && s.dbPath == dbPath {
+		if s.db == nil {
+			db, err := sql.Open("sqlite3", dbPath)
+			if err != nil {
+				return nil, nil, err
+			}
+			s.db = db
+		}
+		return s.db, func() {}, nil
+	}
+
+	db, err := sql.Open("sqlite3", dbPath)
+	if err != nil {
+		return nil, nil, err
+	}
+	return db, func() { db.Close() }, nil
+}
+
+// chatIDsForContacts expands contact IDs to the chats they participate in,
+// reusing expansions already resolved earlier in the same request. The result
+// may contain duplicates; callers fold it into a set.
+func (s *requestScope) chatIDsForContacts(db *sql.DB, contactIDs []int64) ([]int64, error) {
+	var memo map[int64][]int64
+	if s != nil {
+		memo = s.contactChats
+	}
+
+	var chatIDs []int64
+	var missing []int64
+	for _, id := range contactIDs {
+		if cached, ok := memo[id]; ok {
+			chatIDs = append(chatIDs, cached...)
+			continue
+		}
+		missing = append(missing, id)
+	}
+	if len(missing) == 0 {
+		return chatIDs, nil
+	}
+
+	fetched, err := getChatIDsByContact(db, missing)
+	if err != nil {
+		return nil, err
+	}
+	for _, id := range missing {
+		if memo != nil {
+			memo[id] = fetched[id]
+		}
+		chatIDs = append(chatIDs, fetched[id]...)
+	}
+	return chatIDs, nil
+}
+
+// getChatIDsByContact gets the chat IDs each of the given contacts
+// participates in, in a single query
+func getChatIDsByContact(db *sql.DB, contactIDs []int64) (map[int64][]int64, error) {
+	query := `
+		SELECT DISTINCT contact_id, chat_id
+		FROM chat_participants
+		WHERE contact_id IN (` + idSetSQL + `)
+	`
+	rows, err := db.Query(query, jsonIDArray(contactIDs))
+	if err != nil {
+		return nil, err
+	}
+	defer rows.Close()
+
+	out := make(map[int64][]int64, len(contactIDs))
+	for rows.Next() {
+		var contactID, chatID int64
+		if err := rows.Scan(&contactID, &chatID); err != nil {
+			return nil, err
+		}
+		out[contactID] = append(out[contactID], chatID)
+	}
+
+	return out, rows.Err()
+}
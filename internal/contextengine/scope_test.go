@@ -0,0 +1,68 @@
+package contextengine
+
+import (
+	"database/sql"
+	"strings"
+	"testing"
+)
+
+func TestRequestScope_SharesContactExpansion(t *testing.T) {
+	dbPath, cleanup := setupTestConvosDB(t)
+	defer cleanup()
+
+	scope := newRequestScope(dbPath)
+	defer scope.close()
+
+	context := RetrievalContext{DBPath: dbPath, scope: scope}
+	params := map[string]interface{}{
+		"contact_ids": []interface{}{1},
+		"time":        map[string]interface{}{"preset": "all"},
+		"token_max":   10000,
+	}
+
+	if _, err := convosContextDataAdapter(params, context); err != nil {
+		t.Fatalf("convosContextDataAdapter failed: %v", err)
+	}
+	if got := scope.contactChats[1]; len(got) != 1 || got[0] != 100 {
+		t.Fatalf("expected contact 1 to expand to chat 100, got %v", got)
+	}
+
+	// Later slices in the same request reuse the expansion instead of
+	// re-querying chat_participants.
+	db, err := sql.Open("sqlite3", dbPath)
+	if err != nil {
+		t.Fatalf("failed to open database: %v", err)
+	}
+	defer db.Close()
+	if _, err := db.Exec(`DELETE FROM chat_participants`); err != nil {
+		t.Fatalf("failed to clear chat_participants: %v", err)
+	}
+
+	result, err := convosContextDataAdapter(params, context)
+	if err != nil {
+		t.Fatalf("convosContextDataAdapter failed: %v", err)
+	}
+	if !strings.Contains(result.Text, "Hello from Alice") {
+		t.Error("expected memoized expansion to still find 'Hello from Alice'")
+	}
+}
+
+func TestRequestScope_NilScopeOpensOwnHandle(t *testing.T) {
+	dbPath, cleanup := setupTestConvosDB(t)
+	defer cleanup()
+
+	var scope *requestScope
+	db, release, err := scope.openDB(dbPath)
+	if err != nil {
+		t.Fatalf("openDB failed: %v", err)
+	}
+	defer release()
+
+	chatIDs, err := scope.chatIDsForContacts(db, []int64{1, 2})
+	if err != nil {
+		t.Fatalf("chatIDsForContacts failed: %v", err)
+	}
+	if len(chatIDs) != 2 {
+		t.Errorf("expected 2 chat IDs, got %v", chatIDs)
+	}
+}
@@ -63,6 +63,10 @@ type RetrievalContext struct {
 	SourceChat int
 	Vars       map[string]interface{}
 	DBPath     string
+
+	// scope is shared by all slices compiled in one Execute call (nil when an
+	// adapter is called directly)
+	scope *requestScope
 }
 
 // RetrievalResult represents the result of a retrieval operation
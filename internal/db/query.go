@@ -84,16 +84,17 @@ func Execute(opts QueryOptions) QueryResult {
 		}
 	}
 
+	// Scan targets are positional and reused for every row; each row's values
+	// are copied out into its own map below.
+	values := make([]interface{}, len(columns))
+	valuePtrs := make([]interface{}, len(columns))
+	for i := range values {
+		valuePtrs[i] = &values[i]
+	}
+
 	// Fetch all rows
 	var results []map[string]interface{}
 	for rows.Next() {
-		// Create a slice of interface{} to hold each column's value
-		values := make([]interface{}, len(columns))
-		valuePtrs := make([]interface{}, len(columns))
-		for i := range values {
-			valuePtrs[i] = &values[i]
-		}
-
 		// Scan the row
 		if err := rows.Scan(valuePtrs...); err != nil {
 			return QueryResult{
@@ -103,7 +104,7 @@ func Execute(opts QueryOptions) QueryResult {
 		}
 
 		// Create a map for this row
-		rowMap := make(map[string]interface{})
+		rowMap := make(map[string]interface{}, len(columns))
 		for i, col := range columns {
 			val := values[i]
 			// Convert []byte to string for better JSON serialization
@@ -2,15 +2,23 @@ package db
 
 import (
 	"database/sql"
+	"encoding/json"
 	"fmt"
+	"sync"
+	"sync/atomic"
 	"time"
 
 	"github.com/Napageneral/eve/internal/encoding"
 )
 
-// ConversationReader reads conversations and their messages from the warehouse
+// ConversationReader reads conversations and their messages from the warehouse.
+// It is safe for concurrent use; a reader kept for the life of a job handler
+// prepares conversationSQL once and reuses it for every conversation.
 type ConversationReader struct {
 	db *sql.DB
+
+	stmtOnce sync.Once
+	stmt     *sql.Stmt
 }
 
 // NewConversationReader creates a new conversation reader
@@ -18,78 +26,108 @@ func NewConversationReader(db *sql.DB) *ConversationReader {
 	return &ConversationReader{db: db}
 }
 
+// conversationSQL loads a conversation and all of its messages in one round
+// trip. Each message row carries its attachments and reactions as JSON arrays
+// built by correlated subqueries (served by idx_attachments_message_id and
+// idx_reactions_message_guid), keyed by encoding.Attachment/encoding.Reaction
+// field names with real JSON booleans so they decode straight into those
+// types. NULL columns decode as zero values. Only the columns the encoding
+// types carry are selected; a message's conversation_id is the joined cv.id.
+// cv.message_count, stored when conversations are built, sizes the message
+// slice up front. A conversation without messages yields a single row whose
+// message columns are NULL.
+const conversationSQL = `
+	SELECT
+		cv.id, cv.chat_id, cv.start_time, cv.end_time, cv.message_count,
+		m.id, m.guid, m.timestamp, m.sender_id, m.content, m.is_from_me, m.chat_id,
+		CASE
+			WHEN m.is_from_me = 1 THEN 'Me'
+			ELSE COALESCE(c.name, c.nickname, '')
+		END as sender_name,
+		(
+			SELECT json_group_array(json_object(
+				'ID', a.id, 'MimeType', a.mime_type, 'FileName', a.file_name,
+				'IsSticker', json(CASE WHEN a.is_sticker THEN 'true' ELSE 'false' END)
+			))
+			FROM (
+				SELECT id, mime_type, file_name, is_sticker
+				FROM attachments WHERE message_id = m.id ORDER BY id
+			) a
+		) as attachments,
+		(
+			SELECT json_group_array(json_object(
+				'ReactionType', r.reaction_type, 'SenderID', r.sender_id,
+				'IsFromMe', json(CASE WHEN r.is_from_me THEN 'true' ELSE 'false' END),
+				'SenderName', COALESCE(rc.name, rc.nickname, '')
+			))
+			FROM reactions r
+			LEFT JOIN contacts rc ON r.sender_id = rc.id
+			WHERE r.original_message_guid = m.guid
+		) as reactions
+	FROM conversations cv
+	LEFT JOIN messages m ON m.conversation_id = cv.id
+	LEFT JOIN contacts c ON m.sender_id = c.id
+	WHERE cv.id = ?
+	ORDER BY m.timestamp
+`
+
 // GetConversation retrieves a conversation with all its messages, attachments, and reactions
 func (r *ConversationReader) GetConversation(conversationID int) (*encoding.Conversation, error) {
-	// Get conversation metadata
-	var conv encoding.Conversation
-	err := r.db.QueryRow(`
-		SELECT id, chat_id, start_time, end_time
-		FROM conversations
-		WHERE id = ?
-	`, conversationID).Scan(
-		&conv.ID,
-		&conv.ChatID,
-		&conv.StartTime,
-		&conv.EndTime,
-	)
+	rows, err := r.query(conversationID)
 	if err != nil {
 		return nil, fmt.Errorf("failed to get conversation: %w", err)
 	}
-
-	// Get messages for this conversation
-	messages, err := r.getMessages(conversationID)
-	if err != nil {
-		return nil, fmt.Errorf("failed to get messages: %w", err)
-	}
-
-	conv.Messages = messages
-	return &conv, nil
-}
-
-// getMessages retrieves all messages for a conversation with their attachments and reactions
-func (r *ConversationReader) getMessages(conversationID int) ([]encoding.Message, error) {
-	rows, err := r.db.Query(`
-		SELECT
-			m.id, m.guid, m.timestamp, m.sender_id, m.content, m.is_from_me,
-			m.conversation_id, m.chat_id,
-			CASE
-				WHEN m.is_from_me = 1 THEN 'Me'
-				ELSE COALESCE(c.name, c.nickname, '')
-			END as sender_name
-		FROM messages m
-		LEFT JOIN contacts c ON m.sender_id = c.id
-		WHERE m.conversation_id = ?
-		ORDER BY m.timestamp
-	`, conversationID)
-	if err != nil {
-		return nil, err
-	}
 	defer rows.Close()
 
-	var messages []encoding.Message
+	var conv *encoding.Conversation
 	for rows.Next() {
-		var msg encoding.Message
-		var senderID sql.NullInt64
-		var content sql.NullString
-		var timestamp string
+		var c encoding.Conversation
+		var messageCount int
+		var msgID, senderID, msgChatID sql.NullInt64
+		var guid, timestamp, content, senderName sql.NullString
+		var attachmentsJSON, reactionsJSON sql.RawBytes
+		var isFromMe sql.NullBool
 
 		err := rows.Scan(
-			&msg.ID,
-			&msg.GUID,
+			&c.ID,
+			&c.ChatID,
+			&c.StartTime,
+			&c.EndTime,
+			&messageCount,
+			&msgID,
+			&guid,
 			&timestamp,
 			&senderID,
 			&content,
-			&msg.IsFromMe,
-			&msg.ConversationID,
-			&msg.ChatID,
-			&msg.SenderName,
+			&isFromMe,
+			&msgChatID,
+			&senderName,
+			&attachmentsJSON,
+			&reactionsJSON,
 		)
 		if err != nil {
-			return nil, err
+			return nil, fmt.Errorf("failed to get conversation: %w", err)
+		}
+		if conv == nil {
+			conv = &c
+			conv.Messages = make([]encoding.Message, 0, messageCount)
+		}
+		if !msgID.Valid {
+			continue
+		}
+
+		msg := encoding.Message{
+			ID:             int(msgID.Int64),
+			GUID:           guid.String,
+			Content:        content.String,
+			IsFromMe:       isFromMe.Bool,
+			ConversationID: conv.ID,
+			ChatID:         int(msgChatID.Int64),
+			SenderName:     senderName.String,
 		}
 
 		// Parse timestamp
-		msg.Timestamp, err = parseTimestamp(timestamp)
+		msg.Timestamp, err = parseTimestamp(timestamp.String)
 		if err != nil {
 			return nil, fmt.Errorf("failed to parse timestamp: %w", err)
 		}
@@ -99,38 +137,61 @@ func (r *ConversationReader) getMessages(conversationID int) ([]encoding.Message
 			msg.SenderID = &id
 		}
 
-		if content.Valid {
-			msg.Content = content.String
+		if msg.Attachments, err = decodeAttachments(attachmentsJSON); err != nil {
+			return nil, fmt.Errorf("failed to get attachments for message %d: %w", msg.ID, err)
+		}
+		if msg.Reactions, err = decodeReactions(reactionsJSON); err != nil {
+			return nil, fmt.Errorf("failed to get reactions for message %d: %w", msg.ID, err)
 		}
 
-		messages = append(messages, msg)
+		conv.Messages = append(conv.Messages, msg)
 	}
-
 	if err := rows.Err(); err != nil {
-		return nil, err
+		return nil, fmt.Errorf("failed to get messages: %w", err)
+	}
+	if conv == nil {
+		return nil, fmt.Errorf("failed to get conversation: %w", sql.ErrNoRows)
 	}
+	return conv, nil
+}
 
-	if len(messages) == 0 {
-		return messages, nil
+// query runs conversationSQL, through the prepared statement when it could be
+// prepared and as plain SQL otherwise.
+func (r *ConversationReader) query(conversationID int) (*sql.Rows, error) {
+	r.stmtOnce.Do(func() {
+		if stmt, err := r.db.Prepare(conversationSQL); err == nil {
+			r.stmt = stmt
+		}
+	})
+	if r.stmt != nil {
+		return r.stmt.Query(conversationID)
 	}
+	return r.db.Query(conversationSQL, conversationID)
+}
 
-	// Batch-load attachments and reactions for the entire conversation.
-	attachmentsByMsgID, err := r.getAttachmentsForConversation(conversationID)
-	if err != nil {
-		return nil, fmt.Errorf("failed to get attachments for conversation %d: %w", conversationID, err)
+// decodeAttachments decodes the attachments JSON array built by
+// conversationSQL. data is only valid until the next rows.Next.
+func decodeAttachments(data []byte) ([]encoding.Attachment, error) {
+	if len(data) == 0 || string(data) == "[]" {
+		return nil, nil
 	}
-	reactionsByGUID, err := r.getReactionsForConversation(conversationID)
-	if err != nil {
-		return nil, fmt.Errorf("failed to get reactions for conversation %d: %w", conversationID, err)
+	var attachments []encoding.Attachment
+	if err := json.Unmarshal(data, &attachments); err != nil {
+		return nil, err
 	}
+	return attachments, nil
+}
 
-	for i := range messages {
-		msgID := messages[i].ID
-		messages[i].Attachments = attachmentsByMsgID[msgID]
-		messages[i].Reactions = reactionsByGUID[messages[i].GUID]
+// decodeReactions decodes the reactions JSON array built by conversationSQL.
+func decodeReactions(data []byte) ([]encoding.Reaction, error) {
+	if len(data) == 0 || string(data) == "[]" {
+		return nil, nil
 	}
-
-	return messages, nil
+	var reactions []encoding.Reaction
+	if err := json.Unmarshal(data, &reactions); err != nil {
+		return nil, err
+	}
+	return reactions, nil
 }
 
 // getAttachments retrieves all attachments for a message
@@ -217,91 +278,31 @@ func (r *ConversationReader) getReactions(messageGUID string) ([]encoding.Reacti
 	return reactions, rows.Err()
 }
 
-// getAttachmentsForConversation retrieves all attachments for messages in a conversation in one query.
-func (r *ConversationReader) getAttachmentsForConversation(conversationID int) (map[int][]encoding.Attachment, error) {
-	rows, err := r.db.Query(`
-		SELECT a.id, a.message_id, a.mime_type, a.file_name, a.is_sticker
-		FROM attachments a
-		JOIN messages m ON m.id = a.message_id
-		WHERE m.conversation_id = ?
-	`, conversationID)
-	if err != nil {
-		return nil, err
-	}
-	defer rows.Close()
-
-	out := make(map[int][]encoding.Attachment)
-	for rows.Next() {
-		var att encoding.Attachment
-		var messageID int
-		var mimeType, fileName sql.NullString
-
-		if err := rows.Scan(&att.ID, &messageID, &mimeType, &fileName, &att.IsSticker); err != nil {
-			return nil, err
-		}
-		if mimeType.Valid {
-			att.MimeType = mimeType.String
-		}
-		if fileName.Valid {
-			att.FileName = fileName.String
-		}
-
-		out[messageID] = append(out[messageID], att)
-	}
-	return out, rows.Err()
+// timestampLayouts are the SQLite timestamp formats parseTimestamp accepts.
+var timestampLayouts = []string{
+	time.RFC3339,
+	"2006-01-02 15:04:05",
+	"2006-01-02T15:04:05",
+	"2006-01-02 15:04:05.999999999",
+	"2006-01-02T15:04:05.999999999",
 }
 
-// getReactionsForConversation retrieves all reactions for messages in a conversation in one query.
-func (r *ConversationReader) getReactionsForConversation(conversationID int) (map[string][]encoding.Reaction, error) {
-	rows, err := r.db.Query(`
-		SELECT
-			r.original_message_guid, r.reaction_type, r.sender_id, r.is_from_me,
-			COALESCE(c.name, c.nickname, '') as sender_name
-		FROM reactions r
-		JOIN messages m ON m.guid = r.original_message_guid
-		LEFT JOIN contacts c ON r.sender_id = c.id
-		WHERE m.conversation_id = ?
-	`, conversationID)
-	if err != nil {
-		return nil, err
-	}
-	defer rows.Close()
-
-	out := make(map[string][]encoding.Reaction)
-	for rows.Next() {
-		var guid string
-		var react encoding.Reaction
-		var senderID sql.NullInt64
-		var isFromMe sql.NullBool
-
-		if err := rows.Scan(&guid, &react.ReactionType, &senderID, &isFromMe, &react.SenderName); err != nil {
-			return nil, err
-		}
-		if senderID.Valid {
-			react.SenderID = int(senderID.Int64)
-		}
-		if isFromMe.Valid {
-			react.IsFromMe = isFromMe.Bool
-		}
-		out[guid] = append(out[guid], react)
-	}
-	return out, rows.Err()
-}
+// lastTimestampLayout remembers which layout parsed the previous value; rows
+// from one database share a layout, so it is tried first.
+var lastTimestampLayout atomic.Int32
 
 // parseTimestamp parses SQLite timestamp formats
 func parseTimestamp(value string) (time.Time, error) {
-	// Try common SQLite timestamp formats
-	formats := []string{
-		time.RFC3339,
-		"2006-01-02 15:04:05",
-		"2006-01-02T15:04:05",
-		"2006-01-02 15:04:05.999999999",
-		"2006-01-02T15:04:05.999999999",
+	last := int(lastTimestampLayout.Load())
+	if t, err := time.Parse(timestampLayouts[last], value); err == nil {
+		return t, nil
 	}
-
-	for _, format := range formats {
-		t, err := time.Parse(format, value)
-		if err == nil {
+	for i, layout := range timestampLayouts {
+		if i == last {
+			continue
+		}
+		if t, err := time.Parse(layout, value); err == nil {
+			lastTimestampLayout.Store(int32(i))
 			return t, nil
 		}
 	}
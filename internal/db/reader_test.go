@@ -2,6 +2,7 @@ package db
 
 import (
 	"database/sql"
+	"errors"
 	"os"
 	"testing"
 	"time"
@@ -39,6 +40,7 @@ func setupReaderTestDB(t *testing.T) (*sql.DB, func()) {
 			chat_id INTEGER NOT NULL,
 			start_time TIMESTAMP NOT NULL,
 			end_time TIMESTAMP NOT NULL,
+			message_count INTEGER NOT NULL DEFAULT 0,
 			FOREIGN KEY (chat_id) REFERENCES chats(id)
 		);
 
@@ -150,10 +152,10 @@ func TestGetConversation_WithAttachments(t *testing.T) {
 		VALUES (1, 1, '2025-10-27 15:00:00', '2025-10-27 16:00:00');
 		INSERT INTO messages (id, chat_id, sender_id, content, timestamp, is_from_me, guid, conversation_id)
 		VALUES (1, 1, 1, 'Check this', '2025-10-27 15:30:00', 0, 'msg-1', 1);
-		INSERT INTO attachments (id, message_id, mime_type, file_name)
+		INSERT INTO attachments (id, message_id, mime_type, file_name, is_sticker)
 		VALUES
-			(1, 1, 'image/png', 'photo.png'),
-			(2, 1, 'application/pdf', 'doc.pdf');
+			(1, 1, 'image/png', 'photo.png', 1),
+			(2, 1, 'application/pdf', 'doc.pdf', 0);
 	`)
 	if err != nil {
 		t.Fatalf("Failed to insert test data: %v", err)
@@ -180,6 +182,9 @@ func TestGetConversation_WithAttachments(t *testing.T) {
 	if msg.Attachments[1].FileName != "doc.pdf" {
 		t.Errorf("Expected file_name 'doc.pdf', got %q", msg.Attachments[1].FileName)
 	}
+	if !msg.Attachments[0].IsSticker || msg.Attachments[1].IsSticker {
+		t.Errorf("Expected only the first attachment to be a sticker, got %+v", msg.Attachments)
+	}
 }
 
 func TestGetConversation_WithReactions(t *testing.T) {
@@ -229,6 +234,33 @@ func TestGetConversation_WithReactions(t *testing.T) {
 	}
 }
 
+func TestGetConversation_NoMessages(t *testing.T) {
+	db, cleanup := setupReaderTestDB(t)
+	defer cleanup()
+
+	_, err := db.Exec(`
+		INSERT INTO chats (id, chat_identifier) VALUES (1, 'chat-1');
+		INSERT INTO conversations (id, chat_id, start_time, end_time)
+		VALUES (1, 1, '2025-10-27 15:00:00', '2025-10-27 16:00:00');
+	`)
+	if err != nil {
+		t.Fatalf("Failed to insert test data: %v", err)
+	}
+
+	reader := NewConversationReader(db)
+	conv, err := reader.GetConversation(1)
+	if err != nil {
+		t.Fatalf("Failed to get conversation: %v", err)
+	}
+	if conv.ID != 1 || len(conv.Messages) != 0 {
+		t.Errorf("Expected conversation 1 with no messages, got ID %d with %d messages", conv.ID, len(conv.Messages))
+	}
+
+	if _, err := reader.GetConversation(2); !errors.Is(err, sql.ErrNoRows) {
+		t.Errorf("Expected sql.ErrNoRows for missing conversation, got %v", err)
+	}
+}
+
 func TestParseTimestamp(t *testing.T) {
 	tests := []struct {
 		input    string
@@ -1,11 +1,14 @@
 package encoding
 
 import (
+	"bufio"
 	"database/sql"
 	"fmt"
+	"io"
 	"os"
 	"path/filepath"
 	"sort"
+	"strconv"
 	"strings"
 	"time"
 
@@ -91,7 +94,29 @@ func LoadConversation(dbPath string, conversationID int) (*Conversation, error)
 	}
 	defer db.Close()
 
-	// Load conversation metadata from eve.db schema
+	conv, err := loadConversationHeader(db, conversationID)
+	if err != nil {
+		return nil, err
+	}
+
+	err = streamMessages(db, conversationID, func(msg *Message) error {
+		conv.Messages = append(conv.Messages, *msg)
+		return nil
+	})
+	if err != nil {
+		return nil, err
+	}
+
+	if len(conv.Messages) == 0 {
+		return nil, fmt.Errorf("no messages found for conversation %d", conversationID)
+	}
+
+	return conv, nil
+}
+
+// loadConversationHeader loads a conversation's metadata (eve.db schema)
+// without its messages.
+func loadConversationHeader(db *sql.DB, conversationID int) (*Conversation, error) {
 	var conv Conversation
 	var startTimeStr, endTimeStr string
 	convQuery := `
@@ -100,7 +125,7 @@ func LoadConversation(dbPath string, conversationID int) (*Conversation, error)
 		WHERE id = ?
 		LIMIT 1
 	`
-	err = db.QueryRow(convQuery, conversationID).Scan(
+	err := db.QueryRow(convQuery, conversationID).Scan(
 		&conv.ID,
 		&conv.ChatID,
 		&startTimeStr,
@@ -115,6 +140,22 @@ func LoadConversation(dbPath string, conversationID int) (*Conversation, error)
 
 	conv.StartTime, _ = time.Parse(time.RFC3339, startTimeStr)
 	conv.EndTime, _ = time.Parse(time.RFC3339, endTimeStr)
+	return &conv, nil
+}
+
+// streamMessages calls fn for each message of a conversation in timestamp
+// order. Attachments and reactions for the whole conversation are fetched up
+// front with one query each, so scanning the messages holds only the current
+// row and fn decides what to keep.
+func streamMessages(db *sql.DB, conversationID int, fn func(*Message) error) error {
+	attachments, err := loadConversationAttachments(db, conversationID)
+	if err != nil {
+		return err
+	}
+	reactions, err := loadConversationReactions(db, conversationID)
+	if err != nil {
+		return err
+	}
 
 	// Load messages for this conversation (eve.db schema)
 	msgQuery := `
@@ -133,7 +174,7 @@ func LoadConversation(dbPath string, conversationID int) (*Conversation, error)
 
 	rows, err := db.Query(msgQuery, conversationID)
 	if err != nil {
-		return nil, fmt.Errorf("failed to query messages: %w", err)
+		return fmt.Errorf("failed to query messages: %w", err)
 	}
 	defer rows.Close()
 
@@ -151,104 +192,118 @@ func LoadConversation(dbPath string, conversationID int) (*Conversation, error)
 			&isFromMe,
 		)
 		if err != nil {
-			return nil, fmt.Errorf("failed to scan message: %w", err)
+			return fmt.Errorf("failed to scan message: %w", err)
 		}
 
 		msg.IsFromMe = isFromMe == 1
 		msg.Timestamp, _ = time.Parse(time.RFC3339, timestampStr)
+		msg.Attachments = attachments[msg.ID]
+		if msg.GUID != "" {
+			msg.Reactions = reactions[msg.GUID]
+		}
 
-		// Load attachments for this message
-		msg.Attachments = loadAttachments(db, msg.ID)
-
-		// Load reactions for this message
-		msg.Reactions = loadReactions(db, msg.GUID)
-
-		conv.Messages = append(conv.Messages, msg)
+		if err := fn(&msg); err != nil {
+			return err
+		}
 	}
 
 	if err := rows.Err(); err != nil {
-		return nil, fmt.Errorf("row iteration error: %w", err)
+		return fmt.Errorf("row iteration error: %w", err)
 	}
-
-	if len(conv.Messages) == 0 {
-		return nil, fmt.Errorf("no messages found for conversation %d", conversationID)
-	}
-
-	return &conv, nil
+	return nil
 }
 
-// loadAttachments loads attachments for a message from eve.db
-func loadAttachments(db *sql.DB, messageID int) []Attachment {
+// loadConversationAttachments loads the attachments of every message in a
+// conversation from eve.db, keyed by message ID.
+func loadConversationAttachments(db *sql.DB, conversationID int) (map[int][]Attachment, error) {
 	query := `
-		SELECT id, COALESCE(mime_type, ''), COALESCE(file_name, ''), COALESCE(is_sticker, 0)
-		FROM attachments
-		WHERE message_id = ?
+		SELECT a.message_id, a.id, COALESCE(a.mime_type, ''), COALESCE(a.file_name, ''), COALESCE(a.is_sticker, 0)
+		FROM attachments a
+		JOIN messages m ON m.id = a.message_id
+		WHERE m.conversation_id = ?
+		ORDER BY a.message_id, a.id
 	`
-	rows, err := db.Query(query, messageID)
+	rows, err := db.Query(query, conversationID)
 	if err != nil {
-		return nil
+		return nil, fmt.Errorf("failed to query attachments: %w", err)
 	}
 	defer rows.Close()
 
-	var attachments []Attachment
+	attachments := make(map[int][]Attachment)
 	for rows.Next() {
+		var messageID int
 		var att Attachment
 		var isSticker int
-		if err := rows.Scan(&att.ID, &att.MimeType, &att.FileName, &isSticker); err != nil {
-			continue
+		if err := rows.Scan(&messageID, &att.ID, &att.MimeType, &att.FileName, &isSticker); err != nil {
+			return nil, fmt.Errorf("failed to scan attachment: %w", err)
 		}
 		att.IsSticker = isSticker == 1
-		attachments = append(attachments, att)
+		attachments[messageID] = append(attachments[messageID], att)
 	}
-	return attachments
+	return attachments, rows.Err()
 }
 
-// loadReactions loads reactions for a message from eve.db
-func loadReactions(db *sql.DB, messageGUID string) []Reaction {
-	if messageGUID == "" {
-		return nil
-	}
+// loadConversationReactions loads the reactions to every message in a
+// conversation from eve.db, keyed by the reacted-to message GUID.
+func loadConversationReactions(db *sql.DB, conversationID int) (map[string][]Reaction, error) {
 	query := `
 		SELECT
+			r.original_message_guid,
 			r.reaction_type,
 			COALESCE(c.name, 'Unknown') as sender_name,
 			COALESCE(c.is_me, 0) as is_from_me
 		FROM reactions r
+		JOIN messages m ON m.guid = r.original_message_guid
 		LEFT JOIN contacts c ON r.sender_id = c.id
-		WHERE r.original_message_guid = ?
+		WHERE m.conversation_id = ? AND m.guid != ''
 	`
-	rows, err := db.Query(query, messageGUID)
+	rows, err := db.Query(query, conversationID)
 	if err != nil {
-		return nil
+		return nil, fmt.Errorf("failed to query reactions: %w", err)
 	}
 	defer rows.Close()
 
-	var reactions []Reaction
+	reactions := make(map[string][]Reaction)
 	for rows.Next() {
+		var guid string
 		var r Reaction
 		var isFromMe int
-		if err := rows.Scan(&r.ReactionType, &r.SenderName, &isFromMe); err != nil {
-			continue
+		if err := rows.Scan(&guid, &r.ReactionType, &r.SenderName, &isFromMe); err != nil {
+			return nil, fmt.Errorf("failed to scan reaction: %w", err)
 		}
 		r.IsFromMe = isFromMe == 1
-		reactions = append(reactions, r)
+		reactions[guid] = append(reactions[guid], r)
 	}
-	return reactions
+	return reactions, rows.Err()
 }
 
 // EncodeMessage encodes a single message into text format
 func EncodeMessage(msg Message, opts EncodeOptions) string {
-	var parts []string
+	return string(appendMessage(nil, &msg, opts))
+}
+
+// appendMessage appends the encoded form of msg to dst, space-separating its
+// parts, and returns the extended buffer.
+func appendMessage(dst []byte, msg *Message, opts EncodeOptions) []byte {
+	start := len(dst)
+	sep := func() {
+		if len(dst) > start {
+			dst = append(dst, ' ')
+		}
+	}
 
 	// Add timestamp if requested
 	if opts.IncludeSendTime {
-		timeStr := msg.Timestamp.Format("3:04pm")
-		parts = append(parts, fmt.Sprintf("[%s]", timeStr))
+		dst = append(dst, '[')
+		dst = msg.Timestamp.AppendFormat(dst, "3:04pm")
+		dst = append(dst, ']')
 	}
 
 	// Add sender name
 	if opts.IncludeSender {
-		parts = append(parts, fmt.Sprintf("%s:", msg.SenderName))
+		sep()
+		dst = append(dst, msg.SenderName...)
+		dst = append(dst, ':')
 	}
 
 	// Add message text (prefer Content, fall back to Text for compatibility)
@@ -257,127 +312,168 @@ func EncodeMessage(msg Message, opts EncodeOptions) string {
 		text = msg.Text
 	}
 	if text != "" {
-		parts = append(parts, text)
+		sep()
+		dst = append(dst, text...)
 	}
 
 	// Add attachments
-	if opts.IncludeAttachments && len(msg.Attachments) > 0 {
+	if opts.IncludeAttachments {
 		for _, att := range msg.Attachments {
+			sep()
 			if strings.HasPrefix(att.MimeType, "image/") {
-				parts = append(parts, "[Image]")
-			} else {
-				fileName := att.FileName
-				if fileName == "" {
-					fileName = "Unknown file"
-				}
-				parts = append(parts, fmt.Sprintf("[Attachment: %s]", fileName))
+				dst = append(dst, "[Image]"...)
+				continue
+			}
+			fileName := att.FileName
+			if fileName == "" {
+				fileName = "Unknown file"
 			}
+			dst = append(dst, "[Attachment: "...)
+			dst = append(dst, fileName...)
+			dst = append(dst, ']')
 		}
 	}
 
-	// Add reactions
+	// Add reactions, counted per emoji in reactionEmojis order
 	if opts.IncludeReactions && len(msg.Reactions) > 0 {
-		reactionCounts := make(map[string]int)
+		var counts [len(reactionEmojis)]int
+		total := 0
 		for _, r := range msg.Reactions {
-			emoji := reactionTypeToEmoji(r.ReactionType)
-			if emoji != "" {
-				reactionCounts[emoji]++
+			if i := r.ReactionType - reactionTypeBase; i >= 0 && i < len(reactionEmojis) {
+				counts[i]++
+				total++
 			}
 		}
 
-		if len(reactionCounts) > 0 {
-			var reactionParts []string
-			for emoji, count := range reactionCounts {
+		if total > 0 {
+			sep()
+			dst = append(dst, '[')
+			first := true
+			for i, count := range counts {
+				if count == 0 {
+					continue
+				}
+				if !first {
+					dst = append(dst, ", "...)
+				}
+				first = false
+				dst = append(dst, reactionEmojis[i]...)
 				if count > 1 {
-					reactionParts = append(reactionParts, fmt.Sprintf("%s(%d)", emoji, count))
-				} else {
-					reactionParts = append(reactionParts, emoji)
+					dst = append(dst, '(')
+					dst = strconv.AppendInt(dst, int64(count), 10)
+					dst = append(dst, ')')
 				}
 			}
-			parts = append(parts, fmt.Sprintf("[%s]", strings.Join(reactionParts, ", ")))
+			dst = append(dst, ']')
 		}
 	}
 
-	return strings.Join(parts, " ")
+	return dst
 }
 
 // EncodeConversation encodes a conversation into text format
 func EncodeConversation(conv *Conversation, opts EncodeOptions) string {
-	var lines []string
-
-	// Sort messages by timestamp (should already be sorted, but ensure it)
-	messages := make([]Message, len(conv.Messages))
-	copy(messages, conv.Messages)
-	sort.Slice(messages, func(i, j int) bool {
+	// Sort messages by timestamp. They normally arrive sorted, in which case
+	// the caller's slice is used as-is instead of being copied.
+	messages := conv.Messages
+	byTime := func(i, j int) bool {
 		return messages[i].Timestamp.Before(messages[j].Timestamp)
-	})
+	}
+	if !sort.SliceIsSorted(messages, byTime) {
+		messages = make([]Message, len(conv.Messages))
+		copy(messages, conv.Messages)
+		sort.Slice(messages, byTime)
+	}
+
+	var b []byte
 
 	// Optional date header
 	if opts.IncludeStartDate && len(messages) > 0 {
-		startTime := messages[0].Timestamp
-		dateHeader := startTime.Format("Monday Jan 2, 2006 - 3:04pm")
-		lines = append(lines, fmt.Sprintf("=== %s ===", dateHeader))
+		b = append(b, "=== "...)
+		b = messages[0].Timestamp.AppendFormat(b, "Monday Jan 2, 2006 - 3:04pm")
+		b = append(b, " ==="...)
 	}
 
-	// Encode each message
-	for _, msg := range messages {
-		encodedMsg := EncodeMessage(msg, opts)
-		if encodedMsg != "" {
-			lines = append(lines, encodedMsg)
+	// Encode each message on its own line, skipping messages that encode empty
+	for i := range messages {
+		lineStart := len(b)
+		if lineStart > 0 {
+			b = append(b, '\n')
+		}
+		bodyStart := len(b)
+		if b = appendMessage(b, &messages[i], opts); len(b) == bodyStart {
+			b = b[:lineStart]
 		}
 	}
 
-	return strings.Join(lines, "\n")
+	return string(b)
 }
 
-// EncodeConversationToFile encodes a conversation and writes it to a file
+// EncodeConversationToFile encodes a conversation and writes it to a file.
+// The transcript is streamed into a temporary file next to outputPath and
+// renamed over it only once complete, so a failed encode leaves any existing
+// file untouched.
 func EncodeConversationToFile(dbPath string, conversationID int, outputPath string) EncodeResult {
-	// Load conversation
-	conv, err := LoadConversation(dbPath, conversationID)
+	f, err := os.CreateTemp(filepath.Dir(outputPath), "."+filepath.Base(outputPath)+".*.tmp")
 	if err != nil {
 		return EncodeResult{
 			Success: false,
-			Error:   fmt.Sprintf("failed to load conversation: %v", err),
+			Error:   fmt.Sprintf("failed to write file: %v", err),
 		}
 	}
-
-	// Encode conversation
-	opts := DefaultEncodeOptions()
-	encodedText := EncodeConversation(conv, opts)
-
-	// Write to file
-	if err := os.WriteFile(outputPath, []byte(encodedText), 0644); err != nil {
+	tmpPath := f.Name()
+
+	// Stream the transcript to disk one message at a time
+	w := bufio.NewWriter(f)
+	written, messageCount, err := encodeConversationTo(w, dbPath, conversationID, DefaultEncodeOptions())
+	if err == nil {
+		if err = w.Flush(); err != nil {
+			err = fmt.Errorf("failed to write file: %w", err)
+		}
+	}
+	if err == nil {
+		if err = f.Chmod(0644); err != nil {
+			err = fmt.Errorf("failed to write file: %w", err)
+		}
+	}
+	if closeErr := f.Close(); err == nil && closeErr != nil {
+		err = fmt.Errorf("failed to write file: %w", closeErr)
+	}
+	if err == nil {
+		if err = os.Rename(tmpPath, outputPath); err != nil {
+			err = fmt.Errorf("failed to write file: %w", err)
+		}
+	}
+	if err != nil {
+		os.Remove(tmpPath)
 		return EncodeResult{
 			Success: false,
-			Error:   fmt.Sprintf("failed to write file: %v", err),
+			Error:   err.Error(),
 		}
 	}
 
 	// Count tokens (rough estimate: ~4 chars per token)
-	tokenCount := len(encodedText) / 4
+	tokenCount := written / 4
 
 	return EncodeResult{
 		Success:      true,
 		FilePath:     outputPath,
 		TokenCount:   tokenCount,
-		MessageCount: len(conv.Messages),
+		MessageCount: messageCount,
 	}
 }
 
 // EncodeConversationToString encodes a conversation and returns it as a string
 func EncodeConversationToString(dbPath string, conversationID int) EncodeResult {
-	// Load conversation
-	conv, err := LoadConversation(dbPath, conversationID)
+	var b strings.Builder
+	_, messageCount, err := encodeConversationTo(&b, dbPath, conversationID, DefaultEncodeOptions())
 	if err != nil {
 		return EncodeResult{
 			Success: false,
-			Error:   fmt.Sprintf("failed to load conversation: %v", err),
+			Error:   err.Error(),
 		}
 	}
-
-	// Encode conversation
-	opts := DefaultEncodeOptions()
-	encodedText := EncodeConversation(conv, opts)
+	encodedText := b.String()
 
 	// Count tokens (rough estimate: ~4 chars per token)
 	tokenCount := len(encodedText) / 4
@@ -386,24 +482,84 @@ func EncodeConversationToString(dbPath string, conversationID int) EncodeResult
 		Success:      true,
 		EncodedText:  encodedText,
 		TokenCount:   tokenCount,
-		MessageCount: len(conv.Messages),
+		MessageCount: messageCount,
 	}
 }
 
+// encodeConversationTo loads a conversation from eve.db and writes its
+// transcript to w as messages are scanned, producing the same text as
+// EncodeConversation without holding the conversation's messages in memory.
+// It returns the number of bytes written and messages read.
+func encodeConversationTo(w io.Writer, dbPath string, conversationID int, opts EncodeOptions) (int, int, error) {
+	db, err := sql.Open("sqlite3", dbPath)
+	if err != nil {
+		return 0, 0, fmt.Errorf("failed to load conversation: failed to open database: %w", err)
+	}
+	defer db.Close()
+
+	if _, err := loadConversationHeader(db, conversationID); err != nil {
+		return 0, 0, fmt.Errorf("failed to load conversation: %w", err)
+	}
+
+	var buf []byte
+	var writeErr error
+	written, messageCount := 0, 0
+	err = streamMessages(db, conversationID, func(msg *Message) error {
+		buf = buf[:0]
+		if messageCount == 0 && opts.IncludeStartDate {
+			buf = append(buf, "=== "...)
+			buf = msg.Timestamp.AppendFormat(buf, "Monday Jan 2, 2006 - 3:04pm")
+			buf = append(buf, " ==="...)
+		}
+		messageCount++
+
+		lineStart := len(buf)
+		if written+lineStart > 0 {
+			buf = append(buf, '\n')
+		}
+		bodyStart := len(buf)
+		if buf = appendMessage(buf, msg, opts); len(buf) == bodyStart {
+			buf = buf[:lineStart]
+		}
+
+		n, err := w.Write(buf)
+		written += n
+		if err != nil {
+			writeErr = fmt.Errorf("failed to write file: %w", err)
+		}
+		return writeErr
+	})
+	if writeErr != nil {
+		return written, messageCount, writeErr
+	}
+	if err != nil {
+		return written, messageCount, fmt.Errorf("failed to load conversation: %w", err)
+	}
+	if messageCount == 0 {
+		return 0, 0, fmt.Errorf("failed to load conversation: no messages found for conversation %d", conversationID)
+	}
+	return written, messageCount, nil
+}
+
+// reactionTypeBase is the iMessage reaction type of the first entry in
+// reactionEmojis.
+const reactionTypeBase = 2000
+
+// reactionEmojis maps iMessage reaction types (from iMessage database),
+// offset by reactionTypeBase, to emoji.
+var reactionEmojis = [...]string{
+	"❤️", // 2000 Love
+	"👍",  // 2001 Like
+	"👎",  // 2002 Dislike
+	"😂",  // 2003 Laugh
+	"‼️", // 2004 Emphasize
+	"❓",  // 2005 Question
+}
+
 // reactionTypeToEmoji converts iMessage reaction types to emoji
 func reactionTypeToEmoji(reactionType int) string {
-	// iMessage reaction types (from iMessage database)
-	reactionMap := map[int]string{
-		2000: "❤️", // Love
-		2001: "👍",  // Like
-		2002: "👎",  // Dislike
-		2003: "😂",  // Laugh
-		2004: "‼️", // Emphasize
-		2005: "❓",  // Question
-	}
-
-	if emoji, ok := reactionMap[reactionType]; ok {
-		return emoji
+	if i := reactionType - reactionTypeBase; i >= 0 && i < len(reactionEmojis) {
+		return reactionEmojis[i]
 	}
 	return ""
 }
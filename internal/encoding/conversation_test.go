@@ -183,6 +183,29 @@ func TestEncodeMessageWithTime(t *testing.T) {
 	}
 }
 
+func TestEncodeMessageAttachmentsAndReactions(t *testing.T) {
+	msg := Message{
+		SenderName: "Alice",
+		Text:       "look",
+		Attachments: []Attachment{
+			{MimeType: "image/jpeg"},
+			{MimeType: "application/pdf", FileName: "doc.pdf"},
+		},
+		Reactions: []Reaction{
+			{ReactionType: 2003},
+			{ReactionType: 2000},
+			{ReactionType: 2003},
+			{ReactionType: 9999},
+		},
+	}
+
+	encoded := EncodeMessage(msg, DefaultEncodeOptions())
+	want := "Alice: look [Image] [Attachment: doc.pdf] [❤️, 😂(2)]"
+	if encoded != want {
+		t.Errorf("EncodeMessage() = %q, want %q", encoded, want)
+	}
+}
+
 func TestEncodeConversation(t *testing.T) {
 	conv := &Conversation{
 		ID:     1,
@@ -238,6 +261,12 @@ func TestEncodeConversationToFile(t *testing.T) {
 		t.Errorf("Expected MessageCount 3, got %d", result.MessageCount)
 	}
 
+	if info, err := os.Stat(outputPath); err != nil {
+		t.Errorf("Failed to stat output file: %v", err)
+	} else if info.Mode().Perm() != 0644 {
+		t.Errorf("Expected mode 0644, got %v", info.Mode().Perm())
+	}
+
 	// Check file exists
 	content, err := os.ReadFile(outputPath)
 	if err != nil {
@@ -260,6 +289,40 @@ func TestEncodeConversationToFile(t *testing.T) {
 	}
 }
 
+func TestEncodeConversationToFile_FailureKeepsExistingFile(t *testing.T) {
+	dbPath, _ := createTestDB(t)
+
+	dir := t.TempDir()
+	outputPath := filepath.Join(dir, "output.txt")
+	if err := os.WriteFile(outputPath, []byte("previous"), 0644); err != nil {
+		t.Fatalf("Failed to write existing file: %v", err)
+	}
+
+	result := EncodeConversationToFile(dbPath, 9999, outputPath)
+	if result.Success {
+		t.Fatal("Expected EncodeConversationToFile to fail for a missing conversation")
+	}
+	if !strings.HasPrefix(result.Error, "failed to load conversation:") {
+		t.Errorf("Expected a load error, got: %s", result.Error)
+	}
+
+	content, err := os.ReadFile(outputPath)
+	if err != nil {
+		t.Fatalf("Existing file was removed: %v", err)
+	}
+	if string(content) != "previous" {
+		t.Errorf("Existing file was modified: %q", content)
+	}
+
+	entries, err := os.ReadDir(dir)
+	if err != nil {
+		t.Fatalf("Failed to read output dir: %v", err)
+	}
+	if len(entries) != 1 {
+		t.Errorf("Expected only the existing file to remain, got %d entries", len(entries))
+	}
+}
+
 func TestEncodeConversationToString(t *testing.T) {
 	dbPath, conversationID := createTestDB(t)
 
@@ -306,3 +369,39 @@ func TestReactionTypeToEmoji(t *testing.T) {
 		})
 	}
 }
+
+func TestEncodeConversationToString_MatchesLoadedEncoding(t *testing.T) {
+	dbPath, conversationID := createTestDB(t)
+
+	db, err := sql.Open("sqlite3", dbPath)
+	if err != nil {
+		t.Fatalf("failed to open database: %v", err)
+	}
+	_, err = db.Exec(`
+		INSERT INTO attachments (id, message_id, mime_type, file_name) VALUES (1, 2, 'image/png', 'a.png');
+		INSERT INTO reactions (original_message_guid, reaction_type, sender_id) VALUES ('msg-2', 2000, 1);
+	`)
+	db.Close()
+	if err != nil {
+		t.Fatalf("failed to insert attachments and reactions: %v", err)
+	}
+
+	conv, err := LoadConversation(dbPath, conversationID)
+	if err != nil {
+		t.Fatalf("LoadConversation failed: %v", err)
+	}
+	if len(conv.Messages[1].Attachments) != 1 || len(conv.Messages[1].Reactions) != 1 {
+		t.Fatalf("expected one attachment and one reaction on msg-2, got %+v", conv.Messages[1])
+	}
+
+	result := EncodeConversationToString(dbPath, conversationID)
+	if !result.Success {
+		t.Fatalf("EncodeConversationToString failed: %s", result.Error)
+	}
+	if want := EncodeConversation(conv, DefaultEncodeOptions()); result.EncodedText != want {
+		t.Errorf("streamed encoding = %q, want %q", result.EncodedText, want)
+	}
+	if result.MessageCount != 3 {
+		t.Errorf("Expected MessageCount 3, got %d", result.MessageCount)
+	}
+}
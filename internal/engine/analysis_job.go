@@ -1,6 +1,7 @@
 package engine
 
 import (
+	"bytes"
 	"context"
 	"database/sql"
 	"encoding/json"
@@ -30,6 +31,11 @@ type AnalysisJobHandler struct {
 	model        string
 	metrics      *AnalysisMetrics
 	writer       *TxBatchWriter
+	contacts     *contactNameCache
+	reader       *db.ConversationReader
+
+	stmtsOnce sync.Once
+	stmts     map[string]*sql.Stmt
 }
 
 // NewAnalysisJobHandler creates a new analysis job handler
@@ -50,6 +56,8 @@ func NewAnalysisJobHandlerWithPipeline(warehouseDB *sql.DB, geminiClient *gemini
 		model:        model,
 		metrics:      metrics,
 		writer:       writer,
+		contacts:     newContactNameCache(contactNameCacheTTL, contactNameCacheMax),
+		reader:       db.NewConversationReader(warehouseDB),
 	}
 	return func(ctx context.Context, job *queue.Job) error {
 		return h.handleJob(ctx, job.PayloadJSON)
@@ -91,11 +99,14 @@ func (h *AnalysisJobHandler) handleJob(ctx context.Context, payloadJSON string)
 	if payload.EvePromptID == "" {
 		payload.EvePromptID = "convo-all-v1"
 	}
+	prompt, ok := analysisPrompts[payload.EvePromptID]
+	if !ok {
+		return fmt.Errorf("unsupported eve_prompt_id: %s", payload.EvePromptID)
+	}
 
 	// Read conversation from database
-	reader := db.NewConversationReader(h.warehouseDB)
 	t0 := time.Now()
-	conversation, err := reader.GetConversation(payload.ConversationID)
+	conversation, err := h.reader.GetConversation(payload.ConversationID)
 	if err != nil {
 		return fmt.Errorf("failed to read conversation: %w", err)
 	}
@@ -108,17 +119,11 @@ func (h *AnalysisJobHandler) handleJob(ctx context.Context, payloadJSON string)
 	encodeDur = time.Since(t1)
 
 	// Build prompt (full quality: all messages, no truncation, no output caps)
-	var promptText string
-	switch payload.EvePromptID {
-	case "convo-all-v1":
-		t2 := time.Now()
-		promptText, err = buildConvoAllV1Prompt(encodedText)
-		promptDur = time.Since(t2)
-		if err != nil {
-			return fmt.Errorf("failed to build prompt %q: %w", payload.EvePromptID, err)
-		}
-	default:
-		return fmt.Errorf("unsupported eve_prompt_id: %s", payload.EvePromptID)
+	t2 := time.Now()
+	promptText, err := prompt.build(encodedText)
+	promptDur = time.Since(t2)
+	if err != nil {
+		return fmt.Errorf("failed to build prompt %q: %w", payload.EvePromptID, err)
 	}
 
 	// Build Gemini request
@@ -132,20 +137,8 @@ func (h *AnalysisJobHandler) handleJob(ctx context.Context, payloadJSON string)
 			},
 		},
 	}
-	// Reduce safety-related empty outputs for benign classification/extraction tasks.
-	req.SafetySettings = []gemini.SafetySetting{
-		{Category: "HARM_CATEGORY_HARASSMENT", Threshold: "BLOCK_NONE"},
-		{Category: "HARM_CATEGORY_HATE_SPEECH", Threshold: "BLOCK_NONE"},
-		{Category: "HARM_CATEGORY_SEXUALLY_EXPLICIT", Threshold: "BLOCK_NONE"},
-		{Category: "HARM_CATEGORY_DANGEROUS_CONTENT", Threshold: "BLOCK_NONE"},
-	}
-	// Force JSON output matching convo-all-v1 schema (improves correctness + throughput).
-	// This workload is structured extraction, not deep reasoning; minimize thinking to maximize throughput.
-	req.GenerationConfig = &gemini.GenerationConfig{
-		ThinkingConfig:   &gemini.ThinkingConfig{ThinkingLevel: "minimal"},
-		ResponseMimeType: "application/json",
-		ResponseSchema:   convoAllV1ResponseSchema,
-	}
+	req.SafetySettings = analysisSafetySettings
+	req.GenerationConfig = prompt.config
 
 	// Call Gemini for analysis
 	t3 := time.Now()
@@ -173,22 +166,17 @@ func (h *AnalysisJobHandler) handleJob(ctx context.Context, payloadJSON string)
 	}
 
 	// Parse structured output and persist
-	switch payload.EvePromptID {
-	case "convo-all-v1":
-		t4 := time.Now()
-		parsed, err := parseConvoAllV1Output(outputText)
-		parseDur = time.Since(t4)
-		if err != nil {
-			return fmt.Errorf("failed to parse convo-all-v1 JSON: %w", err)
-		}
-		tw := time.Now()
-		if err := h.persistConvoAllV1(ctx, payload.ConversationID, conversation.ChatID, payload.EvePromptID, parsed, resp); err != nil {
-			return fmt.Errorf("failed to persist analysis: %w", err)
-		}
-		dbWriteDur = time.Since(tw)
-	default:
-		return fmt.Errorf("unsupported eve_prompt_id: %s", payload.EvePromptID)
+	t4 := time.Now()
+	parsed, err := prompt.parse(outputText)
+	parseDur = time.Since(t4)
+	if err != nil {
+		return fmt.Errorf("failed to parse %s JSON: %w", payload.EvePromptID, err)
+	}
+	tw := time.Now()
+	if err := h.persistAnalysis(ctx, payload.ConversationID, conversation.ChatID, payload.EvePromptID, parsed, resp); err != nil {
+		return fmt.Errorf("failed to persist analysis: %w", err)
 	}
+	dbWriteDur = time.Since(tw)
 
 	outcome = "ok"
 	return nil
@@ -267,10 +255,9 @@ func (n *convoAllV1NameItem) UnmarshalJSON(b []byte) error {
 	// Accept either:
 	// - {"name": "..."} (preferred)
 	// - "..." (common model fallback)
-	var s string
-	if err := json.Unmarshal(b, &s); err == nil {
-		n.Name = s
-		return nil
+	// Dispatch on the first byte so each item is decoded once.
+	if isJSONString(b) {
+		return json.Unmarshal(b, &n.Name)
 	}
 	type obj convoAllV1NameItem
 	var o obj
@@ -289,10 +276,8 @@ func (m *convoAllV1HumorItem) UnmarshalJSON(b []byte) error {
 	// Accept either:
 	// - {"message": "..."} (preferred)
 	// - "..." (common model fallback)
-	var s string
-	if err := json.Unmarshal(b, &s); err == nil {
-		m.Message = s
-		return nil
+	if isJSONString(b) {
+		return json.Unmarshal(b, &m.Message)
 	}
 	type obj convoAllV1HumorItem
 	var o obj
@@ -303,6 +288,12 @@ func (m *convoAllV1HumorItem) UnmarshalJSON(b []byte) error {
 	return nil
 }
 
+// isJSONString reports whether a raw JSON value is a string literal.
+func isJSONString(b []byte) bool {
+	b = bytes.TrimLeft(b, " \t\r\n")
+	return len(b) > 0 && b[0] == '"'
+}
+
 // extractTextFromResponse extracts the text content from Gemini response
 func extractTextFromResponse(resp *gemini.GenerateContentResponse) string {
 	if resp == nil || len(resp.Candidates) == 0 {
@@ -320,6 +311,35 @@ func extractTextFromResponse(resp *gemini.GenerateContentResponse) string {
 	return ""
 }
 
+// analysisPrompt bundles everything handleJob needs for one eve_prompt_id, so
+// the prompt is resolved once per job instead of switched on at each stage.
+type analysisPrompt struct {
+	build  func(conversationText string) (string, error)
+	config *gemini.GenerationConfig
+	parse  func(outputText string) (analysisOutput, error)
+}
+
+// analysisOutput is a parsed model response that can write itself to the
+// warehouse inside the analysis write transaction.
+type analysisOutput interface {
+	apply(h *AnalysisJobHandler, tx *sql.Tx, conversationID int, chatID int, evePromptID string, resultJSON string) error
+}
+
+// analysisPrompts maps each supported eve_prompt_id to its prompt.
+var analysisPrompts = map[string]analysisPrompt{
+	"convo-all-v1": {
+		build:  buildConvoAllV1Prompt,
+		config: convoAllV1GenerationConfig,
+		parse: func(outputText string) (analysisOutput, error) {
+			parsed, err := parseConvoAllV1Output(outputText)
+			if err != nil {
+				return nil, err
+			}
+			return parsed, nil
+		},
+	},
+}
+
 func buildConvoAllV1Prompt(conversationText string) (string, error) {
 	promptTemplate, err := getConvoAllV1PromptBody()
 	if err != nil {
@@ -371,6 +391,25 @@ func getConvoAllV1PromptBody() (string, error) {
 	return convoAllV1PromptBody, convoAllV1PromptErr
 }
 
+// analysisSafetySettings and convoAllV1GenerationConfig are identical for
+// every job, so they are built once and shared; requests only read them.
+var (
+	// Reduce safety-related empty outputs for benign classification/extraction tasks.
+	analysisSafetySettings = []gemini.SafetySetting{
+		{Category: "HARM_CATEGORY_HARASSMENT", Threshold: "BLOCK_NONE"},
+		{Category: "HARM_CATEGORY_HATE_SPEECH", Threshold: "BLOCK_NONE"},
+		{Category: "HARM_CATEGORY_SEXUALLY_EXPLICIT", Threshold: "BLOCK_NONE"},
+		{Category: "HARM_CATEGORY_DANGEROUS_CONTENT", Threshold: "BLOCK_NONE"},
+	}
+	// Force JSON output matching convo-all-v1 schema (improves correctness + throughput).
+	// This workload is structured extraction, not deep reasoning; minimize thinking to maximize throughput.
+	convoAllV1GenerationConfig = &gemini.GenerationConfig{
+		ThinkingConfig:   &gemini.ThinkingConfig{ThinkingLevel: "minimal"},
+		ResponseMimeType: "application/json",
+		ResponseSchema:   convoAllV1ResponseSchema,
+	}
+)
+
 // convoAllV1ResponseSchema is a Gemini "Schema" (not full JSON Schema).
 // It intentionally avoids unsupported JSON Schema fields like additionalProperties.
 var convoAllV1ResponseSchema = map[string]any{
@@ -494,6 +533,16 @@ func readPromptBody(path string) (string, error) {
 }
 
 func parseConvoAllV1Output(outputText string) (*convoAllV1Output, error) {
+	// Fast path: with JSON response mode the model output is almost always a
+	// bare object, so decode it directly and only fall back to fence/prose
+	// stripping when that fails.
+	if s := strings.TrimSpace(outputText); strings.HasPrefix(s, "{") {
+		var out convoAllV1Output
+		if err := json.Unmarshal([]byte(s), &out); err == nil {
+			return &out, nil
+		}
+	}
+
 	jsonText, err := extractJSONObject(outputText)
 	if err != nil {
 		return nil, err
@@ -529,37 +578,44 @@ func extractJSONObject(text string) (string, error) {
 	return s[start : end+1], nil
 }
 
-func (h *AnalysisJobHandler) persistConvoAllV1(ctx context.Context, conversationID int, chatID int, evePromptID string, parsed *convoAllV1Output, resp *gemini.GenerateContentResponse) error {
-	resultJSON, err := json.Marshal(resp)
-	if err != nil {
-		return fmt.Errorf("failed to marshal result: %w", err)
+// responseJSON returns the JSON stored as a completion's result. The body the
+// client received is compacted and stored as is; re-marshaling the decoded
+// response is only needed for responses built in process.
+func responseJSON(resp *gemini.GenerateContentResponse) ([]byte, error) {
+	if len(resp.Raw) > 0 {
+		var buf bytes.Buffer
+		buf.Grow(len(resp.Raw))
+		if err := json.Compact(&buf, resp.Raw); err == nil {
+			return buf.Bytes(), nil
+		}
 	}
+	return json.Marshal(resp)
+}
 
-	apply := func(tx *sql.Tx) error {
-		return h.applyConvoAllV1Tx(tx, conversationID, chatID, evePromptID, parsed, string(resultJSON))
-	}
-	if h.writer != nil {
-		return h.writer.Submit(ctx, apply)
-	}
-	tx, err := h.warehouseDB.Begin()
+func (h *AnalysisJobHandler) persistAnalysis(ctx context.Context, conversationID int, chatID int, evePromptID string, parsed analysisOutput, resp *gemini.GenerateContentResponse) error {
+	resultJSON, err := responseJSON(resp)
 	if err != nil {
-		return fmt.Errorf("failed to begin transaction: %w", err)
-	}
-	defer tx.Rollback()
-	if err := apply(tx); err != nil {
-		return err
+		return fmt.Errorf("failed to marshal result: %w", err)
 	}
-	return tx.Commit()
+	return h.write(ctx, func(tx *sql.Tx) error {
+		return parsed.apply(h, tx, conversationID, chatID, evePromptID, string(resultJSON))
+	})
 }
 
 func (h *AnalysisJobHandler) persistBlockedAnalysis(ctx context.Context, conversationID int, chatID int, evePromptID string, resp *gemini.GenerateContentResponse, blockReason string, blockReasonMessage string) error {
-	resultJSON, err := json.Marshal(resp)
+	resultJSON, err := responseJSON(resp)
 	if err != nil {
 		return fmt.Errorf("failed to marshal result: %w", err)
 	}
-	apply := func(tx *sql.Tx) error {
+	return h.write(ctx, func(tx *sql.Tx) error {
 		return h.applyBlockedTx(tx, conversationID, evePromptID, string(resultJSON), blockReason, blockReasonMessage)
-	}
+	})
+}
+
+// write runs apply in a warehouse transaction, through the batch writer when
+// one is configured.
+func (h *AnalysisJobHandler) write(ctx context.Context, apply func(tx *sql.Tx) error) error {
+	h.prepareWriteStmts()
 	if h.writer != nil {
 		return h.writer.Submit(ctx, apply)
 	}
@@ -574,81 +630,163 @@ func (h *AnalysisJobHandler) persistBlockedAnalysis(ctx context.Context, convers
 	return tx.Commit()
 }
 
+// facetDeleteStmts clears a conversation's analysis facets; built once rather
+// than formatted per table on every write.
+var facetDeleteStmts = func() []struct{ table, sql string } {
+	tables := []string{"entities", "topics", "emotions", "humor_items"}
+	stmts := make([]struct{ table, sql string }, len(tables))
+	for i, table := range tables {
+		stmts[i].table = table
+		stmts[i].sql = "DELETE FROM " + table + " WHERE conversation_id = ?"
+	}
+	return stmts
+}()
+
+const insertCompletionSQL = `
+	INSERT INTO completions (conversation_id, model, result, created_at)
+	VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+	RETURNING id
+`
+
+const updateConversationSummarySQL = `UPDATE conversations SET summary = ? WHERE id = ?`
+
+// upsertAnalysisCompletedSQL and upsertAnalysisBlockedSQL keep the single row
+// for a (conversation, prompt) pair so reruns are idempotent.
+const upsertAnalysisCompletedSQL = `
+	INSERT INTO conversation_analyses (
+		conversation_id, eve_prompt_id, status, completion_id, created_at, updated_at
+	) VALUES (?, ?, 'completed', ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+	ON CONFLICT(conversation_id, eve_prompt_id) DO UPDATE SET
+		status = excluded.status,
+		completion_id = excluded.completion_id,
+		error_message = NULL,
+		retry_count = 0,
+		blocked_reason = NULL,
+		blocked_reason_message = NULL,
+		blocked_at = NULL,
+		updated_at = excluded.updated_at
+`
+
+const upsertAnalysisBlockedSQL = `
+	INSERT INTO conversation_analyses (
+		conversation_id, eve_prompt_id, status, completion_id,
+		blocked_reason, blocked_reason_message, blocked_at,
+		created_at, updated_at
+	) VALUES (?, ?, 'blocked', ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+	ON CONFLICT(conversation_id, eve_prompt_id) DO UPDATE SET
+		status = excluded.status,
+		completion_id = excluded.completion_id,
+		error_message = NULL,
+		retry_count = 0,
+		blocked_reason = excluded.blocked_reason,
+		blocked_reason_message = excluded.blocked_reason_message,
+		blocked_at = excluded.blocked_at,
+		updated_at = excluded.updated_at
+`
+
+const (
+	contactIDByNameSQL     = `SELECT id FROM contacts WHERE name = ? LIMIT 1`
+	contactIDByNicknameSQL = `SELECT id FROM contacts WHERE nickname = ? LIMIT 1`
+)
+
+// prepareWriteStmts prepares the fixed analysis write statements once per
+// handler so every job reuses them instead of SQLite recompiling the same SQL
+// on each write. It runs before a write transaction is opened, so preparing
+// never waits on a pool connection held by the caller. Statements that fail to
+// prepare are left out and executed as plain SQL.
+func (h *AnalysisJobHandler) prepareWriteStmts() {
+	h.stmtsOnce.Do(func() {
+		if h.warehouseDB == nil {
+			return
+		}
+		queries := []string{
+			insertCompletionSQL,
+			updateConversationSummarySQL,
+			upsertAnalysisCompletedSQL,
+			upsertAnalysisBlockedSQL,
+			contactIDByNameSQL,
+			contactIDByNicknameSQL,
+		}
+		for _, del := range facetDeleteStmts {
+			queries = append(queries, del.sql)
+		}
+		stmts := make(map[string]*sql.Stmt, len(queries))
+		for _, q := range queries {
+			stmt, err := h.warehouseDB.Prepare(q)
+			if err != nil {
+				continue
+			}
+			stmts[q] = stmt
+		}
+		h.stmts = stmts
+	})
+}
+
+// txExec runs query in tx through its prepared statement when one exists.
+func (h *AnalysisJobHandler) txExec(tx *sql.Tx, query string, args ...interface{}) (sql.Result, error) {
+	if stmt, ok := h.stmts[query]; ok {
+		return tx.Stmt(stmt).Exec(args...)
+	}
+	return tx.Exec(query, args...)
+}
+
+// txQueryRow is the QueryRow counterpart of txExec.
+func (h *AnalysisJobHandler) txQueryRow(tx *sql.Tx, query string, args ...interface{}) *sql.Row {
+	if stmt, ok := h.stmts[query]; ok {
+		return tx.Stmt(stmt).QueryRow(args...)
+	}
+	return tx.QueryRow(query, args...)
+}
+
 func (h *AnalysisJobHandler) applyBlockedTx(tx *sql.Tx, conversationID int, evePromptID string, resultJSON string, blockReason string, blockReasonMessage string) error {
 	// Insert completion (even though there's no output, we keep promptFeedback metadata)
 	var completionID int64
-	err := tx.QueryRow(`
-		INSERT INTO completions (conversation_id, model, result, created_at)
-		VALUES (?, ?, ?, ?)
-		RETURNING id
-	`, conversationID, h.model, resultJSON, time.Now()).Scan(&completionID)
+	err := h.txQueryRow(tx, insertCompletionSQL, conversationID, h.model, resultJSON).Scan(&completionID)
 	if err != nil {
 		return fmt.Errorf("failed to insert completion: %w", err)
 	}
 
-	// Ensure idempotency for this prompt by replacing any existing row(s).
-	if _, err := tx.Exec(`DELETE FROM conversation_analyses WHERE conversation_id = ? AND eve_prompt_id = ?`, conversationID, evePromptID); err != nil {
-		return fmt.Errorf("failed to clear previous conversation_analyses row: %w", err)
-	}
-
-	if _, err := tx.Exec(`
-		INSERT INTO conversation_analyses (
-			conversation_id, eve_prompt_id, status, completion_id,
-			blocked_reason, blocked_reason_message, blocked_at,
-			created_at, updated_at
-		) VALUES (?, ?, 'blocked', ?, ?, ?, ?, ?, ?)
-	`, conversationID, evePromptID, completionID,
-		blockReason, blockReasonMessage, time.Now(),
-		time.Now(), time.Now(),
-	); err != nil {
-		return fmt.Errorf("failed to insert blocked conversation_analyses: %w", err)
+	if _, err := h.txExec(tx, upsertAnalysisBlockedSQL, conversationID, evePromptID, completionID, blockReason, blockReasonMessage); err != nil {
+		return fmt.Errorf("failed to upsert blocked conversation_analyses: %w", err)
 	}
 
 	// Clear any prior facets so the DB doesn't look "analyzed".
-	for _, table := range []string{"entities", "topics", "emotions", "humor_items"} {
-		if _, err := tx.Exec(fmt.Sprintf("DELETE FROM %s WHERE conversation_id = ?", table), conversationID); err != nil {
-			return fmt.Errorf("failed to clear %s for conversation: %w", table, err)
+	for _, del := range facetDeleteStmts {
+		if _, err := h.txExec(tx, del.sql, conversationID); err != nil {
+			return fmt.Errorf("failed to clear %s for conversation: %w", del.table, err)
 		}
 	}
 
 	return nil
 }
 
+func (o *convoAllV1Output) apply(h *AnalysisJobHandler, tx *sql.Tx, conversationID int, chatID int, evePromptID string, resultJSON string) error {
+	return h.applyConvoAllV1Tx(tx, conversationID, chatID, evePromptID, o, resultJSON)
+}
+
 func (h *AnalysisJobHandler) applyConvoAllV1Tx(tx *sql.Tx, conversationID int, chatID int, evePromptID string, parsed *convoAllV1Output, resultJSON string) error {
 	// Insert completion
 	var completionID int64
-	err := tx.QueryRow(`
-		INSERT INTO completions (conversation_id, model, result, created_at)
-		VALUES (?, ?, ?, ?)
-		RETURNING id
-	`, conversationID, h.model, resultJSON, time.Now()).Scan(&completionID)
+	err := h.txQueryRow(tx, insertCompletionSQL, conversationID, h.model, resultJSON).Scan(&completionID)
 	if err != nil {
 		return fmt.Errorf("failed to insert completion: %w", err)
 	}
 
 	// Update conversation summary
 	if parsed.Summary != "" {
-		if _, err := tx.Exec(`UPDATE conversations SET summary = ? WHERE id = ?`, parsed.Summary, conversationID); err != nil {
+		if _, err := h.txExec(tx, updateConversationSummarySQL, parsed.Summary, conversationID); err != nil {
 			return fmt.Errorf("failed to update conversation summary: %w", err)
 		}
 	}
 
-	// Ensure idempotency for this prompt by replacing any existing row(s).
-	if _, err := tx.Exec(`DELETE FROM conversation_analyses WHERE conversation_id = ? AND eve_prompt_id = ?`, conversationID, evePromptID); err != nil {
-		return fmt.Errorf("failed to clear previous conversation_analyses row: %w", err)
-	}
-	if _, err := tx.Exec(`
-		INSERT INTO conversation_analyses (
-			conversation_id, eve_prompt_id, status, completion_id, created_at, updated_at
-		) VALUES (?, ?, 'completed', ?, ?, ?)
-	`, conversationID, evePromptID, completionID, time.Now(), time.Now()); err != nil {
-		return fmt.Errorf("failed to insert conversation_analyses: %w", err)
+	if _, err := h.txExec(tx, upsertAnalysisCompletedSQL, conversationID, evePromptID, completionID); err != nil {
+		return fmt.Errorf("failed to upsert conversation_analyses: %w", err)
 	}
 
 	// Replace facets for this conversation (full refresh).
-	for _, table := range []string{"entities", "topics", "emotions", "humor_items"} {
-		if _, err := tx.Exec(fmt.Sprintf("DELETE FROM %s WHERE conversation_id = ?", table), conversationID); err != nil {
-			return fmt.Errorf("failed to clear %s for conversation: %w", table, err)
+	for _, del := range facetDeleteStmts {
+		if _, err := h.txExec(tx, del.sql, conversationID); err != nil {
+			return fmt.Errorf("failed to clear %s for conversation: %w", del.table, err)
 		}
 	}
 
@@ -660,19 +798,23 @@ func (h *AnalysisJobHandler) applyConvoAllV1Tx(tx *sql.Tx, conversationID int, c
 		if v, ok := contactIDs[name]; ok {
 			return v, nil
 		}
+		now := time.Now()
+		if v, ok := h.contacts.get(name, now); ok {
+			contactIDs[name] = v
+			return v, nil
+		}
 
 		var id int64
+		var found *int64
 		// First try exact name match, then nickname.
-		if err := tx.QueryRow(`SELECT id FROM contacts WHERE name = ? LIMIT 1`, name).Scan(&id); err == nil {
-			contactIDs[name] = &id
-			return &id, nil
-		}
-		if err := tx.QueryRow(`SELECT id FROM contacts WHERE nickname = ? LIMIT 1`, name).Scan(&id); err == nil {
-			contactIDs[name] = &id
-			return &id, nil
+		if err := h.txQueryRow(tx, contactIDByNameSQL, name).Scan(&id); err == nil {
+			found = &id
+		} else if err := h.txQueryRow(tx, contactIDByNicknameSQL, name).Scan(&id); err == nil {
+			found = &id
 		}
-		contactIDs[name] = nil
-		return nil, nil
+		contactIDs[name] = found
+		h.contacts.put(name, found, now)
+		return found, nil
 	}
 
 	// Multi-row inserts (chunked) for facets to reduce per-row statement overhead.
@@ -690,7 +832,7 @@ func (h *AnalysisJobHandler) applyConvoAllV1Tx(tx *sql.Tx, conversationID int, c
 			entityRows = append(entityRows, []interface{}{conversationID, chatID, contactID, title})
 		}
 	}
-	if err := execInsertOrIgnoreMany(tx, "entities", []string{"conversation_id", "chat_id", "contact_id", "title"}, entityRows); err != nil {
+	if err := execInsertOrIgnoreMany(tx, entitiesInsert, entityRows); err != nil {
 		return fmt.Errorf("failed to insert entities: %w", err)
 	}
 
@@ -708,7 +850,7 @@ func (h *AnalysisJobHandler) applyConvoAllV1Tx(tx *sql.Tx, conversationID int, c
 			topicRows = append(topicRows, []interface{}{conversationID, chatID, contactID, title})
 		}
 	}
-	if err := execInsertOrIgnoreMany(tx, "topics", []string{"conversation_id", "chat_id", "contact_id", "title"}, topicRows); err != nil {
+	if err := execInsertOrIgnoreMany(tx, topicsInsert, topicRows); err != nil {
 		return fmt.Errorf("failed to insert topics: %w", err)
 	}
 
@@ -726,7 +868,7 @@ func (h *AnalysisJobHandler) applyConvoAllV1Tx(tx *sql.Tx, conversationID int, c
 			emotionRows = append(emotionRows, []interface{}{conversationID, chatID, contactID, typ})
 		}
 	}
-	if err := execInsertOrIgnoreMany(tx, "emotions", []string{"conversation_id", "chat_id", "contact_id", "emotion_type"}, emotionRows); err != nil {
+	if err := execInsertOrIgnoreMany(tx, emotionsInsert, emotionRows); err != nil {
 		return fmt.Errorf("failed to insert emotions: %w", err)
 	}
 
@@ -744,32 +886,94 @@ func (h *AnalysisJobHandler) applyConvoAllV1Tx(tx *sql.Tx, conversationID int, c
 			humorRows = append(humorRows, []interface{}{conversationID, chatID, contactID, snippet})
 		}
 	}
-	if err := execInsertOrIgnoreMany(tx, "humor_items", []string{"conversation_id", "chat_id", "contact_id", "snippet"}, humorRows); err != nil {
+	if err := execInsertOrIgnoreMany(tx, humorItemsInsert, humorRows); err != nil {
 		return fmt.Errorf("failed to insert humor_items: %w", err)
 	}
 
 	return nil
 }
 
-func execInsertOrIgnoreMany(tx *sql.Tx, table string, columns []string, rows [][]interface{}) error {
+// bulkInsert is a multi-row INSERT OR IGNORE into one table. Its prefix and
+// row tuple are built once per table, and the statement text for each chunk
+// size is built on first use and reused, so facet writes don't reassemble
+// SQL on every job.
+type bulkInsert struct {
+	ncols   int
+	maxRows int
+	prefix  string
+	tuple   string
+
+	mu    sync.Mutex
+	texts map[int]string
+}
+
+func newBulkInsert(table string, columns ...string) *bulkInsert {
+	// SQLite variable limit is typically 999; keep some headroom.
+	const maxVars = 900
+	maxRows := maxVars / len(columns)
+	if maxRows < 1 {
+		maxRows = 1
+	}
+	return &bulkInsert{
+		ncols:   len(columns),
+		maxRows: maxRows,
+		prefix:  "INSERT OR IGNORE INTO " + table + " (" + strings.Join(columns, ",") + ") VALUES ",
+		tuple:   "(" + strings.TrimSuffix(strings.Repeat("?,", len(columns)), ",") + ")",
+		texts:   make(map[int]string),
+	}
+}
+
+// sql returns the statement text inserting n rows.
+func (b *bulkInsert) sql(n int) string {
+	b.mu.Lock()
+	defer b.mu.Unlock()
+	if text, ok := b.texts[n]; ok {
+		return text
+	}
+	var sb strings.Builder
+	sb.Grow(len(b.prefix) + n*(len(b.tuple)+1))
+	sb.WriteString(b.prefix)
+	for i := 0; i < n; i++ {
+		if i > 0 {
+			sb.WriteString(",")
+		}
+		sb.WriteString(b.tuple)
+	}
+	text := sb.String()
+	b.texts[n] = text
+	return text
+}
+
+var (
+	entitiesInsert   = newBulkInsert("entities", "conversation_id", "chat_id", "contact_id", "title")
+	topicsInsert     = newBulkInsert("topics", "conversation_id", "chat_id", "contact_id", "title")
+	emotionsInsert   = newBulkInsert("emotions", "conversation_id", "chat_id", "contact_id", "emotion_type")
+	humorItemsInsert = newBulkInsert("humor_items", "conversation_id", "chat_id", "contact_id", "snippet")
+)
+
+func execInsertOrIgnoreMany(tx *sql.Tx, ins *bulkInsert, rows [][]interface{}) error {
 	if tx == nil {
 		return fmt.Errorf("nil tx")
 	}
 	if len(rows) == 0 {
 		return nil
 	}
-	if len(columns) == 0 {
-		return fmt.Errorf("no columns")
-	}
 
-	// SQLite variable limit is typically 999; keep some headroom.
-	const maxVars = 900
-	ncols := len(columns)
-	maxRows := maxVars / ncols
-	if maxRows < 1 {
-		maxRows = 1
+	ncols, maxRows := ins.ncols, ins.maxRows
+
+	// Every full chunk has the same SQL text; prepare it once when it is used
+	// more than once.
+	var fullStmt *sql.Stmt
+	if len(rows)/maxRows > 1 {
+		stmt, err := tx.Prepare(ins.sql(maxRows))
+		if err != nil {
+			return err
+		}
+		defer stmt.Close()
+		fullStmt = stmt
 	}
 
+	args := make([]interface{}, 0, min(len(rows), maxRows)*ncols)
 	for start := 0; start < len(rows); start += maxRows {
 		end := start + maxRows
 		if end > len(rows) {
@@ -777,39 +981,21 @@ func execInsertOrIgnoreMany(tx *sql.Tx, table string, columns []string, rows [][
 		}
 		chunk := rows[start:end]
 
-		var b strings.Builder
-		b.Grow(128 + len(chunk)*ncols*3)
-		b.WriteString("INSERT OR IGNORE INTO ")
-		b.WriteString(table)
-		b.WriteString(" (")
-		for i, c := range columns {
-			if i > 0 {
-				b.WriteString(",")
-			}
-			b.WriteString(c)
-		}
-		b.WriteString(") VALUES ")
-
-		args := make([]interface{}, 0, len(chunk)*ncols)
-		for i, row := range chunk {
+		args = args[:0]
+		for _, row := range chunk {
 			if len(row) != ncols {
 				return fmt.Errorf("row has %d values, want %d", len(row), ncols)
 			}
-			if i > 0 {
-				b.WriteString(",")
-			}
-			b.WriteString("(")
-			for j := 0; j < ncols; j++ {
-				if j > 0 {
-					b.WriteString(",")
-				}
-				b.WriteString("?")
-				args = append(args, row[j])
-			}
-			b.WriteString(")")
+			args = append(args, row...)
 		}
 
-		if _, err := tx.Exec(b.String(), args...); err != nil {
+		var err error
+		if fullStmt != nil && len(chunk) == maxRows {
+			_, err = fullStmt.Exec(args...)
+		} else {
+			_, err = tx.Exec(ins.sql(len(chunk)), args...)
+		}
+		if err != nil {
 			return err
 		}
 	}
@@ -45,6 +45,7 @@ func setupAnalysisTestDB(t *testing.T) (*sql.DB, func()) {
 			chat_id INTEGER NOT NULL,
 			start_time TIMESTAMP NOT NULL,
 			end_time TIMESTAMP NOT NULL,
+			message_count INTEGER NOT NULL DEFAULT 0,
 			summary TEXT
 		);
 
@@ -94,8 +95,12 @@ func setupAnalysisTestDB(t *testing.T) (*sql.DB, func()) {
 			retry_count INTEGER DEFAULT 0,
 			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
 			updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+			blocked_reason TEXT,
+			blocked_reason_message TEXT,
+			blocked_at TIMESTAMP,
 			UNIQUE(conversation_id, prompt_template_id)
 		);
+		CREATE UNIQUE INDEX idx_conversation_analyses_conv_prompt ON conversation_analyses(conversation_id, eve_prompt_id);
 
 		CREATE TABLE entities (
 			id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -380,6 +385,32 @@ func TestAnalysisJobHandler_ConversationNotFound(t *testing.T) {
 	}
 }
 
+func TestAnalysisJobHandler_UnsupportedPrompt(t *testing.T) {
+	db, cleanup := setupAnalysisTestDB(t)
+	defer cleanup()
+
+	client := gemini.NewClient("fake-api-key")
+	handler := NewAnalysisJobHandler(db, client, "gemini-2.5-flash")
+
+	payload := AnalysisJobPayload{
+		ConversationID: 1,
+		EvePromptID:    "no-such-prompt",
+	}
+	payloadJSON, _ := json.Marshal(payload)
+
+	job := &queue.Job{
+		ID:          "test-job-1",
+		Type:        "analysis",
+		Key:         "analysis:1",
+		PayloadJSON: string(payloadJSON),
+	}
+
+	err := handler(context.Background(), job)
+	if err == nil || !strings.Contains(err.Error(), "unsupported eve_prompt_id") {
+		t.Errorf("Expected unsupported eve_prompt_id error, got %v", err)
+	}
+}
+
 func TestExtractTextFromResponse(t *testing.T) {
 	resp := &gemini.GenerateContentResponse{
 		Candidates: []gemini.Candidate{
@@ -421,3 +452,81 @@ func TestBuildAnalysisPrompt(t *testing.T) {
 		t.Error("Expected prompt to include conversation text")
 	}
 }
+
+func TestParseConvoAllV1Output(t *testing.T) {
+	cases := map[string]string{
+		"bare":   `{"summary": "ok", "topics": [{"participant_name": "Alice", "topics": ["Hiking"]}]}`,
+		"fenced": "```json\n{\"summary\": \"ok\", \"topics\": [{\"participant_name\": \"Alice\", \"topics\": [\"Hiking\"]}]}\n```",
+		"prose":  "Here is the analysis:\n{\"summary\": \"ok\", \"topics\": [{\"participant_name\": \"Alice\", \"topics\": [\"Hiking\"]}]}\nDone.",
+	}
+	for name, text := range cases {
+		out, err := parseConvoAllV1Output(text)
+		if err != nil {
+			t.Fatalf("%s: parseConvoAllV1Output failed: %v", name, err)
+		}
+		if len(out.Topics) != 1 || len(out.Topics[0].Topics) != 1 || out.Topics[0].Topics[0].Name != "Hiking" {
+			t.Errorf("%s: unexpected topics: %+v", name, out.Topics)
+		}
+	}
+
+	if _, err := parseConvoAllV1Output("no json here"); err == nil {
+		t.Error("Expected error for output without a JSON object")
+	}
+}
+
+func TestConvoAllV1Items_AcceptStringOrObject(t *testing.T) {
+	var out convoAllV1Output
+	raw := `{
+		"entities": [{"participant_name": "Alice", "entities": [{"name": "Paris"}, "Tokyo"]}],
+		"humor": [{"participant_name": "Bob", "humor": ["lol", {"message": "nice"}]}]
+	}`
+	if err := json.Unmarshal([]byte(raw), &out); err != nil {
+		t.Fatalf("Unmarshal failed: %v", err)
+	}
+	ents := out.Entities[0].Entities
+	if len(ents) != 2 || ents[0].Name != "Paris" || ents[1].Name != "Tokyo" {
+		t.Errorf("unexpected entities: %+v", ents)
+	}
+	humor := out.Humor[0].Humor
+	if len(humor) != 2 || humor[0].Message != "lol" || humor[1].Message != "nice" {
+		t.Errorf("unexpected humor: %+v", humor)
+	}
+
+	var bad convoAllV1NameItem
+	if err := json.Unmarshal([]byte(`42`), &bad); err == nil {
+		t.Error("expected error for non-string, non-object item")
+	}
+}
+
+func TestBulkInsertSQL(t *testing.T) {
+	ins := newBulkInsert("topics", "conversation_id", "title")
+	want := "INSERT OR IGNORE INTO topics (conversation_id,title) VALUES (?,?),(?,?)"
+	if got := ins.sql(2); got != want {
+		t.Errorf("sql(2) = %q, want %q", got, want)
+	}
+	if got := ins.sql(2); got != want {
+		t.Errorf("memoized sql(2) = %q, want %q", got, want)
+	}
+	if ins.maxRows != 450 {
+		t.Errorf("maxRows = %d, want 450", ins.maxRows)
+	}
+}
+
+func TestResponseJSON_UsesRawBody(t *testing.T) {
+	raw := "{\n  \"candidates\": [],\n  \"usageMetadata\": {\"totalTokenCount\": 3}\n}"
+	got, err := responseJSON(&gemini.GenerateContentResponse{Raw: json.RawMessage(raw)})
+	if err != nil {
+		t.Fatalf("responseJSON() error = %v", err)
+	}
+	if want := `{"candidates":[],"usageMetadata":{"totalTokenCount":3}}`; string(got) != want {
+		t.Errorf("responseJSON() = %s, want %s", got, want)
+	}
+
+	got, err = responseJSON(&gemini.GenerateContentResponse{PromptFeedback: &gemini.PromptFeedback{BlockReason: "SAFETY"}})
+	if err != nil {
+		t.Fatalf("responseJSON() error = %v", err)
+	}
+	if want := `{"promptFeedback":{"blockReason":"SAFETY"}}`; string(got) != want {
+		t.Errorf("responseJSON() = %s, want %s", got, want)
+	}
+}
@@ -0,0 +1,65 @@
+package engine
+
+import (
+	"sync"
+	"time"
+)
+
+const (
+	// contactNameCacheTTL bounds how long a name -> contact resolution is reused.
+	// Contacts are only added or renamed by ETL syncs, so a few minutes of
+	// staleness at most delays attribution of a newly synced contact.
+	contactNameCacheTTL = 5 * time.Minute
+	// contactNameCacheMax caps the number of cached names; the cache is reset
+	// when it fills rather than tracking recency.
+	contactNameCacheMax = 4096
+)
+
+type contactNameEntry struct {
+	id      *int64 // nil if no contact matched
+	expires time.Time
+}
+
+// contactNameCache memoizes facet participant name -> contact ID lookups across
+// analysis jobs. The same handful of participant names recur in every
+// conversation of a chat, so most jobs resolve them without touching the DB.
+// A nil *contactNameCache is valid and never hits.
+type contactNameCache struct {
+	mu      sync.Mutex
+	ttl     time.Duration
+	max     int
+	entries map[string]contactNameEntry
+}
+
+func newContactNameCache(ttl time.Duration, max int) *contactNameCache {
+	return &contactNameCache{
+		ttl:     ttl,
+		max:     max,
+		entries: make(map[string]contactNameEntry),
+	}
+}
+
+func (c *contactNameCache) get(name string, now time.Time) (*int64, bool) {
+	if c == nil {
+		return nil, false
+	}
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	e, ok := c.entries[name]
+	if !ok || now.After(e.expires) {
+		return nil, false
+	}
+	return e.id, true
+}
+
+func (c *contactNameCache) put(name string, id *int64, now time.Time) {
+	if c == nil {
+		return
+	}
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	if len(c.entries) >= c.max {
+		c.entries = make(map[string]contactNameEntry)
+	}
+	c.entries[name] = contactNameEntry{id: id, expires: now.Add(c.ttl)}
+}
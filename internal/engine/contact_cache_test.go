@@ -0,0 +1,47 @@
+package engine
+
+import (
+	"testing"
+	"time"
+)
+
+func TestContactNameCache_Expires(t *testing.T) {
+	c := newContactNameCache(time.Minute, 10)
+	now := time.Now()
+	id := int64(42)
+	c.put("Alice", &id, now)
+	c.put("Nobody", nil, now)
+
+	if got, ok := c.get("Alice", now.Add(30*time.Second)); !ok || got == nil || *got != 42 {
+		t.Fatalf("expected cached id 42, got %v ok=%v", got, ok)
+	}
+	if got, ok := c.get("Nobody", now); !ok || got != nil {
+		t.Fatalf("expected cached miss, got %v ok=%v", got, ok)
+	}
+	if _, ok := c.get("Alice", now.Add(2*time.Minute)); ok {
+		t.Fatalf("expected entry to expire after ttl")
+	}
+}
+
+func TestContactNameCache_ResetsWhenFull(t *testing.T) {
+	c := newContactNameCache(time.Minute, 2)
+	now := time.Now()
+	c.put("a", nil, now)
+	c.put("b", nil, now)
+	c.put("c", nil, now)
+
+	if _, ok := c.get("a", now); ok {
+		t.Fatalf("expected cache to reset when full")
+	}
+	if _, ok := c.get("c", now); !ok {
+		t.Fatalf("expected newest entry to be cached")
+	}
+}
+
+func TestContactNameCache_NilIsNoop(t *testing.T) {
+	var c *contactNameCache
+	c.put("a", nil, time.Now())
+	if _, ok := c.get("a", time.Now()); ok {
+		t.Fatalf("nil cache should never hit")
+	}
+}
@@ -8,6 +8,7 @@ import (
 	"fmt"
 	"math"
 	"strings"
+	"sync"
 
 	"github.com/Napageneral/eve/internal/db"
 	"github.com/Napageneral/eve/internal/encoding"
@@ -22,6 +23,17 @@ type EmbeddingJobPayload struct {
 	ConversationID int    `json:"conversation_id,omitempty"`
 }
 
+// upsertEmbeddingSQL stores an entity's embedding for a model, replacing any
+// earlier one.
+const upsertEmbeddingSQL = `
+	INSERT INTO embeddings (entity_type, entity_id, model, embedding_blob, dimension)
+	VALUES (?, ?, ?, ?, ?)
+	ON CONFLICT(entity_type, entity_id, model) DO UPDATE SET
+		embedding_blob = excluded.embedding_blob,
+		dimension = excluded.dimension,
+		created_at = CURRENT_TIMESTAMP
+`
+
 // NewEmbeddingJobHandler creates a handler for embedding jobs
 func NewEmbeddingJobHandler(warehouseDB *sql.DB, geminiClient *gemini.Client, model string) func(context.Context, *queue.Job) error {
 	return NewEmbeddingJobHandlerWithPipeline(warehouseDB, geminiClient, model, nil)
@@ -30,6 +42,22 @@ func NewEmbeddingJobHandler(warehouseDB *sql.DB, geminiClient *gemini.Client, mo
 // NewEmbeddingJobHandlerWithPipeline creates a handler for embedding jobs that can optionally
 // serialize DB writes through a micro-batched writer.
 func NewEmbeddingJobHandlerWithPipeline(warehouseDB *sql.DB, geminiClient *gemini.Client, model string, writer *TxBatchWriter) func(context.Context, *queue.Job) error {
+	// Prepare the upsert once per handler so every job (and every job in a
+	// batched transaction) reuses one compiled statement. It is prepared
+	// before any write transaction is opened so it never waits on a pool
+	// connection held by the caller; if preparing fails the SQL runs as-is.
+	var upsertOnce sync.Once
+	var upsertStmt *sql.Stmt
+	prepareUpsert := func() {
+		upsertOnce.Do(func() {
+			if stmt, err := warehouseDB.Prepare(upsertEmbeddingSQL); err == nil {
+				upsertStmt = stmt
+			}
+		})
+	}
+
+	reader := db.NewConversationReader(warehouseDB)
+
 	return func(ctx context.Context, job *queue.Job) error {
 		// Parse payload
 		var payload EmbeddingJobPayload
@@ -38,7 +66,7 @@ func NewEmbeddingJobHandlerWithPipeline(warehouseDB *sql.DB, geminiClient *gemin
 		}
 
 		// Get text to embed based on entity type
-		text, err := getEntityText(ctx, warehouseDB, payload.EntityType, payload.EntityID)
+		text, err := getEntityText(ctx, warehouseDB, reader, payload.EntityType, payload.EntityID)
 		if err != nil {
 			return fmt.Errorf("failed to get entity text: %w", err)
 		}
@@ -62,27 +90,23 @@ func NewEmbeddingJobHandlerWithPipeline(warehouseDB *sql.DB, geminiClient *gemin
 			return fmt.Errorf("empty embedding response")
 		}
 
-		// Convert float64 slice to blob (binary format)
-		embeddingBlob, err := float64SliceToBlob(resp.Embedding.Values)
-		if err != nil {
-			return fmt.Errorf("failed to encode embedding: %w", err)
-		}
+		embeddingBlob := float32SliceToBlob(resp.Embedding.Values)
+		dimension := len(resp.Embedding.Values)
 
 		apply := func(tx *sql.Tx) error {
-			_, err := tx.Exec(`
-				INSERT INTO embeddings (entity_type, entity_id, model, embedding_blob, dimension)
-				VALUES (?, ?, ?, ?, ?)
-				ON CONFLICT(entity_type, entity_id, model) DO UPDATE SET
-					embedding_blob = excluded.embedding_blob,
-					dimension = excluded.dimension,
-					created_at = CURRENT_TIMESTAMP
-			`, payload.EntityType, payload.EntityID, model, embeddingBlob, len(resp.Embedding.Values))
+			var err error
+			if upsertStmt != nil {
+				_, err = tx.Stmt(upsertStmt).Exec(payload.EntityType, payload.EntityID, model, embeddingBlob, dimension)
+			} else {
+				_, err = tx.Exec(upsertEmbeddingSQL, payload.EntityType, payload.EntityID, model, embeddingBlob, dimension)
+			}
 			if err != nil {
 				return fmt.Errorf("failed to persist embedding: %w", err)
 			}
 			return nil
 		}
 
+		prepareUpsert()
 		if writer != nil {
 			return writer.Submit(ctx, apply)
 		}
@@ -103,12 +127,12 @@ func NewEmbeddingJobHandlerWithPipeline(warehouseDB *sql.DB, geminiClient *gemin
 	}
 }
 
-// getEntityText retrieves the text to embed based on entity type and ID
-func getEntityText(ctx context.Context, warehouseDB *sql.DB, entityType string, entityID int) (string, error) {
+// getEntityText retrieves the text to embed based on entity type and ID.
+// Conversations are read through reader.
+func getEntityText(ctx context.Context, warehouseDB *sql.DB, reader *db.ConversationReader, entityType string, entityID int) (string, error) {
 	switch entityType {
 	case "conversation":
 		// Read conversation and encode it
-		reader := db.NewConversationReader(warehouseDB)
 		convo, err := reader.GetConversation(entityID)
 		if err != nil {
 			return "", fmt.Errorf("failed to read conversation: %w", err)
@@ -191,14 +215,35 @@ func getEntityText(ctx context.Context, warehouseDB *sql.DB, entityType string,
 	}
 }
 
-// float64SliceToBlob converts a float64 slice to a byte slice (little-endian)
-func float64SliceToBlob(values []float64) ([]byte, error) {
-	blob := make([]byte, len(values)*8)
+// Embeddings are stored as little-endian float32 values, 4 bytes per
+// dimension: half the size of float64 with no loss that matters for cosine
+// ranking. Rows written before that hold 8-byte float64 values; DecodeEmbedding
+// reads both, telling them apart by the row's dimension column.
+
+// float32SliceToBlob encodes values as little-endian float32.
+func float32SliceToBlob(values []float64) []byte {
+	blob := make([]byte, len(values)*4)
 	for i, v := range values {
-		bits := math.Float64bits(v)
-		binary.LittleEndian.PutUint64(blob[i*8:(i+1)*8], bits)
+		binary.LittleEndian.PutUint32(blob[i*4:], math.Float32bits(float32(v)))
+	}
+	return blob
+}
+
+// DecodeEmbedding decodes an embeddings.embedding_blob of the given dimension,
+// in either the float32 or the legacy float64 encoding.
+func DecodeEmbedding(blob []byte, dimension int) ([]float64, error) {
+	switch {
+	case dimension > 0 && len(blob) == dimension*4:
+		values := make([]float64, dimension)
+		for i := range values {
+			values[i] = float64(math.Float32frombits(binary.LittleEndian.Uint32(blob[i*4:])))
+		}
+		return values, nil
+	case dimension > 0 && len(blob) == dimension*8:
+		return blobToFloat64Slice(blob)
+	default:
+		return nil, fmt.Errorf("invalid blob length: %d for dimension %d", len(blob), dimension)
 	}
-	return blob, nil
 }
 
 // blobToFloat64Slice converts a byte slice back to float64 slice
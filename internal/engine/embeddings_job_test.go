@@ -3,7 +3,9 @@ package engine
 import (
 	"context"
 	"database/sql"
+	"encoding/binary"
 	"encoding/json"
+	"math"
 	"net/http"
 	"net/http/httptest"
 	"os"
@@ -113,7 +115,10 @@ func TestEmbeddingJob_Conversation(t *testing.T) {
 	}
 
 	// Decode embedding blob
-	embedding, err := blobToFloat64Slice(embeddingBlob)
+	if len(embeddingBlob) != 5*4 {
+		t.Errorf("expected a 20-byte float32 blob, got %d bytes", len(embeddingBlob))
+	}
+	embedding, err := DecodeEmbedding(embeddingBlob, dimension)
 	if err != nil {
 		t.Fatalf("failed to decode embedding: %v", err)
 	}
@@ -125,7 +130,7 @@ func TestEmbeddingJob_Conversation(t *testing.T) {
 	// Check values
 	expected := []float64{0.1, 0.2, 0.3, 0.4, 0.5}
 	for i, v := range expected {
-		if embedding[i] != v {
+		if embedding[i] != float64(float32(v)) {
 			t.Errorf("embedding[%d] = %f, want %f", i, embedding[i], v)
 		}
 	}
@@ -298,31 +303,38 @@ func TestEmbeddingJob_Facets(t *testing.T) {
 	}
 }
 
-func TestFloat64SliceToBlob(t *testing.T) {
+func TestDecodeEmbedding(t *testing.T) {
 	values := []float64{1.5, 2.7, 3.9, 4.1}
 
-	// Encode
-	blob, err := float64SliceToBlob(values)
+	// Current float32 encoding
+	decoded, err := DecodeEmbedding(float32SliceToBlob(values), len(values))
 	if err != nil {
-		t.Fatalf("encode failed: %v", err)
+		t.Fatalf("decode float32 failed: %v", err)
 	}
-
-	// Decode
-	decoded, err := blobToFloat64Slice(blob)
-	if err != nil {
-		t.Fatalf("decode failed: %v", err)
+	for i, v := range values {
+		if decoded[i] != float64(float32(v)) {
+			t.Errorf("float32 value[%d] = %f, want %f", i, decoded[i], v)
+		}
 	}
 
-	// Compare
-	if len(decoded) != len(values) {
-		t.Errorf("length mismatch: got %d, want %d", len(decoded), len(values))
+	// Legacy float64 encoding
+	legacy := make([]byte, len(values)*8)
+	for i, v := range values {
+		binary.LittleEndian.PutUint64(legacy[i*8:], math.Float64bits(v))
+	}
+	decoded, err = DecodeEmbedding(legacy, len(values))
+	if err != nil {
+		t.Fatalf("decode float64 failed: %v", err)
 	}
-
 	for i, v := range values {
 		if decoded[i] != v {
-			t.Errorf("value[%d] = %f, want %f", i, decoded[i], v)
+			t.Errorf("float64 value[%d] = %f, want %f", i, decoded[i], v)
 		}
 	}
+
+	if _, err := DecodeEmbedding(legacy[:10], len(values)); err == nil {
+		t.Error("expected an error for a blob that matches neither encoding")
+	}
 }
 
 // insertTestConversationForEmbedding inserts a test conversation with messages
@@ -67,16 +67,18 @@ func extractContactsFromAddressBook(dbPath string) ([]addressBookContact, error)
 	}
 
 	// Pull phones and messaging addresses (emails + iMessage addresses).
-	// Note: this intentionally mirrors ChatStats' union query.
+	// Note: this mirrors ChatStats' union query, but as UNION ALL: duplicates
+	// are dropped below after normalization, so SQLite doesn't need to build
+	// a temp b-tree to de-duplicate raw rows first.
 	query := `
 		SELECT r.ZFIRSTNAME, r.ZLASTNAME, p.ZFULLNUMBER AS identifier
 		FROM ZABCDRECORD r
-		LEFT JOIN ZABCDPHONENUMBER p ON p.ZOWNER = r.Z_PK
+		JOIN ZABCDPHONENUMBER p ON p.ZOWNER = r.Z_PK
 		WHERE p.ZFULLNUMBER IS NOT NULL
-		UNION
+		UNION ALL
 		SELECT r.ZFIRSTNAME, r.ZLASTNAME, m.ZADDRESS AS identifier
 		FROM ZABCDRECORD r
-		LEFT JOIN ZABCDMESSAGINGADDRESS m ON m.ZOWNER = r.Z_PK
+		JOIN ZABCDMESSAGINGADDRESS m ON m.ZOWNER = r.Z_PK
 		WHERE m.ZADDRESS IS NOT NULL
 	`
 
@@ -88,6 +90,7 @@ func extractContactsFromAddressBook(dbPath string) ([]addressBookContact, error)
 	defer rows.Close()
 
 	var out []addressBookContact
+	seen := make(map[addressBookContact]struct{})
 	for rows.Next() {
 		var first sql.NullString
 		var last sql.NullString
@@ -124,11 +127,16 @@ func extractContactsFromAddressBook(dbPath string) ([]addressBookContact, error)
 			name = norm
 		}
 
-		out = append(out, addressBookContact{
+		c := addressBookContact{
 			Name:       name,
 			Identifier: norm,
 			Type:       typ,
-		})
+		}
+		if _, ok := seen[c]; ok {
+			continue
+		}
+		seen[c] = struct{}{}
+		out = append(out, c)
 	}
 	return out, rows.Err()
 }
@@ -150,24 +158,18 @@ func cleanContactName(name string) string {
 func hydrateContactNamesFromAddressBooks(warehouseDB *sql.DB, dbPaths []string) (int, error) {
 	updated := 0
 
-	// Prepared statements for speed
-	findStmt, err := warehouseDB.Prepare(`
-		SELECT c.id, COALESCE(c.name, '')
-		FROM contacts c
-		JOIN contact_identifiers ci ON c.id = ci.contact_id
-		WHERE ci.identifier = ? AND ci.type = ?
-		LIMIT 1
-	`)
+	// All updates share one transaction: outside one, every UPDATE would be
+	// its own commit (and fsync), one per AddressBook identifier.
+	tx, err := warehouseDB.Begin()
 	if err != nil {
 		return 0, err
 	}
-	defer findStmt.Close()
+	defer tx.Rollback()
 
-	updateStmt, err := warehouseDB.Prepare(`
-		UPDATE contacts
-		SET name = ?, data_source = COALESCE(data_source, 'live_addressbook'), last_updated = CURRENT_TIMESTAMP
-		WHERE id = ?
-	`)
+	// One prepared statement per contact: the UPDATE resolves the contact
+	// linked to the identifier and applies the placeholder-name check itself,
+	// so matching contacts don't need a separate lookup first.
+	updateStmt, err := tx.Prepare(hydrateContactNameSQL)
 	if err != nil {
 		return 0, err
 	}
@@ -180,53 +182,50 @@ func hydrateContactNamesFromAddressBooks(warehouseDB *sql.DB, dbPaths []string)
 			continue
 		}
 		for _, c := range contacts {
-			var contactID int64
-			var existingName string
-			if err := findStmt.QueryRow(c.Identifier, c.Type).Scan(&contactID, &existingName); err != nil {
+			if c.Name == "" {
 				continue
 			}
-
-			if !nameNeedsUpdate(existingName, c.Identifier) {
-				continue
-			}
-			if c.Name == "" || c.Name == existingName {
-				continue
+			res, err := updateStmt.Exec(c.Name, c.Identifier, c.Type)
+			if err != nil {
+				return 0, fmt.Errorf("failed to update contact name: %w", err)
 			}
-
-			if _, err := updateStmt.Exec(c.Name, contactID); err != nil {
-				return updated, fmt.Errorf("failed to update contact name: %w", err)
+			n, err := res.RowsAffected()
+			if err != nil {
+				return 0, fmt.Errorf("failed to update contact name: %w", err)
 			}
-			updated++
+			updated += int(n)
 		}
 	}
 
-	return updated, nil
-}
-
-func nameNeedsUpdate(existingName string, identifier string) bool {
-	existingName = strings.TrimSpace(existingName)
-	if existingName == "" {
-		return true
+	if err := tx.Commit(); err != nil {
+		return 0, fmt.Errorf("failed to commit contact names: %w", err)
 	}
-	if existingName == identifier {
-		return true
-	}
-	// Looks like a phone number? (strip punctuation and check digits)
-	clean := existingName
-	replacer := strings.NewReplacer("+", "", "-", "", " ", "", "(", "", ")", "")
-	clean = replacer.Replace(clean)
-	allDigits := clean != "" && isAllDigits(clean)
-	return allDigits
+	return updated, nil
 }
 
-func isAllDigits(s string) bool {
-	for _, r := range s {
-		if r < '0' || r > '9' {
-			return false
-		}
-	}
-	return true
-}
+// hydrateContactNameSQL sets the AddressBook name (?1) on the contact linked to
+// identifier ?2 of type ?3, but only if the contact's current name is a
+// placeholder: empty, the identifier itself, or a phone number (digits once
+// "+", "-", " ", "(" and ")" are stripped), and differs from the new name.
+const hydrateContactNameSQL = `
+	UPDATE contacts
+	SET name = ?1, data_source = COALESCE(data_source, 'live_addressbook'), last_updated = CURRENT_TIMESTAMP
+	WHERE id = (
+		SELECT contact_id
+		FROM contact_identifiers
+		WHERE identifier = ?2 AND type = ?3
+		LIMIT 1
+	)
+	AND COALESCE(name, '') != ?1
+	AND (
+		TRIM(COALESCE(name, '')) = ''
+		OR TRIM(name) = ?2
+		OR (
+			REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(TRIM(name), '+', ''), '-', ''), ' ', ''), '(', ''), ')', '') GLOB '[0-9]*'
+			AND REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(TRIM(name), '+', ''), '-', ''), ' ', ''), '(', ''), ')', '') NOT GLOB '*[^0-9]*'
+		)
+	)
+`
 
 // HydrateContactNamesFromAddressBook is the public entrypoint used by ETL.
 func HydrateContactNamesFromAddressBook(warehouseDB *sql.DB) (int, error) {
@@ -0,0 +1,101 @@
+package etl
+
+import (
+	"database/sql"
+	"path/filepath"
+	"testing"
+
+	_ "github.com/mattn/go-sqlite3"
+)
+
+// createTestAddressBook creates a minimal AddressBook database with the given
+// (first name, phone) and (first name, email) records.
+func createTestAddressBook(t *testing.T, phones, emails map[string]string) string {
+	dbPath := filepath.Join(t.TempDir(), "AddressBook-v22.abcddb")
+	db, err := sql.Open("sqlite3", dbPath)
+	if err != nil {
+		t.Fatalf("Failed to create test AddressBook: %v", err)
+	}
+	defer db.Close()
+
+	schema := `
+		CREATE TABLE ZABCDRECORD (Z_PK INTEGER PRIMARY KEY, ZFIRSTNAME TEXT, ZLASTNAME TEXT);
+		CREATE TABLE ZABCDPHONENUMBER (Z_PK INTEGER PRIMARY KEY, ZOWNER INTEGER, ZFULLNUMBER TEXT);
+		CREATE TABLE ZABCDMESSAGINGADDRESS (Z_PK INTEGER PRIMARY KEY, ZOWNER INTEGER, ZADDRESS TEXT);
+	`
+	if _, err := db.Exec(schema); err != nil {
+		t.Fatalf("Failed to create AddressBook schema: %v", err)
+	}
+
+	add := func(table, column, name, identifier string) {
+		res, err := db.Exec(`INSERT INTO ZABCDRECORD (ZFIRSTNAME) VALUES (?)`, name)
+		if err != nil {
+			t.Fatalf("Failed to insert record: %v", err)
+		}
+		owner, _ := res.LastInsertId()
+		if _, err := db.Exec(`INSERT INTO `+table+` (ZOWNER, `+column+`) VALUES (?, ?)`, owner, identifier); err != nil {
+			t.Fatalf("Failed to insert %s: %v", table, err)
+		}
+	}
+	for name, phone := range phones {
+		add("ZABCDPHONENUMBER", "ZFULLNUMBER", name, phone)
+	}
+	for name, email := range emails {
+		add("ZABCDMESSAGINGADDRESS", "ZADDRESS", name, email)
+	}
+	return dbPath
+}
+
+func TestHydrateContactNamesFromAddressBooks(t *testing.T) {
+	warehouseDB := createTestWarehouseDBWithContacts(t)
+	defer warehouseDB.Close()
+
+	_, err := warehouseDB.Exec(`
+		INSERT INTO contacts (id, name) VALUES
+			(1, ''),
+			(2, '+1 (555) 123-4567'),
+			(3, 'Real Name'),
+			(4, 'bob@example.com');
+		INSERT INTO contact_identifiers (contact_id, identifier, type) VALUES
+			(1, 'alice@example.com', 'email'),
+			(2, '5551234567', 'phone'),
+			(3, 'carol@example.com', 'email'),
+			(4, 'bob@example.com', 'email');
+	`)
+	if err != nil {
+		t.Fatalf("Failed to seed contacts: %v", err)
+	}
+
+	abPath := createTestAddressBook(t,
+		map[string]string{"Dave": "+1 555 123 4567"},
+		map[string]string{"Alice": "alice@example.com", "Carol": "carol@example.com", "Bob": "BOB@example.com"},
+	)
+
+	updated, err := hydrateContactNamesFromAddressBooks(warehouseDB, []string{abPath})
+	if err != nil {
+		t.Fatalf("hydrateContactNamesFromAddressBooks failed: %v", err)
+	}
+	if updated != 3 {
+		t.Errorf("Expected 3 contacts updated, got %d", updated)
+	}
+
+	want := map[int]string{1: "Alice", 2: "Dave", 3: "Real Name", 4: "Bob"}
+	for id, name := range want {
+		var got string
+		if err := warehouseDB.QueryRow(`SELECT name FROM contacts WHERE id = ?`, id).Scan(&got); err != nil {
+			t.Fatalf("Failed to read contact %d: %v", id, err)
+		}
+		if got != name {
+			t.Errorf("contact %d name = %q, want %q", id, got, name)
+		}
+	}
+
+	// A second pass finds only real names and changes nothing.
+	updated, err = hydrateContactNamesFromAddressBooks(warehouseDB, []string{abPath})
+	if err != nil {
+		t.Fatalf("second hydrate failed: %v", err)
+	}
+	if updated != 0 {
+		t.Errorf("Expected no updates on second pass, got %d", updated)
+	}
+}
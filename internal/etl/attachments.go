@@ -21,44 +21,61 @@ type Attachment struct {
 
 // SyncAttachments copies attachments from chat.db to attachments table in eve.db
 // Reads attachments via message_attachment_join and maps to messages by guid
-// Returns the number of attachments synced
+// inside the upsert. Returns the number of attachments synced
 func SyncAttachments(chatDB *ChatDB, warehouseDB *sql.DB) (int, error) {
-	// Read attachments from chat.db
-	attachments, err := chatDB.GetAttachments()
-	if err != nil {
-		return 0, fmt.Errorf("failed to read attachments: %w", err)
-	}
-
-	if len(attachments) == 0 {
-		return 0, nil
-	}
-
-	// Begin transaction for atomic writes
-	tx, err := warehouseDB.Begin()
-	if err != nil {
-		return 0, fmt.Errorf("failed to begin transaction: %w", err)
-	}
-	defer tx.Rollback()
+	// Attachments are streamed from chat.db and upserted as they are read, as
+	// in SyncMessages; every sync re-reads the whole attachment table, so it
+	// is never held in memory. The transaction starts with the first row.
+	var (
+		tx         *sql.Tx
+		upsertStmt *sql.Stmt
+	)
+	defer func() {
+		if upsertStmt != nil {
+			upsertStmt.Close()
+		}
+		if tx != nil {
+			tx.Rollback()
+		}
+	}()
+
+	begin := func() error {
+		var err error
+		// Begin transaction for atomic writes
+		tx, err = warehouseDB.Begin()
+		if err != nil {
+			return fmt.Errorf("failed to begin transaction: %w", err)
+		}
 
-	// Build message guid -> message id mapping
-	messageMap, err := buildMessageMap(tx)
-	if err != nil {
-		return 0, fmt.Errorf("failed to build message map: %w", err)
+		// Prepare the upsert once; it runs for every attachment.
+		upsertStmt, err = tx.Prepare(upsertAttachmentSQL)
+		if err != nil {
+			return fmt.Errorf("failed to prepare attachment upsert: %w", err)
+		}
+		return nil
 	}
 
-	// Insert attachments
 	syncedCount := 0
-	for _, att := range attachments {
-		messageID, ok := messageMap[att.MessageGUID]
-		if !ok {
-			// Skip if message not found (message may not have been synced yet)
-			continue
+	err := chatDB.forEachAttachment(func(att *Attachment) error {
+		if tx == nil {
+			if err := begin(); err != nil {
+				return err
+			}
 		}
-
-		if err := insertAttachment(tx, &att, messageID); err != nil {
-			return 0, fmt.Errorf("failed to insert attachment %d: %w", att.ROWID, err)
+		synced, err := insertAttachment(upsertStmt, att)
+		if err != nil {
+			return fmt.Errorf("failed to insert attachment %d: %w", att.ROWID, err)
+		}
+		if synced {
+			syncedCount++
 		}
-		syncedCount++
+		return nil
+	})
+	if err != nil {
+		return 0, err
+	}
+	if tx == nil {
+		return 0, nil
 	}
 
 	if err := tx.Commit(); err != nil {
@@ -71,6 +88,21 @@ func SyncAttachments(chatDB *ChatDB, warehouseDB *sql.DB) (int, error) {
 // GetAttachments reads attachments from chat.db via message_attachment_join
 // Joins with message table to get message guid for foreign key mapping
 func (c *ChatDB) GetAttachments() ([]Attachment, error) {
+	var attachments []Attachment
+	err := c.forEachAttachment(func(att *Attachment) error {
+		attachments = append(attachments, *att)
+		return nil
+	})
+	if err != nil {
+		return nil, err
+	}
+	return attachments, nil
+}
+
+// forEachAttachment streams the attachments GetAttachments returns to fn in
+// ROWID order, one row at a time. fn must not retain att; an error from fn
+// stops the scan and is returned as-is.
+func (c *ChatDB) forEachAttachment(fn func(att *Attachment) error) error {
 	query := `
 		SELECT
 			a.ROWID,
@@ -90,13 +122,12 @@ func (c *ChatDB) GetAttachments() ([]Attachment, error) {
 
 	rows, err := c.db.Query(query)
 	if err != nil {
-		return nil, fmt.Errorf("failed to query attachments: %w", err)
+		return fmt.Errorf("failed to query attachments: %w", err)
 	}
 	defer rows.Close()
 
-	var attachments []Attachment
+	var att Attachment
 	for rows.Next() {
-		var att Attachment
 		if err := rows.Scan(
 			&att.ROWID,
 			&att.GUID,
@@ -108,49 +139,55 @@ func (c *ChatDB) GetAttachments() ([]Attachment, error) {
 			&att.IsSticker,
 			&att.MessageGUID,
 		); err != nil {
-			return nil, fmt.Errorf("failed to scan attachment: %w", err)
+			return fmt.Errorf("failed to scan attachment: %w", err)
 		}
-		attachments = append(attachments, att)
-	}
-
-	if err := rows.Err(); err != nil {
-		return nil, fmt.Errorf("error iterating attachments: %w", err)
-	}
-
-	return attachments, nil
-}
-
-// buildMessageMap creates a mapping from message guid to message id
-func buildMessageMap(tx *sql.Tx) (map[string]int64, error) {
-	rows, err := tx.Query("SELECT guid, id FROM messages")
-	if err != nil {
-		return nil, fmt.Errorf("failed to query messages: %w", err)
-	}
-	defer rows.Close()
-
-	messageMap := make(map[string]int64)
-	for rows.Next() {
-		var guid string
-		var id int64
-		if err := rows.Scan(&guid, &id); err != nil {
-			return nil, fmt.Errorf("failed to scan message mapping: %w", err)
+		if err := fn(&att); err != nil {
+			return err
 		}
-		messageMap[guid] = id
 	}
 
 	if err := rows.Err(); err != nil {
-		return nil, fmt.Errorf("error iterating message mapping: %w", err)
+		return fmt.Errorf("error iterating attachments: %w", err)
 	}
 
-	return messageMap, nil
+	return nil
 }
 
+// upsertAttachmentSQL inserts an attachment into the attachments table.
+// Idempotent via guid UNIQUE constraint. The message id is resolved from the
+// message guid (the last parameter) through its unique index in the same
+// statement, rather than from a guid -> id map of every warehouse message;
+// attachments whose message isn't in the warehouse yet insert nothing.
+const upsertAttachmentSQL = `
+	INSERT INTO attachments (
+		message_id,
+		file_name,
+		mime_type,
+		size,
+		created_date,
+		is_sticker,
+		guid,
+		uti
+	)
+	SELECT m.id, ?, ?, ?, ?, ?, ?, ?
+	FROM messages m
+	WHERE m.guid = ?
+	ON CONFLICT(guid) DO UPDATE SET
+		message_id = excluded.message_id,
+		file_name = excluded.file_name,
+		mime_type = excluded.mime_type,
+		size = excluded.size,
+		created_date = excluded.created_date,
+		is_sticker = excluded.is_sticker,
+		uti = excluded.uti
+`
+
 // insertAttachment inserts an attachment into the attachments table
-// Converts Apple timestamp to Unix timestamp
-func insertAttachment(tx *sql.Tx, att *Attachment, messageID int64) error {
+// Converts Apple timestamp to Unix timestamp. It reports false when the
+// attachment's message has not been synced yet, leaving it for a later sync.
+func insertAttachment(upsertStmt *sql.Stmt, att *Attachment) (bool, error) {
 	// Convert Apple timestamp to Go time
 	// Apple epoch: 2001-01-01 00:00:00 UTC
-	appleEpoch := time.Date(2001, 1, 1, 0, 0, 0, 0, time.UTC)
 	createdDate := appleEpoch.Add(time.Duration(att.CreatedDate) * time.Nanosecond)
 
 	// Extract nullable fields
@@ -174,31 +211,7 @@ func insertAttachment(tx *sql.Tx, att *Attachment, messageID int64) error {
 		size = &att.TotalBytes.Int64
 	}
 
-	// Insert into attachments table
-	// Idempotent via guid UNIQUE constraint
-	query := `
-		INSERT INTO attachments (
-			message_id,
-			file_name,
-			mime_type,
-			size,
-			created_date,
-			is_sticker,
-			guid,
-			uti
-		) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-		ON CONFLICT(guid) DO UPDATE SET
-			message_id = excluded.message_id,
-			file_name = excluded.file_name,
-			mime_type = excluded.mime_type,
-			size = excluded.size,
-			created_date = excluded.created_date,
-			is_sticker = excluded.is_sticker,
-			uti = excluded.uti
-	`
-
-	if _, err := tx.Exec(query,
-		messageID,
+	res, err := upsertStmt.Exec(
 		filename,
 		mimeType,
 		size,
@@ -206,9 +219,15 @@ func insertAttachment(tx *sql.Tx, att *Attachment, messageID int64) error {
 		att.IsSticker,
 		att.GUID,
 		uti,
-	); err != nil {
-		return fmt.Errorf("failed to insert attachment: %w", err)
+		att.MessageGUID,
+	)
+	if err != nil {
+		return false, fmt.Errorf("failed to insert attachment: %w", err)
+	}
+	n, err := res.RowsAffected()
+	if err != nil {
+		return false, fmt.Errorf("failed to insert attachment: %w", err)
 	}
 
-	return nil
+	return n > 0, nil
 }
@@ -512,6 +512,40 @@ func TestSyncAttachments_NullableFields(t *testing.T) {
 	}
 }
 
+func TestSyncAttachments_SkipsUnsyncedMessages(t *testing.T) {
+	chatDBPath := createTestChatDBWithAttachments(t)
+	chatDB, err := OpenChatDB(chatDBPath)
+	if err != nil {
+		t.Fatalf("Failed to open chat.db: %v", err)
+	}
+	defer chatDB.Close()
+
+	warehouseDB := createTestWarehouseDBWithAttachments(t)
+	defer warehouseDB.Close()
+
+	// msg-002 has not reached the warehouse yet
+	if _, err := warehouseDB.Exec("DELETE FROM messages WHERE guid = 'msg-002'"); err != nil {
+		t.Fatalf("Failed to delete message: %v", err)
+	}
+
+	count, err := SyncAttachments(chatDB, warehouseDB)
+	if err != nil {
+		t.Fatalf("Failed to sync attachments: %v", err)
+	}
+	if count != 3 {
+		t.Errorf("Expected 3 attachments synced, got %d", count)
+	}
+
+	var attCount int
+	err = warehouseDB.QueryRow("SELECT COUNT(*) FROM attachments WHERE guid = 'att-002'").Scan(&attCount)
+	if err != nil {
+		t.Fatalf("Failed to count attachments: %v", err)
+	}
+	if attCount != 0 {
+		t.Errorf("Expected att-002 to be skipped, got %d rows", attCount)
+	}
+}
+
 func TestSyncAttachments_Empty(t *testing.T) {
 	tmpDir := t.TempDir()
 	dbPath := filepath.Join(tmpDir, "empty_chat.db")
@@ -0,0 +1,89 @@
+package etl
+
+import (
+	"database/sql"
+	"fmt"
+	"strings"
+)
+
+// sqliteMaxVars is the bound-parameter budget per statement. SQLite's default
+// limit is 999; keep some headroom.
+const sqliteMaxVars = 900
+
+// insertOrIgnoreMany inserts rows with multi-row INSERT OR IGNORE statements,
+// chunked to stay under the SQLite variable limit. This replaces one Exec per
+// row with one Exec per chunk for bulk sync paths. Every full chunk has the
+// same SQL text, so when there is more than one it is prepared once and
+// reused; only a short final chunk is compiled separately.
+func insertOrIgnoreMany(tx *sql.Tx, table string, columns []string, rows [][]interface{}) error {
+	if len(rows) == 0 {
+		return nil
+	}
+	if len(columns) == 0 {
+		return fmt.Errorf("no columns")
+	}
+
+	ncols := len(columns)
+	maxRows := sqliteMaxVars / ncols
+	if maxRows < 1 {
+		maxRows = 1
+	}
+
+	prefix := "INSERT OR IGNORE INTO " + table + " (" + strings.Join(columns, ", ") + ") VALUES "
+	tuple := "(" + strings.TrimSuffix(strings.Repeat("?, ", ncols), ", ") + ")"
+
+	var fullStmt *sql.Stmt
+	if len(rows)/maxRows > 1 {
+		stmt, err := tx.Prepare(valuesSQL(prefix, tuple, maxRows, ""))
+		if err != nil {
+			return err
+		}
+		defer stmt.Close()
+		fullStmt = stmt
+	}
+
+	args := make([]interface{}, 0, min(len(rows), maxRows)*ncols)
+	for start := 0; start < len(rows); start += maxRows {
+		end := start + maxRows
+		if end > len(rows) {
+			end = len(rows)
+		}
+		chunk := rows[start:end]
+
+		args = args[:0]
+		for _, row := range chunk {
+			if len(row) != ncols {
+				return fmt.Errorf("row has %d values, want %d", len(row), ncols)
+			}
+			args = append(args, row...)
+		}
+
+		var err error
+		if fullStmt != nil && len(chunk) == maxRows {
+			_, err = fullStmt.Exec(args...)
+		} else {
+			_, err = tx.Exec(valuesSQL(prefix, tuple, len(chunk), ""), args...)
+		}
+		if err != nil {
+			return err
+		}
+	}
+
+	return nil
+}
+
+// valuesSQL returns prefix followed by n comma-separated copies of tuple and
+// then suffix, i.e. the text of a multi-row VALUES statement.
+func valuesSQL(prefix, tuple string, n int, suffix string) string {
+	var b strings.Builder
+	b.Grow(len(prefix) + n*(len(tuple)+1) + len(suffix))
+	b.WriteString(prefix)
+	for i := 0; i < n; i++ {
+		if i > 0 {
+			b.WriteString(",")
+		}
+		b.WriteString(tuple)
+	}
+	b.WriteString(suffix)
+	return b.String()
+}
@@ -0,0 +1,53 @@
+package etl
+
+import (
+	"database/sql"
+	"path/filepath"
+	"testing"
+
+	_ "github.com/mattn/go-sqlite3"
+)
+
+func TestInsertOrIgnoreMany_ChunksAndIgnoresDuplicates(t *testing.T) {
+	db, err := sql.Open("sqlite3", filepath.Join(t.TempDir(), "eve.db"))
+	if err != nil {
+		t.Fatalf("Failed to open test DB: %v", err)
+	}
+	defer db.Close()
+
+	if _, err := db.Exec(`CREATE TABLE chat_participants (chat_id INTEGER, contact_id INTEGER, UNIQUE(chat_id, contact_id))`); err != nil {
+		t.Fatalf("Failed to create table: %v", err)
+	}
+
+	// 1000 rows * 2 columns exceeds a single statement's variable budget.
+	var rows [][]interface{}
+	for i := 0; i < 1000; i++ {
+		rows = append(rows, []interface{}{i % 10, i})
+	}
+	rows = append(rows, []interface{}{0, 0}) // duplicate
+
+	tx, err := db.Begin()
+	if err != nil {
+		t.Fatalf("Failed to begin tx: %v", err)
+	}
+	if err := insertOrIgnoreMany(tx, "chat_participants", []string{"chat_id", "contact_id"}, rows); err != nil {
+		t.Fatalf("insertOrIgnoreMany failed: %v", err)
+	}
+	if err := tx.Commit(); err != nil {
+		t.Fatalf("Failed to commit: %v", err)
+	}
+
+	var count int
+	if err := db.QueryRow(`SELECT COUNT(*) FROM chat_participants`).Scan(&count); err != nil {
+		t.Fatalf("Failed to count rows: %v", err)
+	}
+	if count != 1000 {
+		t.Errorf("Expected 1000 rows, got %d", count)
+	}
+}
+
+func TestValuesSQL(t *testing.T) {
+	if got, want := valuesSQL("INSERT INTO t (a, b) VALUES ", "(?, ?)", 3, " RETURNING id"), "INSERT INTO t (a, b) VALUES (?, ?),(?, ?),(?, ?) RETURNING id"; got != want {
+		t.Errorf("valuesSQL() = %q, want %q", got, want)
+	}
+}
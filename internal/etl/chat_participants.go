@@ -42,27 +42,24 @@ func SyncChatParticipants(chatDB *ChatDB, warehouseDB *sql.DB) (int, error) {
 		return 0, fmt.Errorf("failed to build chat map: %w", err)
 	}
 
-	synced := 0
+	rows := make([][]interface{}, 0, len(participants))
 	for _, p := range participants {
 		warehouseChatID, ok := chatMap[p.ChatIdentifier]
 		if !ok {
 			// Chat wasn't loaded; should be rare if SyncChats ran
 			continue
 		}
-		if _, err := tx.Exec(
-			`INSERT OR IGNORE INTO chat_participants (chat_id, contact_id) VALUES (?, ?)`,
-			warehouseChatID,
-			p.HandleID,
-		); err != nil {
-			return 0, fmt.Errorf("failed to insert chat_participant (chat=%d, contact=%d): %w", warehouseChatID, p.HandleID, err)
-		}
-		synced++
+		rows = append(rows, []interface{}{warehouseChatID, p.HandleID})
+	}
+
+	if err := insertOrIgnoreMany(tx, "chat_participants", []string{"chat_id", "contact_id"}, rows); err != nil {
+		return 0, fmt.Errorf("failed to insert chat_participants: %w", err)
 	}
 
 	if err := tx.Commit(); err != nil {
 		return 0, fmt.Errorf("failed to commit transaction: %w", err)
 	}
-	return synced, nil
+	return len(rows), nil
 }
 
 // GetChatParticipants extracts (chat_identifier, handle_id) from chat.db.
@@ -10,6 +10,10 @@ import (
 	_ "github.com/mattn/go-sqlite3"
 )
 
+// appleEpoch is the reference date for chat.db timestamps, which are stored as
+// nanoseconds since 2001-01-01 00:00:00 UTC.
+var appleEpoch = time.Date(2001, 1, 1, 0, 0, 0, 0, time.UTC)
+
 // ChatDB handles read-only access to the macOS Messages chat.db
 type ChatDB struct {
 	db *sql.DB
@@ -21,6 +25,8 @@ type MessageCount struct {
 	MaxRowID      int64     `json:"max_rowid"`
 	OldestDate    time.Time `json:"oldest_date,omitempty"`
 	NewestDate    time.Time `json:"newest_date,omitempty"`
+	TotalChats    int       `json:"total_chats"`
+	TotalHandles  int       `json:"total_handles"`
 }
 
 // GetChatDBPath returns the path to the macOS Messages chat.db
@@ -84,7 +90,8 @@ func (c *ChatDB) Close() error {
 	return nil
 }
 
-// CountMessages returns statistics about messages in chat.db
+// CountMessages returns statistics about messages in chat.db, along with the
+// total chat and handle counts, in a single query.
 // If sinceRowID > 0, only counts messages with ROWID > sinceRowID
 func (c *ChatDB) CountMessages(sinceRowID int64) (*MessageCount, error) {
 	query := `
@@ -92,7 +99,9 @@ func (c *ChatDB) CountMessages(sinceRowID int64) (*MessageCount, error) {
 			COUNT(*) as total,
 			COALESCE(MAX(ROWID), 0) as max_rowid,
 			MIN(date) as oldest_date,
-			MAX(date) as newest_date
+			MAX(date) as newest_date,
+			(SELECT COUNT(*) FROM chat) as total_chats,
+			(SELECT COUNT(*) FROM handle) as total_handles
 		FROM message
 	`
 
@@ -110,15 +119,14 @@ func (c *ChatDB) CountMessages(sinceRowID int64) (*MessageCount, error) {
 		&count.MaxRowID,
 		&oldestNano,
 		&newestNano,
+		&count.TotalChats,
+		&count.TotalHandles,
 	)
 	if err != nil {
 		return nil, fmt.Errorf("failed to count messages: %w", err)
 	}
 
 	// Convert Apple timestamps (nanoseconds since 2001-01-01) to Go time
-	// Apple epoch: 2001-01-01 00:00:00 UTC
-	appleEpoch := time.Date(2001, 1, 1, 0, 0, 0, 0, time.UTC)
-
 	if oldestNano.Valid && oldestNano.Int64 > 0 {
 		count.OldestDate = appleEpoch.Add(time.Duration(oldestNano.Int64) * time.Nanosecond)
 	}
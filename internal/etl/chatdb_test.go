@@ -132,6 +132,10 @@ func TestCountMessages(t *testing.T) {
 		t.Errorf("Expected max ROWID 5, got %d", count.MaxRowID)
 	}
 
+	if count.TotalChats != 1 || count.TotalHandles != 1 {
+		t.Errorf("Expected 1 chat and 1 handle, got %d and %d", count.TotalChats, count.TotalHandles)
+	}
+
 	if count.OldestDate.IsZero() {
 		t.Error("Expected non-zero oldest date")
 	}
@@ -2,6 +2,7 @@ package etl
 
 import (
 	"database/sql"
+	"encoding/json"
 	"fmt"
 )
 
@@ -30,9 +31,16 @@ func SyncChats(chatDB *ChatDB, warehouseDB *sql.DB) (int, error) {
 	}
 	defer tx.Rollback()
 
+	// Prepare the upsert once; it runs for every chat.
+	upsertStmt, err := tx.Prepare(upsertChatSQL)
+	if err != nil {
+		return 0, fmt.Errorf("failed to prepare chat upsert: %w", err)
+	}
+	defer upsertStmt.Close()
+
 	// Insert chats
 	for _, chat := range chats {
-		if err := insertChat(tx, &chat); err != nil {
+		if err := insertChat(upsertStmt, &chat); err != nil {
 			return 0, fmt.Errorf("failed to insert chat %d: %w", chat.ROWID, err)
 		}
 	}
@@ -74,9 +82,20 @@ func (c *ChatDB) GetChats() ([]Chat, error) {
 	return chats, nil
 }
 
+// upsertChatSQL inserts a chat into the chats table.
+// Idempotent via chat_identifier UNIQUE constraint.
+const upsertChatSQL = `
+	INSERT INTO chats (id, chat_identifier, chat_name, service_name, is_group, created_date)
+	VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+	ON CONFLICT(chat_identifier) DO UPDATE SET
+		chat_name = excluded.chat_name,
+		service_name = excluded.service_name,
+		is_group = excluded.is_group
+`
+
 // insertChat inserts a chat into the chats table
 // Uses the chat ROWID as the chat id for foreign key consistency
-func insertChat(tx *sql.Tx, chat *Chat) error {
+func insertChat(upsertStmt *sql.Stmt, chat *Chat) error {
 	// Determine if this is a group chat
 	// In iMessage, style = 43 is group chat, style = 45 is 1:1
 	isGroup := chat.Style == 43
@@ -92,20 +111,44 @@ func insertChat(tx *sql.Tx, chat *Chat) error {
 		serviceName = chat.ServiceName.String
 	}
 
-	// Insert into chats table
-	// Idempotent via chat_identifier UNIQUE constraint
-	query := `
-		INSERT INTO chats (id, chat_identifier, chat_name, service_name, is_group, created_date)
-		VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-		ON CONFLICT(chat_identifier) DO UPDATE SET
-			chat_name = excluded.chat_name,
-			service_name = excluded.service_name,
-			is_group = excluded.is_group
-	`
-
-	if _, err := tx.Exec(query, chat.ROWID, chat.ChatIdentifier, chatName, serviceName, isGroup); err != nil {
+	if _, err := upsertStmt.Exec(chat.ROWID, chat.ChatIdentifier, chatName, serviceName, isGroup); err != nil {
 		return fmt.Errorf("failed to insert chat: %w", err)
 	}
 
 	return nil
 }
+
+// refreshChatStatsSQL recomputes the chats.total_messages and
+// chats.last_message_date roll-ups for the chats bound as a JSON array of IDs.
+// Both aggregates are answered from idx_messages_chat_timestamp, so the cost is
+// proportional to the touched chats, not the whole messages table.
+const refreshChatStatsSQL = `
+	UPDATE chats SET
+		total_messages = (SELECT COUNT(*) FROM messages WHERE chat_id = chats.id),
+		last_message_date = (
+			SELECT strftime('%Y-%m-%dT%H:%M:%SZ', MAX(timestamp))
+			FROM messages
+			WHERE chat_id = chats.id
+		)
+	WHERE id IN (SELECT value FROM json_each(?))
+`
+
+// refreshChatStats brings the per-chat message roll-ups up to date for
+// chatIDs so chat listings read them instead of aggregating messages.
+func refreshChatStats(tx *sql.Tx, chatIDs map[int64]struct{}) error {
+	if len(chatIDs) == 0 {
+		return nil
+	}
+	ids := make([]int64, 0, len(chatIDs))
+	for id := range chatIDs {
+		ids = append(ids, id)
+	}
+	idsJSON, err := json.Marshal(ids)
+	if err != nil {
+		return fmt.Errorf("failed to encode chat ids: %w", err)
+	}
+	if _, err := tx.Exec(refreshChatStatsSQL, string(idsJSON)); err != nil {
+		return fmt.Errorf("failed to refresh chat stats: %w", err)
+	}
+	return nil
+}
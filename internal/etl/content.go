@@ -38,6 +38,12 @@ func normalizeIdentifier(identifier string) (normalized string, typ string) {
 	return normalizePhoneNumber(id), "phone"
 }
 
+var (
+	markerNSNumber     = []byte("NSNumber")
+	markerNSString     = []byte("NSString")
+	markerNSDictionary = []byte("NSDictionary")
+)
+
 // decodeAttributedBody mirrors the (admittedly hacky) ChatStats decode_attributed_body()
 // behavior, which is optimized for the common macOS Messages typedstream payloads.
 //
@@ -49,38 +55,30 @@ func decodeAttributedBody(attributedBody []byte) string {
 	}
 
 	// NOTE: Python used .decode('utf-8', errors='surrogateescape') and then searched
-	// for ASCII markers. In Go, treating bytes as string preserves raw bytes for
-	// substring search of ASCII markers.
-	s := string(attributedBody)
-
-	if !strings.Contains(s, "NSNumber") {
-		return ""
-	}
+	// for ASCII markers. Searching the raw bytes for the ASCII markers is
+	// equivalent; only the extracted span is converted to a string.
+	b := attributedBody
 
 	// Take everything before NSNumber
-	if idx := strings.Index(s, "NSNumber"); idx >= 0 {
-		s = s[:idx]
+	idx := bytes.Index(b, markerNSNumber)
+	if idx < 0 {
+		return ""
 	}
+	b = b[:idx]
 
 	// Take everything after NSString
-	if !strings.Contains(s, "NSString") {
-		return ""
-	}
-	parts := strings.SplitN(s, "NSString", 2)
-	if len(parts) != 2 {
+	idx = bytes.Index(b, markerNSString)
+	if idx < 0 {
 		return ""
 	}
-	s = parts[1]
+	b = b[idx+len(markerNSString):]
 
 	// Take everything before NSDictionary
-	if !strings.Contains(s, "NSDictionary") {
-		return ""
-	}
-	parts = strings.SplitN(s, "NSDictionary", 2)
-	if len(parts) != 2 {
+	idx = bytes.Index(b, markerNSDictionary)
+	if idx < 0 {
 		return ""
 	}
-	s = parts[0]
+	s := string(b[:idx])
 
 	// ChatStats slices [6:-12] and then .strip()
 	runes := []rune(s)
@@ -0,0 +1,30 @@
+package etl
+
+import "testing"
+
+func TestDecodeAttributedBody(t *testing.T) {
+	tests := []struct {
+		name string
+		body string
+		want string
+	}{
+		{
+			name: "extracts string between markers",
+			body: "streamtypedNSString123456Hello worldabcdefghijklNSDictionaryxxNSNumber",
+			want: "Hello world",
+		},
+		{name: "missing NSNumber", body: "NSString123456Hello worldabcdefghijklNSDictionary", want: ""},
+		{name: "missing NSString", body: "123456Hello worldabcdefghijklNSDictionaryNSNumber", want: ""},
+		{name: "NSDictionary after NSNumber", body: "NSString123456HelloNSNumberNSDictionary", want: ""},
+		{name: "short span is trimmed only", body: "NSString  hi  NSDictionaryNSNumber", want: "hi"},
+		{name: "empty", body: "", want: ""},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			if got := decodeAttributedBody([]byte(tt.body)); got != tt.want {
+				t.Fatalf("decodeAttributedBody() = %q, want %q", got, tt.want)
+			}
+		})
+	}
+}
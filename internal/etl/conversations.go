@@ -2,7 +2,10 @@ package etl
 
 import (
 	"database/sql"
+	"encoding/json"
 	"fmt"
+	"sort"
+	"strings"
 	"time"
 )
 
@@ -56,25 +59,20 @@ func BuildConversations(warehouseDB *sql.DB) (int, error) {
 	}
 	defer tx.Rollback()
 
-	totalConversations := 0
-
-	// Process each chat
-	for chatID, messages := range messagesByChat {
-		conversations := groupMessagesIntoConversations(messages, DefaultGapThresholdSeconds)
-
-		// Insert conversations and update message references
-		for _, conv := range conversations {
-			convID, err := insertConversation(tx, &conv)
-			if err != nil {
-				return 0, fmt.Errorf("failed to insert conversation for chat %d: %w", chatID, err)
-			}
-
-			// Update messages to reference this conversation
-			if err := assignMessagesToConversation(tx, conv.MessageIDs, convID); err != nil {
-				return 0, fmt.Errorf("failed to assign messages to conversation %d: %w", convID, err)
-			}
+	var conversations []conversationGroup
+	for _, messages := range messagesByChat {
+		conversations = append(conversations, groupMessagesIntoConversations(messages, DefaultGapThresholdSeconds)...)
+	}
 
-			totalConversations++
+	// Insert every conversation in a few multi-row statements, then point
+	// each conversation's messages at it.
+	convIDs, err := insertConversations(tx, conversations)
+	if err != nil {
+		return 0, err
+	}
+	for i := range conversations {
+		if err := assignMessagesToConversation(tx, conversations[i].MessageIDs, convIDs[i]); err != nil {
+			return 0, fmt.Errorf("failed to assign messages to conversation %d: %w", convIDs[i], err)
 		}
 	}
 
@@ -82,7 +80,7 @@ func BuildConversations(warehouseDB *sql.DB) (int, error) {
 		return 0, fmt.Errorf("failed to commit transaction: %w", err)
 	}
 
-	return totalConversations, nil
+	return len(conversations), nil
 }
 
 // conversationGroup holds messages that belong to a single conversation
@@ -185,49 +183,89 @@ func getMessagesForConversations(db *sql.DB) (map[int64][]MessageForConversation
 	return messagesByChat, nil
 }
 
-// insertConversation inserts a conversation and returns its ID
-func insertConversation(tx *sql.Tx, conv *conversationGroup) (int64, error) {
-	query := `
-		INSERT INTO conversations (
-			chat_id,
-			initiator_id,
-			start_time,
-			end_time,
-			message_count,
-			gap_threshold
-		) VALUES (?, ?, ?, ?, ?, ?)
-	`
-
-	result, err := tx.Exec(query,
-		conv.ChatID,
-		conv.InitiatorID,
-		conv.StartTime,
-		conv.EndTime,
-		conv.MessageCount,
-		DefaultGapThresholdSeconds,
-	)
-	if err != nil {
-		return 0, fmt.Errorf("failed to insert conversation: %w", err)
+// conversationColumns are the columns insertConversations writes, in the order
+// of each row's values.
+var conversationColumns = []string{"chat_id", "initiator_id", "start_time", "end_time", "message_count", "gap_threshold"}
+
+// insertConversations inserts convs with multi-row INSERT ... RETURNING id
+// statements, chunked to stay under the SQLite variable limit, and returns the
+// new IDs in the same order as convs. This replaces one Exec and
+// LastInsertId per conversation with one statement per chunk.
+func insertConversations(tx *sql.Tx, convs []conversationGroup) ([]int64, error) {
+	ids := make([]int64, 0, len(convs))
+	if len(convs) == 0 {
+		return ids, nil
 	}
 
-	id, err := result.LastInsertId()
-	if err != nil {
-		return 0, fmt.Errorf("failed to get conversation ID: %w", err)
+	ncols := len(conversationColumns)
+	maxRows := sqliteMaxVars / ncols
+	prefix := "INSERT INTO conversations (" + strings.Join(conversationColumns, ", ") + ") VALUES "
+	tuple := "(" + strings.TrimSuffix(strings.Repeat("?, ", ncols), ", ") + ")"
+
+	for start := 0; start < len(convs); start += maxRows {
+		end := start + maxRows
+		if end > len(convs) {
+			end = len(convs)
+		}
+		chunk := convs[start:end]
+
+		args := make([]interface{}, 0, len(chunk)*ncols)
+		for i := range chunk {
+			conv := &chunk[i]
+			args = append(args, conv.ChatID, conv.InitiatorID, conv.StartTime, conv.EndTime, conv.MessageCount, DefaultGapThresholdSeconds)
+		}
+
+		rows, err := tx.Query(valuesSQL(prefix, tuple, len(chunk), " RETURNING id"), args...)
+		if err != nil {
+			return nil, fmt.Errorf("failed to insert conversations: %w", err)
+		}
+		chunkIDs := make([]int64, 0, len(chunk))
+		for rows.Next() {
+			var id int64
+			if err := rows.Scan(&id); err != nil {
+				rows.Close()
+				return nil, fmt.Errorf("failed to scan conversation ID: %w", err)
+			}
+			chunkIDs = append(chunkIDs, id)
+		}
+		rows.Close()
+		if err := rows.Err(); err != nil {
+			return nil, fmt.Errorf("failed to insert conversations: %w", err)
+		}
+		if len(chunkIDs) != len(chunk) {
+			return nil, fmt.Errorf("inserted %d conversations, got %d IDs", len(chunk), len(chunkIDs))
+		}
+
+		// RETURNING rows come back in no guaranteed order, but the rows of one
+		// INSERT get ascending AUTOINCREMENT IDs in VALUES order.
+		sort.Slice(chunkIDs, func(i, j int) bool { return chunkIDs[i] < chunkIDs[j] })
+		ids = append(ids, chunkIDs...)
 	}
 
-	return id, nil
+	return ids, nil
 }
 
+// assignMessagesToConversationSQL points the messages whose IDs are bound as a
+// JSON array at a conversation. The IDs are one bound parameter, so a
+// conversation of any size is a single statement.
+const assignMessagesToConversationSQL = `
+	UPDATE messages SET conversation_id = ?
+	WHERE id IN (SELECT value FROM json_each(?))
+`
+
 // assignMessagesToConversation updates message records to reference a conversation
+// with one UPDATE for all of messageIDs rather than one per message.
 func assignMessagesToConversation(tx *sql.Tx, messageIDs []int64, conversationID int64) error {
-	query := `UPDATE messages SET conversation_id = ? WHERE id = ?`
-
-	for _, msgID := range messageIDs {
-		if _, err := tx.Exec(query, conversationID, msgID); err != nil {
-			return fmt.Errorf("failed to update message %d: %w", msgID, err)
-		}
+	if len(messageIDs) == 0 {
+		return nil
+	}
+	idsJSON, err := json.Marshal(messageIDs)
+	if err != nil {
+		return fmt.Errorf("failed to encode message ids: %w", err)
+	}
+	if _, err := tx.Exec(assignMessagesToConversationSQL, conversationID, string(idsJSON)); err != nil {
+		return fmt.Errorf("failed to update messages %d-%d: %w", messageIDs[0], messageIDs[len(messageIDs)-1], err)
 	}
-
 	return nil
 }
 
@@ -2,6 +2,7 @@ package etl
 
 import (
 	"database/sql"
+	"fmt"
 	"path/filepath"
 	"testing"
 	"time"
@@ -432,3 +433,89 @@ func TestBuildConversations_NullSenderID(t *testing.T) {
 		t.Errorf("Expected NULL initiator_id for is_from_me conversation, got %d", initiatorID.Int64)
 	}
 }
+
+func TestAssignMessagesToConversation_LargeConversations(t *testing.T) {
+	db := createTestWarehouseDBForConversations(t)
+	defer db.Close()
+
+	insertTestChat(t, db, 1, "chat1", "Chat 1", false)
+
+	// More messages than would fit in one statement's variable budget as
+	// individual parameters.
+	n := sqliteMaxVars + 50
+	baseTime := time.Date(2025, 1, 1, 10, 0, 0, 0, time.UTC)
+	ids := make([]int64, 0, n)
+	for i := 0; i < n; i++ {
+		res, err := db.Exec(
+			"INSERT INTO messages (chat_id, content, timestamp, guid) VALUES (?, ?, ?, ?)",
+			1, "m", baseTime.Add(time.Duration(i)*time.Second), fmt.Sprintf("guid-%d", i),
+		)
+		if err != nil {
+			t.Fatalf("Failed to insert message: %v", err)
+		}
+		id, _ := res.LastInsertId()
+		ids = append(ids, id)
+	}
+
+	tx, err := db.Begin()
+	if err != nil {
+		t.Fatalf("Failed to begin transaction: %v", err)
+	}
+	if err := assignMessagesToConversation(tx, ids, 42); err != nil {
+		tx.Rollback()
+		t.Fatalf("assignMessagesToConversation failed: %v", err)
+	}
+	if err := tx.Commit(); err != nil {
+		t.Fatalf("Failed to commit: %v", err)
+	}
+
+	var assigned int
+	if err := db.QueryRow("SELECT COUNT(*) FROM messages WHERE conversation_id = 42").Scan(&assigned); err != nil {
+		t.Fatalf("Failed to count messages: %v", err)
+	}
+	if assigned != n {
+		t.Errorf("Expected %d messages assigned, got %d", n, assigned)
+	}
+}
+
+func TestInsertConversations_ReturnsIDsInOrderAcrossChunks(t *testing.T) {
+	db := createTestWarehouseDBForConversations(t)
+	defer db.Close()
+
+	insertTestChat(t, db, 1, "chat1", "Chat 1", false)
+
+	// Enough conversations to span several multi-row statements.
+	n := 2*(sqliteMaxVars/len(conversationColumns)) + 7
+	baseTime := time.Date(2025, 1, 1, 10, 0, 0, 0, time.UTC)
+	convs := make([]conversationGroup, n)
+	for i := range convs {
+		ts := baseTime.Add(time.Duration(i) * 24 * time.Hour)
+		convs[i] = conversationGroup{ChatID: 1, StartTime: ts, EndTime: ts, MessageCount: i + 1}
+	}
+
+	tx, err := db.Begin()
+	if err != nil {
+		t.Fatalf("Failed to begin transaction: %v", err)
+	}
+	ids, err := insertConversations(tx, convs)
+	if err != nil {
+		tx.Rollback()
+		t.Fatalf("insertConversations failed: %v", err)
+	}
+	if err := tx.Commit(); err != nil {
+		t.Fatalf("Failed to commit: %v", err)
+	}
+
+	if len(ids) != n {
+		t.Fatalf("Expected %d IDs, got %d", n, len(ids))
+	}
+	for i, id := range ids {
+		var messageCount int
+		if err := db.QueryRow("SELECT message_count FROM conversations WHERE id = ?", id).Scan(&messageCount); err != nil {
+			t.Fatalf("Failed to read conversation %d: %v", id, err)
+		}
+		if messageCount != i+1 {
+			t.Errorf("ids[%d] = %d has message_count %d, want %d", i, id, messageCount, i+1)
+		}
+	}
+}
@@ -359,3 +359,67 @@ func TestInsertHandle_ContactIDMapping(t *testing.T) {
 		}
 	}
 }
+
+func TestInsertHandle_ReusesExistingContact(t *testing.T) {
+	warehouseDB := createTestWarehouseDBWithContacts(t)
+	defer warehouseDB.Close()
+
+	// Two contacts already linked to identifiers: one with a placeholder name,
+	// one with a real name.
+	if _, err := warehouseDB.Exec(`
+		INSERT INTO contacts (id, name) VALUES (100, '5551234'), (200, 'Alice');
+		INSERT INTO contact_identifiers (contact_id, identifier, type) VALUES
+			(100, 'bob@example.com', 'email'),
+			(200, 'alice@example.com', 'email');
+	`); err != nil {
+		t.Fatalf("Failed to seed contacts: %v", err)
+	}
+
+	tx, err := warehouseDB.Begin()
+	if err != nil {
+		t.Fatalf("Failed to begin tx: %v", err)
+	}
+	stmts, err := prepareHandleStmts(tx)
+	if err != nil {
+		t.Fatalf("prepareHandleStmts failed: %v", err)
+	}
+	for _, h := range []Handle{{ROWID: 1, ID: "Bob@Example.com"}, {ROWID: 2, ID: "alice@example.com"}} {
+		if err := insertHandle(stmts, &h); err != nil {
+			t.Fatalf("insertHandle(%q) failed: %v", h.ID, err)
+		}
+	}
+	stmts.Close()
+	if err := tx.Commit(); err != nil {
+		t.Fatalf("Failed to commit: %v", err)
+	}
+
+	var count int
+	if err := warehouseDB.QueryRow(`SELECT COUNT(*) FROM contacts`).Scan(&count); err != nil {
+		t.Fatalf("Failed to count contacts: %v", err)
+	}
+	if count != 2 {
+		t.Errorf("Expected existing contacts to be reused, got %d contacts", count)
+	}
+
+	names := map[int64]string{}
+	rows, err := warehouseDB.Query(`SELECT id, name FROM contacts`)
+	if err != nil {
+		t.Fatalf("Failed to query contacts: %v", err)
+	}
+	defer rows.Close()
+	for rows.Next() {
+		var id int64
+		var name string
+		if err := rows.Scan(&id, &name); err != nil {
+			t.Fatalf("Failed to scan contact: %v", err)
+		}
+		names[id] = name
+	}
+
+	if names[100] != "bob@example.com" {
+		t.Errorf("Expected placeholder name to be replaced, got %q", names[100])
+	}
+	if names[200] != "Alice" {
+		t.Errorf("Expected real name to be kept, got %q", names[200])
+	}
+}
@@ -2,6 +2,7 @@ package etl
 
 import (
 	"database/sql"
+	"encoding/json"
 	"fmt"
 	"time"
 )
@@ -137,7 +138,6 @@ func insertMembershipEvent(tx *sql.Tx, chatMap map[string]int64, handleMap map[i
 	}
 
 	// Convert Apple timestamp to Go time
-	appleEpoch := time.Date(2001, 1, 1, 0, 0, 0, 0, time.UTC)
 	timestamp := appleEpoch.Add(time.Duration(action.Date) * time.Nanosecond)
 
 	resolveContactID := func(handleID sql.NullInt64) *int64 {
@@ -224,33 +224,64 @@ func insertMembershipEvent(tx *sql.Tx, chatMap map[string]int64, handleMap map[i
 	return nil
 }
 
+// handleContactsSQL resolves chat.db handles to warehouse contacts in one
+// statement. The handles are bound as a JSON array of handleRef objects and
+// each one is a seek on UNIQUE(identifier, type).
+const handleContactsSQL = `
+	SELECT json_extract(h.value, '$.rowid'), ci.contact_id
+	FROM json_each(?) h
+	JOIN contact_identifiers ci
+	  ON ci.identifier = json_extract(h.value, '$.identifier')
+	 AND ci.type = json_extract(h.value, '$.type')
+`
+
+// handleRef is a chat.db handle with its normalized identifier, as bound to
+// handleContactsSQL.
+type handleRef struct {
+	ROWID      int64  `json:"rowid"`
+	Identifier string `json:"identifier"`
+	Type       string `json:"type"`
+}
+
+// loadWarehouseHandleMap maps chat.db handle ROWIDs to warehouse contact IDs.
+// Handles without a matching contact identifier are absent.
 func loadWarehouseHandleMap(tx *sql.Tx, chatDB *ChatDB) (map[int64]int64, error) {
 	handles, err := chatDB.GetHandles()
 	if err != nil {
 		return nil, fmt.Errorf("failed to read handles: %w", err)
 	}
 
-	stmt, err := tx.Prepare(`
-		SELECT contact_id
-		FROM contact_identifiers
-		WHERE identifier = ? AND type = ?
-		LIMIT 1
-	`)
-	if err != nil {
-		return nil, fmt.Errorf("failed to prepare handle lookup: %w", err)
-	}
-	defer stmt.Close()
-
-	handleMap := make(map[int64]int64, len(handles))
+	refs := make([]handleRef, 0, len(handles))
 	for _, handle := range handles {
 		normalized, identifierType := normalizeIdentifier(handle.ID)
 		if normalized == "" {
 			continue
 		}
-		var contactID int64
-		if err := stmt.QueryRow(normalized, identifierType).Scan(&contactID); err == nil {
-			handleMap[handle.ROWID] = contactID
+		refs = append(refs, handleRef{ROWID: handle.ROWID, Identifier: normalized, Type: identifierType})
+	}
+	handleMap := make(map[int64]int64, len(refs))
+	if len(refs) == 0 {
+		return handleMap, nil
+	}
+
+	refsJSON, err := json.Marshal(refs)
+	if err != nil {
+		return nil, fmt.Errorf("failed to encode handles: %w", err)
+	}
+	rows, err := tx.Query(handleContactsSQL, string(refsJSON))
+	if err != nil {
+		return nil, fmt.Errorf("failed to look up handle contacts: %w", err)
+	}
+	defer rows.Close()
+	for rows.Next() {
+		var rowID, contactID int64
+		if err := rows.Scan(&rowID, &contactID); err != nil {
+			return nil, fmt.Errorf("failed to scan handle contact: %w", err)
 		}
+		handleMap[rowID] = contactID
+	}
+	if err := rows.Err(); err != nil {
+		return nil, fmt.Errorf("error iterating handle contacts: %w", err)
 	}
 	return handleMap, nil
 }
@@ -27,45 +27,106 @@ type Message struct {
 // Supports incremental sync via sinceRowID watermark
 // Returns the number of messages synced
 func SyncMessages(chatDB *ChatDB, warehouseDB *sql.DB, sinceRowID int64) (int, error) {
-	// Read messages from chat.db (incremental if sinceRowID > 0)
-	messages, err := chatDB.GetMessages(sinceRowID)
-	if err != nil {
-		return 0, fmt.Errorf("failed to read messages: %w", err)
-	}
+	// Messages are streamed from chat.db (incremental if sinceRowID > 0) and
+	// upserted as they are read, so a large backfill never holds the whole
+	// result set in memory. The transaction and lookup maps are only set up
+	// once the first message arrives; an empty incremental sync costs one query.
+	var (
+		tx         *sql.Tx
+		upsertStmt *sql.Stmt
+		handleMap  map[int64]int64
+		chatMap    map[string]int64
+		// touched collects the warehouse chats that received messages so
+		// their stats roll-ups can be refreshed in the same transaction.
+		touched = make(map[int64]struct{})
+	)
+	defer func() {
+		if upsertStmt != nil {
+			upsertStmt.Close()
+		}
+		if tx != nil {
+			tx.Rollback()
+		}
+	}()
 
-	if len(messages) == 0 {
-		return 0, nil
-	}
+	begin := func() error {
+		var err error
+		// Begin transaction for atomic writes
+		tx, err = warehouseDB.Begin()
+		if err != nil {
+			return fmt.Errorf("failed to begin transaction: %w", err)
+		}
 
-	// Begin transaction for atomic writes
-	tx, err := warehouseDB.Begin()
-	if err != nil {
-		return 0, fmt.Errorf("failed to begin transaction: %w", err)
+		handleMap, err = loadWarehouseHandleMap(tx, chatDB)
+		if err != nil {
+			return err
+		}
+
+		chatMap, err = loadWarehouseChatMap(tx)
+		if err != nil {
+			return err
+		}
+
+		// Prepare the upsert once; it runs for every message.
+		upsertStmt, err = tx.Prepare(upsertMessageSQL)
+		if err != nil {
+			return fmt.Errorf("failed to prepare message upsert: %w", err)
+		}
+		return nil
 	}
-	defer tx.Rollback()
 
-	handleMap, err := loadWarehouseHandleMap(tx, chatDB)
+	count := 0
+	err := chatDB.forEachMessage(sinceRowID, func(msg *Message) error {
+		if tx == nil {
+			if err := begin(); err != nil {
+				return err
+			}
+		}
+		if err := insertMessage(upsertStmt, msg, handleMap, chatMap); err != nil {
+			return fmt.Errorf("failed to insert message %d: %w", msg.ROWID, err)
+		}
+		if chatID, ok := chatMap[msg.ChatIdentifier]; ok {
+			touched[chatID] = struct{}{}
+		}
+		count++
+		return nil
+	})
 	if err != nil {
 		return 0, err
 	}
+	if tx == nil {
+		return 0, nil
+	}
 
-	// Insert messages
-	for _, msg := range messages {
-		if err := insertMessage(tx, &msg, handleMap); err != nil {
-			return 0, fmt.Errorf("failed to insert message %d: %w", msg.ROWID, err)
-		}
+	if err := refreshChatStats(tx, touched); err != nil {
+		return 0, err
 	}
 
 	if err := tx.Commit(); err != nil {
 		return 0, fmt.Errorf("failed to commit transaction: %w", err)
 	}
 
-	return len(messages), nil
+	return count, nil
 }
 
 // GetMessages reads messages from chat.db with optional watermark
 // Messages are joined with chat_message_join to get the chat_id
 func (c *ChatDB) GetMessages(sinceRowID int64) ([]Message, error) {
+	var messages []Message
+	err := c.forEachMessage(sinceRowID, func(msg *Message) error {
+		messages = append(messages, *msg)
+		return nil
+	})
+	if err != nil {
+		return nil, err
+	}
+	return messages, nil
+}
+
+// forEachMessage streams the messages GetMessages returns to fn in ROWID
+// order, one row at a time. fn must not retain msg; an error from fn stops
+// the scan and is returned as-is.
+func (c *ChatDB) forEachMessage(sinceRowID int64, fn func(msg *Message) error) error {
 	query := `
 		SELECT
 			m.ROWID,
@@ -108,13 +169,13 @@ func (c *ChatDB) GetMessages(sinceRowID int64) ([]Message, error) {
 
 	rows, err := c.db.Query(query, sinceRowID)
 	if err != nil {
-		return nil, fmt.Errorf("failed to query messages: %w", err)
+		return fmt.Errorf("failed to query messages: %w", err)
 	}
 	defer rows.Close()
 
-	var messages []Message
+	var msg Message
 	for rows.Next() {
-		var msg Message
+		msg = Message{}
 		if err := rows.Scan(
 			&msg.ROWID,
 			&msg.GUID,
@@ -130,25 +191,55 @@ func (c *ChatDB) GetMessages(sinceRowID int64) ([]Message, error) {
 			&msg.ChatID,
 			&msg.ChatIdentifier,
 		); err != nil {
-			return nil, fmt.Errorf("failed to scan message: %w", err)
+			return fmt.Errorf("failed to scan message: %w", err)
+		}
+		if err := fn(&msg); err != nil {
+			return err
 		}
-		messages = append(messages, msg)
 	}
 
 	if err := rows.Err(); err != nil {
-		return nil, fmt.Errorf("error iterating messages: %w", err)
+		return fmt.Errorf("error iterating messages: %w", err)
 	}
 
-	return messages, nil
+	return nil
 }
 
-// insertMessage inserts a message into the messages table
+// upsertMessageSQL inserts a message into the messages table.
+// Idempotent via guid UNIQUE constraint.
+const upsertMessageSQL = `
+	INSERT INTO messages (
+		chat_id,
+		sender_id,
+		content,
+		timestamp,
+		is_from_me,
+		message_type,
+		service_name,
+		guid,
+		associated_message_guid,
+		reply_to_guid
+	) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+	ON CONFLICT(guid) DO UPDATE SET
+		chat_id = excluded.chat_id,
+		sender_id = excluded.sender_id,
+		content = excluded.content,
+		timestamp = excluded.timestamp,
+		is_from_me = excluded.is_from_me,
+		message_type = excluded.message_type,
+		service_name = excluded.service_name,
+		associated_message_guid = excluded.associated_message_guid,
+		reply_to_guid = excluded.reply_to_guid
+`
+
+// insertMessage inserts a message into the messages table using the prepared
+// upsertMessageSQL statement.
 // Converts Apple timestamp to Unix timestamp
 // Maps handle_id to sender_id (contact foreign key)
-func insertMessage(tx *sql.Tx, msg *Message, handleMap map[int64]int64) error {
+// Maps chat_identifier to the canonical warehouse chat id via chatMap
+func insertMessage(upsertStmt *sql.Stmt, msg *Message, handleMap map[int64]int64, chatMap map[string]int64) error {
 	// Convert Apple timestamp to Go time
 	// Apple epoch: 2001-01-01 00:00:00 UTC
-	appleEpoch := time.Date(2001, 1, 1, 0, 0, 0, 0, time.UTC)
 	timestamp := appleEpoch.Add(time.Duration(msg.Date) * time.Nanosecond)
 
 	// Extract nullable fields
@@ -190,39 +281,13 @@ func insertMessage(tx *sql.Tx, msg *Message, handleMap map[int64]int64) error {
 	//
 	// Therefore, we must map source chat ROWID -> canonical warehouse chats.id
 	// via chat_identifier; otherwise messages can reference non-existent chats rows.
-	var warehouseChatID int64
-	if err := tx.QueryRow(`SELECT id FROM chats WHERE chat_identifier = ?`, msg.ChatIdentifier).Scan(&warehouseChatID); err != nil {
-		return fmt.Errorf("failed to map chat_identifier to warehouse chat id (chat_identifier=%q): %w", msg.ChatIdentifier, err)
+	// The mapping is loaded once per sync rather than queried per message.
+	warehouseChatID, ok := chatMap[msg.ChatIdentifier]
+	if !ok {
+		return fmt.Errorf("failed to map chat_identifier to warehouse chat id (chat_identifier=%q)", msg.ChatIdentifier)
 	}
 
-	// Insert into messages table
-	// Idempotent via guid UNIQUE constraint
-	query := `
-		INSERT INTO messages (
-			chat_id,
-			sender_id,
-			content,
-			timestamp,
-			is_from_me,
-			message_type,
-			service_name,
-			guid,
-			associated_message_guid,
-			reply_to_guid
-		) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-		ON CONFLICT(guid) DO UPDATE SET
-			chat_id = excluded.chat_id,
-			sender_id = excluded.sender_id,
-			content = excluded.content,
-			timestamp = excluded.timestamp,
-			is_from_me = excluded.is_from_me,
-			message_type = excluded.message_type,
-			service_name = excluded.service_name,
-			associated_message_guid = excluded.associated_message_guid,
-			reply_to_guid = excluded.reply_to_guid
-	`
-
-	if _, err := tx.Exec(query,
+	if _, err := upsertStmt.Exec(
 		warehouseChatID,
 		senderID,
 		content,
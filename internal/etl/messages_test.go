@@ -386,6 +386,47 @@ func TestSyncMessages(t *testing.T) {
 	}
 }
 
+func TestSyncMessages_RefreshesChatStats(t *testing.T) {
+	chatDBPath := createTestChatDBWithMessages(t)
+	chatDB, err := OpenChatDB(chatDBPath)
+	if err != nil {
+		t.Fatalf("Failed to open chat.db: %v", err)
+	}
+	defer chatDB.Close()
+
+	warehouseDB := createTestWarehouseDBWithMessages(t)
+	defer warehouseDB.Close()
+
+	if _, err := SyncMessages(chatDB, warehouseDB, 0); err != nil {
+		t.Fatalf("Failed to sync messages: %v", err)
+	}
+
+	rows, err := warehouseDB.Query(`
+		SELECT c.id, c.total_messages, c.last_message_date IS NOT NULL,
+			(SELECT COUNT(*) FROM messages m WHERE m.chat_id = c.id)
+		FROM chats c
+	`)
+	if err != nil {
+		t.Fatalf("Failed to query chat stats: %v", err)
+	}
+	defer rows.Close()
+
+	for rows.Next() {
+		var chatID int64
+		var total, actual int
+		var hasLast bool
+		if err := rows.Scan(&chatID, &total, &hasLast, &actual); err != nil {
+			t.Fatalf("Failed to scan chat stats: %v", err)
+		}
+		if total != actual {
+			t.Errorf("chat %d: expected total_messages %d, got %d", chatID, actual, total)
+		}
+		if hasLast != (actual > 0) {
+			t.Errorf("chat %d: last_message_date set = %v with %d messages", chatID, hasLast, actual)
+		}
+	}
+}
+
 func TestSyncMessages_Idempotent(t *testing.T) {
 	chatDBPath := createTestChatDBWithMessages(t)
 	chatDB, err := OpenChatDB(chatDBPath)
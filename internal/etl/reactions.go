@@ -118,9 +118,16 @@ func SyncReactions(chatDB *ChatDB, warehouseDB *sql.DB, sinceRowID int64) (int,
 		return 0, err
 	}
 
+	// Prepare the upsert once; it runs for every reaction.
+	upsertStmt, err := tx.Prepare(upsertReactionSQL)
+	if err != nil {
+		return 0, fmt.Errorf("failed to prepare reaction upsert: %w", err)
+	}
+	defer upsertStmt.Close()
+
 	created := 0
 	for _, r := range reactions {
-		if err := insertReaction(tx, chatMap, &r); err != nil {
+		if err := insertReaction(upsertStmt, chatMap, &r); err != nil {
 			return 0, fmt.Errorf("failed to insert reaction %d: %w", r.ROWID, err)
 		}
 		created++
@@ -133,7 +140,28 @@ func SyncReactions(chatDB *ChatDB, warehouseDB *sql.DB, sinceRowID int64) (int,
 	return created, nil
 }
 
-func insertReaction(tx *sql.Tx, chatMap map[string]int64, r *Reaction) error {
+// upsertReactionSQL inserts a reaction into the reactions table.
+// Idempotent via guid UNIQUE constraint.
+const upsertReactionSQL = `
+	INSERT INTO reactions (
+		original_message_guid,
+		timestamp,
+		sender_id,
+		chat_id,
+		reaction_type,
+		is_from_me,
+		guid
+	) VALUES (?, ?, ?, ?, ?, ?, ?)
+	ON CONFLICT(guid) DO UPDATE SET
+		original_message_guid = excluded.original_message_guid,
+		timestamp = excluded.timestamp,
+		sender_id = excluded.sender_id,
+		chat_id = excluded.chat_id,
+		reaction_type = excluded.reaction_type,
+		is_from_me = excluded.is_from_me
+`
+
+func insertReaction(upsertStmt *sql.Stmt, chatMap map[string]int64, r *Reaction) error {
 	reactionType := r.ReactionType
 	if reactionType < 2000 || reactionType > 2005 {
 		if r.Text.Valid && r.Text.String != "" {
@@ -158,7 +186,6 @@ func insertReaction(tx *sql.Tx, chatMap map[string]int64, r *Reaction) error {
 	}
 
 	// Convert Apple timestamp to Go time
-	appleEpoch := time.Date(2001, 1, 1, 0, 0, 0, 0, time.UTC)
 	timestamp := appleEpoch.Add(time.Duration(r.Date) * time.Nanosecond)
 
 	var senderID *int64
@@ -166,26 +193,7 @@ func insertReaction(tx *sql.Tx, chatMap map[string]int64, r *Reaction) error {
 		senderID = &r.HandleID.Int64
 	}
 
-	query := `
-		INSERT INTO reactions (
-			original_message_guid,
-			timestamp,
-			sender_id,
-			chat_id,
-			reaction_type,
-			is_from_me,
-			guid
-		) VALUES (?, ?, ?, ?, ?, ?, ?)
-		ON CONFLICT(guid) DO UPDATE SET
-			original_message_guid = excluded.original_message_guid,
-			timestamp = excluded.timestamp,
-			sender_id = excluded.sender_id,
-			chat_id = excluded.chat_id,
-			reaction_type = excluded.reaction_type,
-			is_from_me = excluded.is_from_me
-	`
-
-	if _, err := tx.Exec(query,
+	if _, err := upsertStmt.Exec(
 		originalGUID,
 		timestamp,
 		senderID,
@@ -3,7 +3,6 @@ package etl
 import (
 	"database/sql"
 	"fmt"
-	"time"
 
 	_ "github.com/mattn/go-sqlite3"
 )
@@ -47,11 +46,9 @@ func GetWatermark(db *sql.DB, source, name string) (*Watermark, error) {
 
 // SetWatermark upserts a watermark in the warehouse DB
 func SetWatermark(db *sql.DB, source, name string, valueInt *int64, valueText *string) error {
-	now := time.Now().Unix()
-
 	query := `
 		INSERT INTO watermarks (source, name, value_int, value_text, updated_ts)
-		VALUES (?, ?, ?, ?, ?)
+		VALUES (?, ?, ?, ?, unixepoch())
 		ON CONFLICT(source, name) DO UPDATE SET
 			value_int = excluded.value_int,
 			value_text = excluded.value_text,
@@ -72,8 +69,6 @@ func SetWatermark(db *sql.DB, source, name string, valueInt *int64, valueText *s
 		args = append(args, nil)
 	}
 
-	args = append(args, now)
-
 	_, err := db.Exec(query, args...)
 	if err != nil {
 		return fmt.Errorf("failed to set watermark: %w", err)
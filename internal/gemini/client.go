@@ -138,6 +138,10 @@ type GenerateContentResponse struct {
 	Candidates     []Candidate     `json:"candidates,omitempty"`
 	PromptFeedback *PromptFeedback `json:"promptFeedback,omitempty"`
 	Error          *APIError       `json:"error,omitempty"`
+
+	// Raw is the response body as received, so callers that persist the
+	// response can store it without re-encoding the decoded struct.
+	Raw json.RawMessage `json:"-"`
 }
 
 type SafetyRating struct {
@@ -271,6 +275,7 @@ func (c *Client) GenerateContentWithContext(ctx context.Context, model string, r
 		}
 
 		// Success
+		result.Raw = respBody
 		return &result, nil
 	}
 
@@ -7,7 +7,6 @@ import (
 	"path"
 	"sort"
 	"strings"
-	"time"
 
 	_ "github.com/mattn/go-sqlite3"
 )
@@ -61,8 +60,18 @@ func runMigrations(dbPath string, fs embed.FS, migrationDir string) error {
 	}
 	sort.Strings(migrationFiles)
 
-	// Execute each migration
+	// Read the applied versions once rather than probing per file; on an
+	// up-to-date database this is the only query the loop needs.
+	applied, err := loadAppliedMigrations(db)
+	if err != nil {
+		return fmt.Errorf("failed to check migration status: %w", err)
+	}
+
+	// Execute each pending migration
 	for _, filename := range migrationFiles {
+		if applied[filename] {
+			continue
+		}
 		if err := executeMigration(db, fs, path.Join(migrationDir, filename), filename); err != nil {
 			return fmt.Errorf("migration %s failed: %w", filename, err)
 		}
@@ -82,19 +91,27 @@ func createMigrationsTable(db *sql.DB) error {
 	return err
 }
 
-// executeMigration runs a single migration if it hasn't been applied
-func executeMigration(db *sql.DB, fs embed.FS, filePath, filename string) error {
-	// Check if already applied
-	var exists bool
-	err := db.QueryRow("SELECT 1 FROM schema_migrations WHERE version = ?", filename).Scan(&exists)
-	if err == nil {
-		// Already applied
-		return nil
+// loadAppliedMigrations returns the set of versions in schema_migrations
+func loadAppliedMigrations(db *sql.DB) (map[string]bool, error) {
+	rows, err := db.Query("SELECT version FROM schema_migrations")
+	if err != nil {
+		return nil, err
 	}
-	if err != sql.ErrNoRows {
-		return fmt.Errorf("failed to check migration status: %w", err)
+	defer rows.Close()
+
+	applied := make(map[string]bool)
+	for rows.Next() {
+		var version string
+		if err := rows.Scan(&version); err != nil {
+			return nil, err
+		}
+		applied[version] = true
 	}
+	return applied, rows.Err()
+}
 
+// executeMigration runs a single migration and records it as applied
+func executeMigration(db *sql.DB, fs embed.FS, filePath, filename string) error {
 	// Read migration file
 	content, err := fs.ReadFile(filePath)
 	if err != nil {
@@ -115,9 +132,8 @@ func executeMigration(db *sql.DB, fs embed.FS, filePath, filename string) error
 
 	// Record migration
 	if _, err := tx.Exec(
-		"INSERT INTO schema_migrations (version, applied_ts) VALUES (?, ?)",
+		"INSERT INTO schema_migrations (version, applied_ts) VALUES (?, unixepoch())",
 		filename,
-		getCurrentTimestamp(),
 	); err != nil {
 		return fmt.Errorf("failed to record migration: %w", err)
 	}
@@ -129,8 +145,3 @@ func executeMigration(db *sql.DB, fs embed.FS, filePath, filename string) error
 
 	return nil
 }
-
-// getCurrentTimestamp returns current Unix timestamp
-func getCurrentTimestamp() int64 {
-	return time.Now().Unix()
-}
@@ -0,0 +1,8 @@
+-- Dead-letter listings filter on type and state = 'dead'. The one such query,
+-- the dead analysis jobs report at the end of test-analysis, runs against the
+-- per-run queue database this migration set is applied to. Without this the
+-- planner walks idx_jobs_type over every analysis job of the run, succeeded
+-- ones included, to find the few dead ones. The partial index holds only
+-- dead jobs, so it costs nothing on the normal enqueue/complete path.
+
+CREATE INDEX IF NOT EXISTS idx_jobs_dead_type ON jobs(type) WHERE state = 'dead';
@@ -0,0 +1,8 @@
+-- Partial index over blocked conversation analyses.
+-- Blocked rows are a small minority of conversation_analyses (almost everything
+-- ends up 'completed'), but status reporting lists them per prompt. Indexing only
+-- those rows keeps the index tiny and lets the listing skip completed rows.
+
+CREATE INDEX IF NOT EXISTS idx_conversation_analyses_blocked
+    ON conversation_analyses(eve_prompt_id, conversation_id)
+    WHERE status = 'blocked';
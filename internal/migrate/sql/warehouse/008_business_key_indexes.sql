@@ -0,0 +1,29 @@
+-- Business-key lookups: one unique index per key.
+--
+-- conversation_analyses is probed by (conversation_id, eve_prompt_id) on every
+-- analysis write, but only had single-column indexes. The writer already keeps
+-- one row per pair (delete-then-insert in one transaction); collapse any older
+-- duplicates to the newest row and enforce it with a unique index so the probe
+-- is a single b-tree lookup. NULL eve_prompt_id rows stay distinct.
+
+DELETE FROM conversation_analyses
+WHERE eve_prompt_id IS NOT NULL
+  AND id NOT IN (
+    SELECT MAX(id) FROM conversation_analyses
+    WHERE eve_prompt_id IS NOT NULL
+    GROUP BY conversation_id, eve_prompt_id
+  );
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_conversation_analyses_conv_prompt
+    ON conversation_analyses(conversation_id, eve_prompt_id);
+
+-- These duplicate the automatic indexes behind UNIQUE constraints (guid,
+-- chat_identifier, and the identifier prefix of UNIQUE(identifier, type)).
+-- They double index maintenance on every ETL write without serving any
+-- lookup the unique index doesn't.
+DROP INDEX IF EXISTS idx_messages_guid;
+DROP INDEX IF EXISTS idx_reactions_guid;
+DROP INDEX IF EXISTS idx_attachments_guid;
+DROP INDEX IF EXISTS idx_membership_events_guid;
+DROP INDEX IF EXISTS idx_chats_identifier;
+DROP INDEX IF EXISTS idx_contact_identifiers_identifier;
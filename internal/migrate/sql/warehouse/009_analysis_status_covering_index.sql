@@ -0,0 +1,15 @@
+-- Covering index for per-prompt analysis status lookups.
+--
+-- Status reporting counts conversation_analyses by status for one prompt over a
+-- set of conversations, reading only (eve_prompt_id, conversation_id, status).
+-- With the status in the index those scans never touch the table. SQLite has
+-- no INCLUDE clause, so the covered column is a trailing key column.
+
+CREATE INDEX IF NOT EXISTS idx_conversation_analyses_prompt_conv_status
+    ON conversation_analyses(eve_prompt_id, conversation_id, status);
+
+-- Both single-column indexes are now left prefixes of a wider index
+-- (eve_prompt_id of the one above, conversation_id of the unique
+-- (conversation_id, eve_prompt_id) index), so they only add write cost.
+DROP INDEX IF EXISTS idx_conversation_analyses_eve_prompt_id;
+DROP INDEX IF EXISTS idx_conversation_analyses_conversation_id;
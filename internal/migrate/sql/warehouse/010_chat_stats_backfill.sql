@@ -0,0 +1,12 @@
+-- chats.total_messages and chats.last_message_date are per-chat roll-ups of
+-- messages that chat listings read directly. Message sync now refreshes them
+-- for every chat it writes to; backfill existing warehouses once so chats
+-- synced before that aren't left at 0 / NULL.
+
+UPDATE chats SET
+    total_messages = (SELECT COUNT(*) FROM messages WHERE chat_id = chats.id),
+    last_message_date = (
+        SELECT strftime('%Y-%m-%dT%H:%M:%SZ', MAX(timestamp))
+        FROM messages
+        WHERE chat_id = chats.id
+    );
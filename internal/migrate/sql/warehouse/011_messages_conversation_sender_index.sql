@@ -0,0 +1,10 @@
+-- Per-conversation sender lookups (the consolidated analysis query collects
+-- the distinct senders of each conversation) only need conversation_id and
+-- sender_id. A composite index answers them without touching message rows,
+-- and it serves every conversation_id-only lookup the old single-column
+-- index did, so that one is dropped rather than maintained twice.
+
+CREATE INDEX IF NOT EXISTS idx_messages_conversation_sender
+    ON messages(conversation_id, sender_id);
+
+DROP INDEX IF EXISTS idx_messages_conversation_id;
@@ -0,0 +1,11 @@
+-- Conversation hydration (the analysis reader, the context engine and the
+-- encoder) reads a conversation's messages with
+-- WHERE conversation_id = ? ORDER BY timestamp. With only single-column
+-- indexes that was an index lookup followed by a sort of every message. The
+-- composite index returns them already in timeline order.
+CREATE INDEX IF NOT EXISTS idx_messages_conversation_timestamp
+    ON messages(conversation_id, timestamp);
+
+-- chat_id lookups on conversations are served by the leading column of
+-- idx_conversations_chat_start; the single-column index only costs writes.
+DROP INDEX IF EXISTS idx_conversations_chat_id;
@@ -0,0 +1,5 @@
+-- Embedding lookups by entity are served by the automatic index behind
+-- UNIQUE(entity_type, entity_id, model), whose leading columns are exactly
+-- (entity_type, entity_id). The separate index only doubles index maintenance
+-- on every embedding upsert.
+DROP INDEX IF EXISTS idx_embeddings_entity;
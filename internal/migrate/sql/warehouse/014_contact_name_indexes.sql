@@ -0,0 +1,9 @@
+-- Contact name lookups.
+--
+-- The analysis writer resolves every entity name with contacts.name = ? and
+-- then contacts.nickname = ?, and the CLI resolves --contact by exact name
+-- before falling back to a substring match. Neither column was indexed, so
+-- each probe scanned the whole contacts table.
+
+CREATE INDEX IF NOT EXISTS idx_contacts_name ON contacts(name);
+CREATE INDEX IF NOT EXISTS idx_contacts_nickname ON contacts(nickname);
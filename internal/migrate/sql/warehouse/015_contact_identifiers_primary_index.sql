@@ -0,0 +1,11 @@
+-- A contact's display identifier is picked with
+--   WHERE contact_id = ? ORDER BY is_primary DESC LIMIT 1
+-- once per row by the adapter's message, reaction and membership queries.
+-- On idx_contact_identifiers_contact that sorted the contact's identifiers in
+-- a temp b-tree every time. With is_primary in the index the first entry is
+-- the answer. The new index covers every contact_id lookup the old one served.
+
+CREATE INDEX IF NOT EXISTS idx_contact_identifiers_contact_primary
+    ON contact_identifiers(contact_id, is_primary DESC);
+
+DROP INDEX IF EXISTS idx_contact_identifiers_contact;
@@ -7,6 +7,8 @@ import (
 	"os"
 	"path/filepath"
 	"strings"
+	"sync"
+	"time"
 
 	"gopkg.in/yaml.v3"
 )
@@ -14,9 +16,20 @@ import (
 //go:embed embedded_prompts embedded_packs
 var embeddedFS embed.FS
 
+// indexTTL bounds how long LoadPrompt and LoadPack reuse a parsed index before
+// walking the resources again, so edits to an override directory are picked
+// up by long-running processes.
+const indexTTL = 30 * time.Second
+
 // Loader manages loading prompts and packs from embedded FS or override directory
 type Loader struct {
 	resourcesDir string
+
+	mu        sync.Mutex
+	prompts   map[string]Prompt
+	promptsAt time.Time
+	packs     map[string]Pack
+	packsAt   time.Time
 }
 
 // NewLoader creates a new resource loader
@@ -27,6 +40,14 @@ func NewLoader(resourcesDir string) *Loader {
 	}
 }
 
+// Invalidate drops the parsed prompt and pack indexes so the next LoadPrompt
+// or LoadPack re-reads the resources.
+func (l *Loader) Invalidate() {
+	l.mu.Lock()
+	defer l.mu.Unlock()
+	l.prompts, l.packs = nil, nil
+}
+
 // Prompt represents a parsed prompt with YAML frontmatter and markdown body
 type Prompt struct {
 	ID           string                 `yaml:"id"`
@@ -79,20 +100,32 @@ func (l *Loader) ListPrompts() ([]Prompt, error) {
 	return prompts, err
 }
 
-// LoadPrompt loads a specific prompt by ID
+// LoadPrompt loads a specific prompt by ID. Prompts are parsed once into an
+// index that is reused for indexTTL, rather than walking and parsing every
+// prompt file on each call.
 func (l *Loader) LoadPrompt(id string) (*Prompt, error) {
-	prompts, err := l.ListPrompts()
-	if err != nil {
-		return nil, err
-	}
+	l.mu.Lock()
+	defer l.mu.Unlock()
 
-	for _, p := range prompts {
-		if p.ID == id {
-			return &p, nil
+	if l.prompts == nil || time.Since(l.promptsAt) >= indexTTL {
+		prompts, err := l.ListPrompts()
+		if err != nil {
+			return nil, err
 		}
+		index := make(map[string]Prompt, len(prompts))
+		for _, p := range prompts {
+			if _, ok := index[p.ID]; !ok {
+				index[p.ID] = p
+			}
+		}
+		l.prompts, l.promptsAt = index, time.Now()
 	}
 
-	return nil, fmt.Errorf("prompt not found: %s", id)
+	p, ok := l.prompts[id]
+	if !ok {
+		return nil, fmt.Errorf("prompt not found: %s", id)
+	}
+	return &p, nil
 }
 
 // ListPacks returns all available context packs
@@ -111,20 +144,30 @@ func (l *Loader) ListPacks() ([]Pack, error) {
 	return packs, err
 }
 
-// LoadPack loads a specific pack by ID
+// LoadPack loads a specific pack by ID, from an index cached like LoadPrompt's.
 func (l *Loader) LoadPack(id string) (*Pack, error) {
-	packs, err := l.ListPacks()
-	if err != nil {
-		return nil, err
-	}
+	l.mu.Lock()
+	defer l.mu.Unlock()
 
-	for _, p := range packs {
-		if p.ID == id {
-			return &p, nil
+	if l.packs == nil || time.Since(l.packsAt) >= indexTTL {
+		packs, err := l.ListPacks()
+		if err != nil {
+			return nil, err
+		}
+		index := make(map[string]Pack, len(packs))
+		for _, p := range packs {
+			if _, ok := index[p.ID]; !ok {
+				index[p.ID] = p
+			}
 		}
+		l.packs, l.packsAt = index, time.Now()
 	}
 
-	return nil, fmt.Errorf("pack not found: %s", id)
+	p, ok := l.packs[id]
+	if !ok {
+		return nil, fmt.Errorf("pack not found: %s", id)
+	}
+	return &p, nil
 }
 
 // walkFiles walks through files in the given base directory with the specified extension
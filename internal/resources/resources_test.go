@@ -193,3 +193,39 @@ func findSubstring(s, substr string) bool {
 	}
 	return false
 }
+
+func TestLoadPrompt_CachesUntilInvalidate(t *testing.T) {
+	tempDir := t.TempDir()
+	promptsDir := filepath.Join(tempDir, "prompts")
+	if err := os.MkdirAll(promptsDir, 0755); err != nil {
+		t.Fatalf("failed to create temp prompts dir: %v", err)
+	}
+
+	promptPath := filepath.Join(promptsDir, "cached-v1.prompt.md")
+	write := func(name string) {
+		content := "---\nid: cached-v1\nname: " + name + "\n---\n\nBody\n"
+		if err := os.WriteFile(promptPath, []byte(content), 0644); err != nil {
+			t.Fatalf("failed to write prompt: %v", err)
+		}
+	}
+
+	write("First")
+	loader := NewLoader(tempDir)
+	if p, err := loader.LoadPrompt("cached-v1"); err != nil || p.Name != "First" {
+		t.Fatalf("LoadPrompt() = %v, %v; want name First", p, err)
+	}
+
+	write("Second")
+	if p, err := loader.LoadPrompt("cached-v1"); err != nil || p.Name != "First" {
+		t.Fatalf("expected cached prompt before Invalidate, got %v, %v", p, err)
+	}
+
+	loader.Invalidate()
+	if p, err := loader.LoadPrompt("cached-v1"); err != nil || p.Name != "Second" {
+		t.Fatalf("expected reloaded prompt after Invalidate, got %v, %v", p, err)
+	}
+
+	if _, err := loader.LoadPrompt("missing"); err == nil {
+		t.Error("expected an error for an unknown prompt")
+	}
+}